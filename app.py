@@ -3,149 +3,653 @@ Local Web Application for Interactive Data Display
 Run this to deploy the data display webpage locally
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import escape
+from array import array
+import codecs
+from collections import OrderedDict
+import copy
+from functools import lru_cache, wraps
+from itertools import islice
+import hashlib
+import hmac
 import json
-from typing import Any, Dict, List
+import mmap
+import os
+import re
+import sys
+import zlib
+import tempfile
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple, Union
 
 app = Flask(__name__)
-
-
-class DataDisplayGenerator:
-    """Standalone version of the data display generator"""
-
-    def __init__(self):
-        self.title = "LLM Data Display"
-        self.theme_color = "#4F46E5"
-        self.auto_parse_json = True
-        self.collapsed_by_default = False
-
-    def parse_data(self, data: str) -> List[Dict[str, Any]]:
-        """Parse input data into structured sections."""
-        sections = []
-
-        if self.auto_parse_json:
+app.config.setdefault('UPLOAD_FOLDER', os.path.join(tempfile.gettempdir(), 'data_display_uploads'))
+# Sections longer than this (characters, or bytes for uploads) load in pages
+app.config.setdefault('SECTION_PAGE_SIZE', 256 * 1024)
+# Total input size of the documents kept around for paging
+app.config.setdefault('PAGED_DOCUMENTS_MAX_SIZE', 256 << 20)
+# Documents with more sections than this are shown one page at a time
+# (0 puts every section on one page); rendered pages are cached up to
+# RENDERED_PAGES_MAX_SIZE characters
+app.config.setdefault('SECTIONS_PER_PAGE', 1000)
+app.config.setdefault('RENDERED_PAGES_MAX_SIZE', 64 << 20)
+# Adaptive rendering: inputs of at least STREAMED_RENDER_MIN_SIZE bytes are
+# streamed instead of built in memory, and JSON inputs of at least
+# PARALLEL_RENDER_MIN_SIZE are formatted by PARALLEL_RENDER_WORKERS
+# processes (0 turns that off; the default leaves one CPU to the server)
+app.config.setdefault('STREAMED_RENDER_MIN_SIZE', 1 << 20)
+app.config.setdefault('PARALLEL_RENDER_MIN_SIZE', 8 << 20)
+app.config.setdefault('PARALLEL_RENDER_WORKERS', max(min((os.cpu_count() or 1) - 1, 4), 0))
+# Per-request memory budget: a page or /api/generate reply assembled in
+# memory is moved to a temporary file in RENDER_SPOOL_DIR (None: the system
+# default) once it grows past RENDER_MEMORY_BUDGET bytes, and sent from
+# there. None keeps every reply in memory.
+app.config.setdefault('RENDER_MEMORY_BUDGET', 8 << 20)
+app.config.setdefault('RENDER_SPOOL_DIR', None)
+# Request limits: bigger pastes go through chunked uploads instead
+app.config.setdefault('MAX_CONTENT_LENGTH', 64 << 20)
+app.config.setdefault('MAX_FORM_MEMORY_SIZE', 16 << 20)
+app.config.setdefault('MAX_SECTIONS', 100_000)
+# Most documents rendered by one /api/generate/batch request
+app.config.setdefault('BATCH_MAX_REQUESTS', 100)
+# Admission control: concurrent renders and queued requests per lane.
+# Requests of at least LARGE_RENDER_THRESHOLD bytes use the large lane so
+# they cannot hold up small renders.
+app.config.setdefault('RENDER_SLOTS', 4)
+app.config.setdefault('RENDER_QUEUE_SIZE', 32)
+app.config.setdefault('LARGE_RENDER_SLOTS', 1)
+app.config.setdefault('LARGE_RENDER_QUEUE_SIZE', 4)
+app.config.setdefault('LARGE_RENDER_THRESHOLD', 1 << 20)
+app.config.setdefault('RENDER_QUEUE_TIMEOUT', 10.0)
+app.config.setdefault('RENDER_RETRY_AFTER', 5)
+# Background render jobs: worker threads, pending jobs, result lifetime
+# (seconds) and the hosts that completion callbacks may be sent to
+app.config.setdefault('JOB_WORKERS', 2)
+app.config.setdefault('JOB_QUEUE_SIZE', 64)
+app.config.setdefault('JOB_RESULT_TTL', 3600)
+app.config.setdefault('JOB_CALLBACK_HOSTS', ('127.0.0.1', 'localhost', '::1'))
+# Live tails: streams kept (the least recently used are dropped beyond
+# that), seconds a stream is kept once closed or idle, and the most text
+# (characters) one stream buffers
+app.config.setdefault('LIVE_STREAMS_MAX', 100)
+app.config.setdefault('LIVE_STREAM_TTL', 3600)
+app.config.setdefault('LIVE_STREAM_MAX_SIZE', 16 << 20)
+# Chunked uploads: most chunks and bytes per upload, and seconds an upload
+# is kept after it was last used (its chunks go once it is assembled)
+app.config.setdefault('UPLOAD_MAX_CHUNKS', 4096)
+app.config.setdefault('UPLOAD_MAX_SIZE', 1 << 30)
+app.config.setdefault('UPLOAD_TTL', 24 * 3600)
+# Directory for compiled page templates, reused across restarts by warm_up()
+app.config.setdefault('TEMPLATE_CACHE_DIR', None)
+# Full-text search over rendered documents (None turns it off): index file,
+# documents kept, documents waiting to be indexed and results per query
+app.config.setdefault('SEARCH_INDEX_PATH', os.path.join(app.config['UPLOAD_FOLDER'], 'search_index.sqlite3'))
+app.config.setdefault('SEARCH_INDEX_MAX_DOCUMENTS', 1000)
+app.config.setdefault('SEARCH_QUEUE_SIZE', 16)
+app.config.setdefault('SEARCH_RESULTS_LIMIT', 50)
+# Escaped section content shared between renders: total characters kept
+# (0 turns the cache off) and the smallest section worth hashing
+app.config.setdefault('FRAGMENT_CACHE_MAX_SIZE', 64 << 20)
+app.config.setdefault('FRAGMENT_CACHE_MIN_SIZE', 2048)
+# Render profiling: requests carrying PROFILE_TOKEN (X-Profile header or
+# profile query parameter) are profiled; with PROFILE_SLOW_RENDER_SECONDS
+# set, every render is stack-sampled every PROFILE_SAMPLE_INTERVAL seconds
+# and kept if it is slower. At most PROFILE_MAX_COUNT profiles are stored.
+app.config.setdefault('PROFILE_TOKEN', None)
+app.config.setdefault('PROFILE_SLOW_RENDER_SECONDS', None)
+app.config.setdefault('PROFILE_SAMPLE_INTERVAL', 0.005)
+app.config.setdefault('PROFILE_MAX_COUNT', 100)
+
+# UTF-8 encodings of every character str.isspace() accepts, so byte input
+# is split exactly like the same input decoded to text.
+_UTF8_SPACE = (rb"[\t-\r\x1c- ]|\xc2[\x85\xa0]|\xe1\x9a\x80"
+               rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80")
+_UTF8_SPACE_CHAR = re.compile(_UTF8_SPACE)
+
+# (blank line, leading whitespace, newline) patterns per input type
+_TEXT_SCAN = (re.compile("\n\n"), re.compile(r"\s*"), re.compile("\n"))
+_BYTES_SCAN = (re.compile(b"\n\n"), re.compile(b"(?:" + _UTF8_SPACE + b")*"), re.compile(b"\n"))
+
+# Boundaries for the alternative splitters (see SPLITTERS)
+_RULE = r"^[ \t]*(?:-{3,}|\*{3,}|_{3,})[ \t]*(?:\r?\n|\Z)"
+_TEXT_RULE = re.compile(_RULE, re.MULTILINE)
+_BYTES_RULE = re.compile(_RULE.encode(), re.MULTILINE)
+_HEADING = r"^(?:```[^\n]*\n.*?^```[^\n]*$|(?P<heading>#{1,6}[ \t]+[^\n]*?)\r?$)"
+_TEXT_HEADING = re.compile(_HEADING, re.MULTILINE | re.DOTALL)
+_BYTES_HEADING = re.compile(_HEADING.encode(), re.MULTILINE | re.DOTALL)
+_TEXT_LINE = re.compile(r"[^\n]+")
+_BYTES_LINE = re.compile(rb"[^\n]+")
+_TEXT_JSON_CONTAINER = re.compile(r"\s*[{\[]")
+_BYTES_JSON_CONTAINER = re.compile(rb"\s*[{\[]")
+
+# json.loads can only succeed if the first non-whitespace character can
+# start a JSON value; checking that first skips a doomed full parse.
+_TEXT_JSON_START = re.compile(r'[ \t\n\r]*[{\["\-0-9tfnNI]')
+_BYTES_JSON_START = re.compile(rb'[ \t\n\r]*[{\["\-0-9tfnNI\x00\x80-\xff]')
+
+CONTENT_CHUNK_SIZE = 1 << 20
+
+
+def format_value(value: Any) -> str:
+    """Format a value for display."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, indent=2)
+    return str(value)
+
+
+def compact_json(value: Any) -> str:
+    """Serialize a value as compact JSON that is safe inside a ``<script>`` element."""
+    return json.dumps(value, separators=(",", ":")).replace("<", "\\u003c")
+
+
+def escape_html_utf8(data: bytes) -> bytes:
+    """Escape HTML special characters in UTF-8 bytes (they are all ASCII, so no character is split)."""
+    return (data
+            .replace(b"&", b"&amp;")
+            .replace(b"<", b"&lt;")
+            .replace(b">", b"&gt;")
+            .replace(b'"', b"&quot;")
+            .replace(b"'", b"&#39;"))
+
+
+def iter_escaped_utf8(source: Any, start: int, end: int, size: int = CONTENT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield the UTF-8 span ``source[start:end]`` HTML-escaped, in pieces of
+    about ``size`` bytes cut on character boundaries.
+
+    Valid pieces (checked with ``isascii()`` first, which is cheap) are
+    escaped as bytes, without decoding them to text and encoding the result
+    back. Invalid ones get replacement characters, like decoded text does.
+    """
+    while start < end:
+        stop = min(start + size, end)
+        if stop < end:
+            boundary = stop
+            while boundary > max(start, stop - 3) and source[boundary] & 0xC0 == 0x80:
+                boundary -= 1
+            stop = boundary if boundary > start else stop
+        data = bytes(source[start:stop])
+        if not data.isascii():
             try:
-                # Try parsing as JSON
-                parsed = json.loads(data)
-
-                if isinstance(parsed, dict):
-                    # Convert dict to sections
-                    for key, value in parsed.items():
-                        sections.append({
-                            "title": str(key).replace("_", " ").title(),
-                            "content": self._format_value(value)
-                        })
-                elif isinstance(parsed, list):
-                    # Handle list of items
-                    for idx, item in enumerate(parsed):
-                        sections.append({
-                            "title": f"Item {idx + 1}",
-                            "content": self._format_value(item)
-                        })
-                else:
-                    sections.append({
-                        "title": "Data",
-                        "content": self._format_value(parsed)
-                    })
-
-                return sections
-            except (json.JSONDecodeError, ValueError):
-                pass
-
-        # Fallback: Split by common section markers
-        if "\n\n" in data:
-            # Split by double newlines
-            parts = data.split("\n\n")
-            for idx, part in enumerate(parts):
-                if part.strip():
-                    # Try to identify title (first line if it's short)
-                    lines = part.strip().split("\n", 1)
-                    if len(lines) > 1 and len(lines[0]) < 100:
-                        title = lines[0].strip("#* ")
-                        content = lines[1]
-                    else:
-                        title = f"Section {idx + 1}"
-                        content = part
-
-                    sections.append({
-                        "title": title,
-                        "content": content
-                    })
+                data.decode("utf-8")
+            except UnicodeDecodeError:
+                data = data.decode("utf-8", "replace").encode("utf-8")
+        yield escape_html_utf8(data)
+        start = stop
+
+
+def _decode_span(source: Any, start: int, end: int) -> str:
+    """Return ``source[start:end]`` as text, decoding byte buffers as UTF-8."""
+    if isinstance(source, str):
+        if start == 0 and end == len(source):
+            return source
+        return source[start:end]
+    return str(memoryview(source)[start:end], "utf-8", "replace")
+
+
+def _rstrip_offset(data: Any, start: int, end: int) -> int:
+    """Return where ``data[start:end].rstrip()`` would end, without slicing."""
+    if isinstance(data, str):
+        while end > start and data[end - 1].isspace():
+            end -= 1
+        return end
+    while end > start:
+        for width in (1, 2, 3):
+            if end - width >= start and _UTF8_SPACE_CHAR.fullmatch(data, end - width, end):
+                end -= width
+                break
         else:
-            # Single section
-            sections.append({
-                "title": "Output",
-                "content": data
-            })
-
-        return sections
-
-    def _format_value(self, value: Any) -> str:
-        """Format a value for display."""
-        if isinstance(value, (dict, list)):
-            return json.dumps(value, indent=2)
-        return str(value)
+            break
+    return end
+
+
+def _is_short_line(data: Any, start: int, end: int, limit: int = 100) -> bool:
+    """Whether ``data[start:end]`` is under ``limit`` characters long."""
+    length = end - start
+    if isinstance(data, str) or length < limit:
+        return length < limit
+    # A UTF-8 character is at most 4 bytes long
+    return length < limit * 4 and len(_decode_span(data, start, end)) < limit
+
+
+def _looks_like_json(data: Any) -> bool:
+    pattern = _TEXT_JSON_START if isinstance(data, str) else _BYTES_JSON_START
+    return pattern.match(data) is not None
+
+
+def scan_parts(data: Any, boundary: Any) -> Optional["SectionSpans"]:
+    """
+    Split ``data`` at every match of ``boundary`` in a single pass.
+
+    Only offsets are recorded. Works on ``str`` as well as UTF-8
+    ``bytes``/``bytearray``/``memoryview``/``mmap`` buffers (``boundary`` must
+    be compiled for the matching type). Each part follows the rules of the
+    original ``data.split("\\n\\n")`` fallback: whitespace-only parts are
+    skipped and a short first line becomes the title. Returns ``None`` when
+    ``boundary`` never matches.
+    """
+    is_text = isinstance(data, str)
+    _, leading_space, newline = _TEXT_SCAN if is_text else _BYTES_SCAN
+    if boundary.search(data) is None:
+        return None
+
+    sections = SectionSpans(data)
+    add_offsets = sections.offsets.extend
+    match_leading_space = leading_space.match
+    find_newline = newline.search
+    idx = 0
+    for part_start, part_end in _iter_parts(boundary, data):
+        # Span of part.strip() without materializing it
+        strip_start = match_leading_space(data, part_start, part_end).end()
+        if strip_start < part_end:
+            if is_text:
+                strip_end = part_end
+                while data[strip_end - 1].isspace():
+                    strip_end -= 1
+            else:
+                strip_end = _rstrip_offset(data, strip_start, part_end)
+
+            # Try to identify title (first line if it's short)
+            line_break = find_newline(data, strip_start, strip_end)
+            if line_break is not None and (
+                    line_break.start() - strip_start < 100 if is_text
+                    else _is_short_line(data, strip_start, line_break.start())):
+                title_end = line_break.start()
+                add_offsets((title_end + 1, strip_end, strip_start, title_end))
+            else:
+                add_offsets((part_start, part_end, -1, idx + 1))
+
+        idx += 1
+    return sections
+
+
+def _iter_parts(boundary: Any, data: Any) -> Iterator[Tuple[int, int]]:
+    """Yield the (start, end) offsets of the parts between boundary matches."""
+    part_start = 0
+    for match in boundary.finditer(data):
+        yield part_start, match.start()
+        part_start = match.end()
+    yield part_start, len(data)
+
+
+def scan_blank_lines(data: Any) -> Optional["SectionSpans"]:
+    """Split on blank lines, exactly like the original ``parse_data`` fallback."""
+    return scan_parts(data, (_TEXT_SCAN if isinstance(data, str) else _BYTES_SCAN)[0])
+
+
+def scan_rules(data: Any) -> Optional["SectionSpans"]:
+    """Split on markdown horizontal rules (``---``, ``***`` or ``___`` lines)."""
+    return scan_parts(data, _TEXT_RULE if isinstance(data, str) else _BYTES_RULE)
+
+
+def scan_markdown_headings(data: Any) -> Optional["SectionSpans"]:
+    """
+    Start a new section at every markdown ``#`` heading outside code fences.
+
+    The heading text becomes the title and everything up to the next
+    heading the content; text before the first heading becomes
+    "Section 1". Returns ``None`` when there is no heading.
+    """
+    is_text = isinstance(data, str)
+    pattern = _TEXT_HEADING if is_text else _BYTES_HEADING
+    _, leading_space, _ = _TEXT_SCAN if is_text else _BYTES_SCAN
+
+    sections = SectionSpans(data)
+    add_offsets = sections.offsets.extend
+    content_start = 0
+    title_span = None
+    for match in pattern.finditer(data):
+        if match.lastgroup != "heading":
+            continue  # a fenced code block; its "#" lines are not headings
+        _add_heading_section(data, add_offsets, leading_space, title_span,
+                             content_start, match.start())
+        title_span = match.span("heading")
+        content_start = min(match.end() + 1, len(data))
+
+    if title_span is None:
+        return None
+    _add_heading_section(data, add_offsets, leading_space, title_span,
+                         content_start, len(data))
+    return sections
+
+
+def _add_heading_section(data: Any, add_offsets: Any, leading_space: Any,
+                         title_span: Optional[Tuple[int, int]], start: int, end: int) -> None:
+    if isinstance(data, str):
+        while end > start and data[end - 1].isspace():
+            end -= 1
+    else:
+        end = _rstrip_offset(data, start, end)
+    if title_span is not None:
+        add_offsets((start, end, title_span[0], title_span[1]))
+    elif leading_space.match(data, start, end).end() < end:
+        # Preamble before the first heading
+        add_offsets((start, end, -1, 1))
+
+
+def scan_ndjson(data: Any) -> List["Section"]:
+    """One section per non-empty line, decoded as JSON where possible."""
+    sections = []
+    pattern = _TEXT_LINE if isinstance(data, str) else _BYTES_LINE
+    for match in pattern.finditer(data):
+        line = match.group()
+        if not line.strip():
+            continue
+        title = f"Item {len(sections) + 1}"
+        value = _decode_ndjson_record(line)
+        if value is Section._NO_VALUE:
+            sections.append(Section(data, match.start(), match.end(), title=title))
+        else:
+            sections.append(Section.from_value(title, value))
+    return sections
+
+
+def iter_ndjson_sections(lines: Iterable[Union[str, bytes]]) -> Iterator["Section"]:
+    """
+    Lazily turn JSON Lines input into sections, one record at a time.
+
+    ``lines`` can be any line iterator (an open file, a request stream), so
+    the whole input is never held in memory. Lines that are not valid JSON
+    are shown as raw text.
+    """
+    count = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        count += 1
+        title = f"Item {count}"
+        value = _decode_ndjson_record(line)
+        if value is Section._NO_VALUE:
+            if not isinstance(line, str):
+                line = str(line, "utf-8", "replace")
+            yield Section(line.rstrip("\r\n"), title=title)
+        else:
+            yield Section.from_value(title, value)
 
-    def _escape_html(self, text: str) -> str:
-        """Escape HTML special characters."""
-        return (text
-                .replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace('"', "&quot;")
-                .replace("'", "&#39;"))
 
-    def _darken_color(self, hex_color: str, amount: float) -> str:
-        """Darken a hex color by a percentage."""
-        try:
-            hex_color = hex_color.lstrip('#')
-            r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            r = int(r * (1 - amount))
-            g = int(g * (1 - amount))
-            b = int(b * (1 - amount))
-            return f"#{r:02x}{g:02x}{b:02x}"
-        except:
-            return hex_color
-
-    def generate_html(self, sections: List[Dict[str, Any]]) -> str:
-        """Generate the complete HTML page."""
-
-        collapsed_class = "collapsed" if self.collapsed_by_default else ""
-
-        # Generate sections HTML
-        sections_html = ""
-        for idx, section in enumerate(sections):
-            section_id = f"section-{idx}"
-            sections_html += f"""
-            <div class="section-card {collapsed_class}">
-                <div class="section-header" onclick="toggleSection('{section_id}')">
-                    <div class="section-title">
-                        <span class="toggle-icon">▼</span>
-                        <h3>{section['title']}</h3>
-                    </div>
-                    <button class="copy-btn" onclick="copyText('{section_id}', event)" title="Copy to clipboard">
-                        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
-                            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
-                        </svg>
-                        Copy
-                    </button>
-                </div>
-                <div class="section-content" id="{section_id}">
-                    <pre class="content-text">{self._escape_html(section['content'])}</pre>
-                </div>
-            </div>
-            """
+def _decode_ndjson_record(line: Union[str, bytes]) -> Any:
+    """Decode one JSON Lines record, or return ``Section._NO_VALUE``."""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return Section._NO_VALUE
+
+
+def _looks_like_ndjson(data: Any, sample_size: int = 2, max_line_length: int = 1 << 16) -> bool:
+    """
+    Cheaply detect JSON Lines input from its first few lines.
+
+    Requires at least ``sample_size`` non-empty lines that each hold a JSON
+    object or array, which a regular (single) JSON document never has.
+    """
+    is_text = isinstance(data, str)
+    pattern = _TEXT_LINE if is_text else _BYTES_LINE
+    json_start = _TEXT_JSON_CONTAINER if is_text else _BYTES_JSON_CONTAINER
+    records = 0
+    for match in pattern.finditer(data):
+        if match.end() - match.start() > max_line_length:
+            return False
+        line = match.group()
+        if not line.strip():
+            continue
+        if not json_start.match(line) or _decode_ndjson_record(line) is Section._NO_VALUE:
+            return False
+        records += 1
+        if records == sample_size:
+            return True
+    return False
+
+
+@lru_cache(maxsize=64)
+def compile_split_pattern(pattern: str, for_bytes: bool = False) -> Any:
+    """Compile (and cache) a user supplied section boundary pattern."""
+    try:
+        if for_bytes:
+            return re.compile(pattern.encode("utf-8"), re.MULTILINE)
+        return re.compile(pattern, re.MULTILINE)
+    except re.error as e:
+        raise ValueError(f"Invalid split pattern: {e}") from e
+
+
+def scan_regex(data: Any, pattern: str) -> Optional["SectionSpans"]:
+    """Split at every match of a custom regular expression (multiline mode)."""
+    if not pattern:
+        raise ValueError("A split pattern is required for the regex split mode")
+    return scan_parts(data, compile_split_pattern(pattern, not isinstance(data, str)))
+
+
+# Section splitting strategies selectable per request ("split_mode")
+SPLITTERS: Dict[str, Callable[..., Optional[Sequence["Section"]]]] = {
+    "blank_line": scan_blank_lines,
+    "markdown": scan_markdown_headings,
+    "rule": scan_rules,
+    "regex": scan_regex,
+    "ndjson": scan_ndjson,
+}
+DEFAULT_SPLIT_MODE = "blank_line"
+
+
+class Section:
+    """
+    A parsed section of the input.
+
+    Text sections are stored as offsets into the original input (``str`` or
+    a UTF-8 byte buffer) and only slice out their title/content when
+    accessed; JSON sections keep the decoded value and format it on first
+    access, keeping the text for later ones. Sections also support ``section["title"]``/``section["content"]``
+    like the dicts they replace.
+    """
+
+    __slots__ = ("source", "start", "end", "title_start", "title_end", "_title", "_value", "_formatted")
+
+    _NO_VALUE = object()
+
+    def __init__(self, source: Any, start: int = 0, end: Optional[int] = None,
+                 title: Optional[str] = None, title_start: int = 0, title_end: int = 0):
+        self.source = source
+        self.start = start
+        self.end = len(source) if end is None else end
+        self.title_start = title_start
+        self.title_end = title_end
+        self._title = title
+        self._value = Section._NO_VALUE
+        self._formatted = None
+
+    @classmethod
+    def from_value(cls, title: str, value: Any) -> "Section":
+        """Create a section whose content is a decoded JSON value."""
+        section = cls("", title=title)
+        section._value = value
+        return section
+
+    @property
+    def title(self) -> str:
+        if self._title is None:
+            return _decode_span(self.source, self.title_start, self.title_end).strip("#* ")
+        return self._title
+
+    @property
+    def json_container(self) -> Optional[Union[dict, list]]:
+        """The decoded JSON object or array the section holds, if any."""
+        return self._value if isinstance(self._value, (dict, list)) else None
+
+    @property
+    def content(self) -> str:
+        if self._value is not Section._NO_VALUE:
+            if self._formatted is None:
+                self._formatted = format_value(self._value)
+            return self._formatted
+        return _decode_span(self.source, self.start, self.end)
+
+    def iter_chunks(self, size: int = CONTENT_CHUNK_SIZE) -> Iterator[str]:
+        """Yield the content as text in pieces of about ``size`` characters."""
+        if self._value is not Section._NO_VALUE or self.end - self.start <= size:
+            yield self.content
+            return
+        if isinstance(self.source, str):
+            for offset in range(self.start, self.end, size):
+                yield self.source[offset:min(offset + size, self.end)]
+            return
+        # Byte buffers may split a character between pieces
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        view = memoryview(self.source)
+        for offset in range(self.start, self.end, size):
+            yield decoder.decode(view[offset:min(offset + size, self.end)])
+        yield decoder.decode(b"", final=True)
+
+    def fingerprint(self, min_size: int = 0) -> Optional[bytes]:
+        """
+        Digest identifying the section's displayed content, or ``None`` if
+        the content is shorter than ``min_size`` (or cannot be encoded).
 
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{self.title}</title>
-    <style>
-        * {{
+        Text is hashed straight from the input and JSON objects and arrays
+        in compact form, so neither has to be formatted first. Text from
+        ``str`` and UTF-8 byte input hashes the same.
+        """
+        digest = hashlib.sha256()
+        if isinstance(self._value, (dict, list)):
+            data = json.dumps(self._value).encode("ascii")
+            if len(data) < min_size:
+                return None
+            digest.update(b"j")
+            digest.update(data)
+            return digest.digest()
+        if self._value is not Section._NO_VALUE or isinstance(self.source, str):
+            text = self.content if self._value is not Section._NO_VALUE else self.source[self.start:self.end]
+            if len(text) < min_size:
+                return None
+            try:
+                data = text.encode("utf-8")
+            except UnicodeEncodeError:
+                return None
+        else:
+            if self.end - self.start < min_size:
+                return None
+            data = memoryview(self.source)[self.start:self.end]
+        digest.update(b"t")
+        digest.update(data)
+        return digest.digest()
+
+    def read(self, offset: int, size: int) -> Tuple[str, Optional[int]]:
+        """
+        Return about ``size`` units of content from ``offset`` (relative to
+        the section start) and the offset of the next page, or ``None`` at
+        the end. Pages of byte buffers end on a character boundary.
+        """
+        if self._value is not Section._NO_VALUE:
+            return self.as_text().read(offset, size)
+        start = self.start + offset
+        end = min(start + size, self.end)
+        if end < self.end and not isinstance(self.source, str):
+            boundary = end
+            while boundary > start and self.source[boundary] & 0xC0 == 0x80:
+                boundary -= 1
+            end = boundary if boundary > start else end
+        return _decode_span(self.source, start, end), (end - self.start if end < self.end else None)
+
+    @property
+    def is_utf8(self) -> bool:
+        """Whether the content is a span of a UTF-8 byte buffer rather than text or a JSON value."""
+        return self._value is Section._NO_VALUE and not isinstance(self.source, str)
+
+    def as_text(self) -> "Section":
+        """Return the section backed by text, formatting a JSON value once."""
+        if self._value is Section._NO_VALUE:
+            return self
+        return Section(self.content, title=self.title)
+
+    def __getitem__(self, key: str) -> str:
+        if key == "title":
+            return self.title
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"title": self.title, "content": self.content}
+
+    def __repr__(self) -> str:
+        return f"Section(title={self.title!r})"
+
+
+class SectionSpans:
+    """
+    Compact list of text sections backed by a single offset table.
+
+    Each section costs four int64 offsets (content start/end and title
+    start/end) into the shared source; ``Section`` views are only created
+    when an entry is accessed. Untitled sections store ``-1`` as the title
+    start and their 1-based part number as the title end.
+    """
+
+    __slots__ = ("source", "offsets")
+
+    def __init__(self, source: Any):
+        self.source = source
+        self.offsets = array("q")
+
+    def append(self, start: int, end: int, title_start: int, title_end: int) -> None:
+        self.offsets.extend((start, end, title_start, title_end))
+
+    def __len__(self) -> int:
+        return len(self.offsets) // 4
+
+    def max_length(self) -> int:
+        """Length of the longest section's content, in units of the source."""
+        offsets = self.offsets
+        return max(map(int.__sub__, offsets[1::4], offsets[0::4]), default=0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            spans = SectionSpans(self.source)
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                spans.offsets = self.offsets[start * 4:max(stop, start) * 4]
+                return spans
+            for i in range(start, stop, step):
+                spans.offsets.extend(self.offsets[i * 4:i * 4 + 4])
+            return spans
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("section index out of range")
+        start, end, title_start, title_end = self.offsets[index * 4:index * 4 + 4]
+        if title_start < 0:
+            return Section(self.source, start, end, title=f"Section {title_end}")
+        return Section(self.source, start, end, title_start=title_start, title_end=title_end)
+
+    def __iter__(self) -> Iterator[Section]:
+        source = self.source
+        offsets = self.offsets
+        for index in range(0, len(offsets), 4):
+            start, end, title_start, title_end = offsets[index:index + 4]
+            if title_start < 0:
+                yield Section(source, start, end, title=f"Section {title_end}")
+            else:
+                yield Section(source, start, end, title_start=title_start, title_end=title_end)
+
+
+DEFAULT_THEME_COLOR = "#4F46E5"
+
+# Theme presets offered on the input page
+THEME_PRESETS = {
+    "Indigo": "#4F46E5",
+    "Green": "#059669",
+    "Red": "#DC2626",
+    "Purple": "#7C3AED",
+    "Blue": "#2563EB",
+    "Orange": "#EA580C",
+}
+
+_HEX_COLOR = re.compile(r"#?([0-9A-Fa-f]{6}|[0-9A-Fa-f]{3})")
+_NAMED_COLOR = re.compile(r"[A-Za-z]{1,32}")
+
+# Page stylesheet; formatted once per theme by get_theme()
+PAGE_STYLESHEET = """        * {{
             margin: 0;
             padding: 0;
             box-sizing: border-box;
@@ -221,7 +725,7 @@ class DataDisplayGenerator:
         }}
 
         .section-header {{
-            background: {self.theme_color};
+            background: {theme_color};
             color: white;
             padding: 20px;
             cursor: pointer;
@@ -232,7 +736,7 @@ class DataDisplayGenerator:
         }}
 
         .section-header:hover {{
-            background: {self._darken_color(self.theme_color, 0.1)};
+            background: {hover_color};
         }}
 
         .section-title {{
@@ -286,6 +790,14 @@ class DataDisplayGenerator:
             border-color: #10b981;
         }}
 
+        .icon {{
+            width: 16px;
+            height: 16px;
+            fill: none;
+            stroke: currentColor;
+            stroke-width: 2;
+        }}
+
         .section-content {{
             max-height: 1000px;
             overflow: hidden;
@@ -300,7 +812,7 @@ class DataDisplayGenerator:
         .content-text {{
             padding: 25px;
             background: #f9fafb;
-            border-left: 4px solid {self.theme_color};
+            border-left: 4px solid {theme_color};
             margin: 0;
             white-space: pre-wrap;
             word-wrap: break-word;
@@ -378,26 +890,923 @@ class DataDisplayGenerator:
                 font-size: 0.8rem;
             }}
         }}
-    </style>
-</head>
+"""
+
+
+def darken_color(hex_color: str, amount: float) -> str:
+    """Darken a hex color by a percentage."""
+    try:
+        hex_color = hex_color.lstrip('#')
+        r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        r = int(r * (1 - amount))
+        g = int(g * (1 - amount))
+        b = int(b * (1 - amount))
+        return f"#{r:02x}{g:02x}{b:02x}"
+    except ValueError:
+        return hex_color
+
+
+class Theme(NamedTuple):
+    """A validated theme color with its derived palette and stylesheet."""
+
+    color: str
+    hover_color: str
+    stylesheet: str
+
+
+@lru_cache(maxsize=256)
+def get_theme(theme_color: str) -> Theme:
+    """
+    Return the theme for a color, building and validating it only once.
+
+    Hex colors (``#RRGGBB`` or ``#RGB``) get a darkened hover color, CSS color
+    names are used as-is and anything else falls back to the default theme.
+    """
+    hex_match = _HEX_COLOR.fullmatch(theme_color)
+    if hex_match:
+        digits = hex_match.group(1)
+        if len(digits) == 3:
+            digits = "".join(digit * 2 for digit in digits)
+        color = theme_color if theme_color.startswith("#") else f"#{digits}"
+        hover_color = darken_color(digits, 0.1)
+    elif _NAMED_COLOR.fullmatch(theme_color):
+        color = hover_color = theme_color
+    else:
+        return get_theme(DEFAULT_THEME_COLOR)
+
+    stylesheet = PAGE_STYLESHEET.format(theme_color=color, hover_color=hover_color)
+    return Theme(color, hover_color, stylesheet)
+
+
+# Build the preset themes up front so they never cost anything at render time
+for _preset_color in THEME_PRESETS.values():
+    get_theme(_preset_color)
+
+
+# Icons are defined once per page and referenced from every card with <use>
+ICON_SPRITE = """    <svg xmlns="http://www.w3.org/2000/svg" style="display: none">
+        <symbol id="icon-copy" viewBox="0 0 24 24">
+            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
+            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
+        </symbol>
+        <symbol id="icon-check" viewBox="0 0 24 24">
+            <polyline points="20 6 9 17 4 12"></polyline>
+        </symbol>
+    </svg>
+"""
+
+# Section card markup. It is split once, by card_fragments(), into the static
+# fragments around its fields; iter_html() interleaves them with each card's
+# values instead of formatting the whole card per section.
+SECTION_CARD_TEMPLATE = """
+            <div class="section-card {collapsed_class}">
+                <div class="section-header" onclick="toggleSection('section-{index}')">
+                    <div class="section-title">
+                        <span class="toggle-icon">▼</span>
+                        <h3>{title}</h3>
+                    </div>
+                    <button class="copy-btn" onclick="copyText('section-{index}', event)" title="Copy to clipboard">
+                        <svg class="icon"><use href="#icon-copy"></use></svg>
+                        Copy
+                    </button>
+                </div>
+                <div class="section-content" id="section-{index}">
+                    <pre class="content-text">{content}</pre>{more}
+                </div>
+            </div>
+            """
+
+_CARD_FIELD = re.compile(r"\{(?:index|title|content|more)\}")
+
+# Approximate number of characters iter_html() collects before yielding
+HTML_BATCH_SIZE = 64 * 1024
+
+# Cards fade in 0.1s apart; cards after this many share the last delay
+MAX_STAGGERED_CARDS = 20
+
+
+@lru_cache(maxsize=None)
+def card_fragments(collapsed: bool) -> Tuple[str, ...]:
+    """
+    Split the section card template into its static fragments.
+
+    The collapsed class is baked in, leaving seven fragments around the
+    ``index``, ``title``, ``index``, ``index``, ``content`` and ``more`` fields.
+    """
+    template = SECTION_CARD_TEMPLATE.replace("{collapsed_class}", "collapsed" if collapsed else "")
+    return tuple(_CARD_FIELD.split(template))
+
+
+@lru_cache(maxsize=None)
+def card_fragments_utf8(collapsed: bool) -> Tuple[bytes, ...]:
+    """``card_fragments()`` encoded once, for rendering straight to bytes."""
+    return tuple(fragment.encode("utf-8") for fragment in card_fragments(collapsed))
+
+
+# Characters of static markup in one card (its expanded form)
+CARD_STATIC_SIZE = sum(map(len, card_fragments(False)))
+
+# JSON views: "text" pretty-prints JSON objects and arrays into the card,
+# "tree" embeds them compactly and lets the page expand them level by level
+JSON_VIEWS = ("text", "tree")
+DEFAULT_JSON_VIEW = "text"
+
+JSON_TREE_OPEN = ('\n                    <div class="content-text json-tree"></div>'
+                  '<script type="application/json" class="json-data">')
+JSON_TREE_CLOSE = '</script>'
+
+JSON_TREE_STYLE = """
+        pre.content-text:has(+ .json-tree) {
+            display: none;
+        }
+
+        .json-level {
+            list-style: none;
+            margin: 0;
+            padding-left: 1.5em;
+        }
+
+        .json-tree > .json-level {
+            padding-left: 0;
+        }
+
+        .json-level .json-level {
+            display: none;
+        }
+
+        .open > .json-level {
+            display: block;
+        }
+
+        .json-toggle {
+            color: #6b7280;
+            cursor: pointer;
+        }
+
+        .json-toggle::before {
+            content: '▸ ';
+        }
+
+        .open > .json-toggle::before {
+            content: '▾ ';
+        }
+
+        .json-key {
+            color: #7c3aed;
+        }
+
+        .json-string {
+            color: #059669;
+        }
+
+        .json-number, .json-boolean, .json-null {
+            color: #2563eb;
+        }
+"""
+
+JSON_TREE_SCRIPT = """
+
+        // JSON tree view: each level is only built the first time it is opened
+        function renderJsonLevel(parent, value) {
+            const isArray = Array.isArray(value);
+            const list = document.createElement('ul');
+            list.className = 'json-level';
+            for (const [key, child] of Object.entries(value)) {
+                const item = document.createElement('li');
+                const name = document.createElement('span');
+                name.className = 'json-key';
+                name.textContent = isArray ? `[${key}]` : JSON.stringify(key);
+                item.append(name, ': ');
+                if (child !== null && typeof child === 'object') {
+                    const count = Object.keys(child).length;
+                    const toggle = document.createElement('span');
+                    toggle.className = 'json-toggle';
+                    toggle.textContent = Array.isArray(child) ? `[${count}]` : `{${count}}`;
+                    let rendered = false;
+                    toggle.addEventListener('click', () => {
+                        if (!rendered) {
+                            renderJsonLevel(item, child);
+                            rendered = true;
+                        }
+                        item.classList.toggle('open');
+                    });
+                    item.append(toggle);
+                } else {
+                    const leaf = document.createElement('span');
+                    leaf.className = `json-${child === null ? 'null' : typeof child}`;
+                    leaf.textContent = JSON.stringify(child);
+                    item.append(leaf);
+                }
+                list.append(item);
+            }
+            parent.append(list);
+        }
+
+        document.querySelectorAll('.json-data').forEach(data => {
+            renderJsonLevel(data.previousElementSibling, JSON.parse(data.textContent));
+        });"""
+
+
+# Styles and script added to pages whose oversized sections load in pages
+PAGING_STYLE = """
+        .content-text:has(+ .load-more) {
+            max-height: 900px;
+            overflow-y: auto;
+        }
+
+        .load-more {
+            display: block;
+            margin: 12px 25px 20px;
+            padding: 8px 16px;
+            background: white;
+            border: 1px solid #d1d5db;
+            border-radius: 6px;
+            color: #374151;
+            cursor: pointer;
+            font-size: 0.9rem;
+        }
+
+        .load-more:disabled {
+            opacity: 0.6;
+            cursor: wait;
+        }
+"""
+
+PAGING_SCRIPT = """
+
+        // Oversized sections: append further pages on demand
+        function loadMore(button) {
+            const {document: documentId, section, offset} = button.dataset;
+            button.disabled = true;
+            fetch(`/api/documents/${documentId}/sections/${section}?offset=${offset}`)
+                .then(response => {
+                    if (response.status === 404) {
+                        throw new Error('This page has expired, please generate it again');
+                    }
+                    if (!response.ok) {
+                        throw new Error(`Failed to load more (${response.status})`);
+                    }
+                    return response.json();
+                })
+                .then(page => {
+                    button.previousElementSibling.append(page.text);
+                    if (page.next_offset === null) {
+                        button.remove();
+                        return;
+                    }
+                    button.dataset.offset = page.next_offset;
+                    button.textContent = page.label;
+                    button.disabled = false;
+                })
+                .catch(err => {
+                    showToast(err.message);
+                    button.disabled = false;
+                });
+        }"""
+
+
+def load_more_label(remaining: int) -> str:
+    """Text of the "load more" button for ``remaining`` units of content."""
+    for unit, scale in (("MB", 1 << 20), ("KB", 1 << 10)):
+        if remaining >= scale:
+            return f"Load more ({remaining / scale:.1f} {unit} left)"
+    return f"Load more ({remaining} B left)"
+
+
+# Styles and script added to pages with a search box
+SEARCH_STYLE = """
+        .search-box {
+            position: relative;
+            max-width: 480px;
+            margin: 16px auto 0;
+        }
+
+        .search-box input {
+            width: 100%;
+            padding: 10px 14px;
+            border: none;
+            border-radius: 6px;
+            font-size: 1rem;
+        }
+
+        .search-results {
+            position: absolute;
+            left: 0;
+            right: 0;
+            z-index: 10;
+            max-height: 360px;
+            overflow-y: auto;
+            margin-top: 4px;
+            background: white;
+            border-radius: 6px;
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
+            list-style: none;
+            text-align: left;
+        }
+
+        .search-results li {
+            padding: 10px 14px;
+            color: #374151;
+            cursor: pointer;
+            font-size: 0.9rem;
+        }
+
+        .search-results li:hover {
+            background: #f3f4f6;
+        }
+
+        .search-results mark {
+            background: #fde68a;
+        }
+
+        .section-card.search-hit {
+            box-shadow: 0 0 0 3px #fde68a;
+        }
+"""
+
+SEARCH_SCRIPT = """
+
+        // Search: the server looks the query up in its index, the page
+        // only lists the matches and jumps to the chosen section
+        let searchTimer = null;
+
+        function searchSoon(form) {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => searchSections(form), 250);
+        }
+
+        function searchSections(form, event) {
+            if (event) {
+                event.preventDefault();
+            }
+            const query = form.elements.q.value.trim();
+            const results = form.querySelector('.search-results');
+            if (!query) {
+                results.replaceChildren();
+                return;
+            }
+            fetch(`/api/search?document=${form.dataset.document}&q=${encodeURIComponent(query)}`)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`Search failed (${response.status})`);
+                    }
+                    return response.json();
+                })
+                .then(found => {
+                    if (form.elements.q.value.trim() !== query) {
+                        return;
+                    }
+                    results.replaceChildren(...found.results.map(result => {
+                        const item = document.createElement('li');
+                        const title = document.createElement('strong');
+                        const snippet = document.createElement('div');
+                        title.textContent = result.title;
+                        snippet.innerHTML = result.snippet;
+                        item.append(title, snippet);
+                        item.onclick = () => {
+                            results.replaceChildren();
+                            jumpToSection(result.section);
+                        };
+                        return item;
+                    }));
+                    if (!found.results.length) {
+                        showToast('No matching sections');
+                    }
+                })
+                .catch(err => showToast(err.message));
+        }
+
+        function jumpToSection(index) {
+            const content = document.getElementById(`section-${index}`);
+            const pager = document.querySelector('.pager');
+            if (!content && pager) {
+                const page = Math.floor(index / pager.dataset.perPage) + 1;
+                location.href = `/documents/${pager.dataset.document}?page=${page}#section-${index}`;
+                return;
+            }
+            const card = content.closest('.section-card');
+            card.classList.remove('collapsed');
+            card.classList.add('search-hit');
+            card.scrollIntoView({behavior: 'smooth', block: 'start'});
+            setTimeout(() => card.classList.remove('search-hit'), 2000);
+        }"""
+
+
+# Styles and script added to documents shown one page at a time
+PAGER_STYLE = """
+        .pager {
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+            gap: 16px;
+            margin: 20px 0;
+            padding: 12px 20px;
+            background: white;
+            border-radius: 8px;
+            color: #374151;
+        }
+
+        .pager a {
+            color: #111827;
+            font-weight: 600;
+            text-decoration: none;
+        }
+
+        .pager span {
+            color: #9ca3af;
+        }
+
+        .pager input {
+            width: 5em;
+            padding: 4px 6px;
+        }
+"""
+
+PAGER_SCRIPT = """
+
+        // Pages: open the section a link (e.g. a search result) points to
+        const linkedSection = location.hash && document.getElementById(location.hash.slice(1));
+        if (linkedSection) {
+            linkedSection.closest('.section-card').classList.remove('collapsed');
+            linkedSection.scrollIntoView();
+        }"""
+
+
+class FragmentCache:
+    """
+    Content-addressed store of escaped section content.
+
+    Sections that repeat across renders (system prompts, tool schemas,
+    boilerplate JSON) are formatted and escaped once and found again by
+    ``Section.fingerprint()``. Entries are evicted least recently used
+    beyond ``max_size`` characters; sections under ``min_size`` are
+    cheaper to escape than to hash and bypass the cache.
+    """
+
+    def __init__(self, max_size: int, min_size: int):
+        self.max_size = max_size
+        self.min_size = min_size
+        # digest -> (escaped content, render that stored it)
+        self._entries: "OrderedDict[bytes, Tuple[str, int]]" = OrderedDict()
+        self._size = 0
+        self._renders = 0
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.cross_document_hits = 0
+        self.chars_saved = 0
+
+    def new_render(self) -> int:
+        """Id telling a render's own repeated sections apart from other documents'."""
+        with self._lock:
+            self._renders += 1
+            return self._renders
+
+    def escaped(self, section: Section, escape: Callable[[str], str], render: int) -> str:
+        """The section's content escaped with ``escape``, from the cache when possible."""
+        key = section.fingerprint(self.min_size)
+        if key is None:
+            return escape(section.content)
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.cross_document_hits += entry[1] != render
+                self.chars_saved += len(entry[0])
+                return entry[0]
+
+        fragment = escape(section.content)
+        if len(fragment) <= self.max_size:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = (fragment, render)
+                    self._size += len(fragment)
+                    while self._size > self.max_size:
+                        self._size -= len(self._entries.popitem(last=False)[1][0])
+        return fragment
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self._size,
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'hit_rate': self.hits / self.lookups if self.lookups else 0.0,
+                'cross_document_hits': self.cross_document_hits,
+                'chars_saved': self.chars_saved,
+            }
+
+
+class SharedAssets:
+    """
+    Stylesheets and scripts shared by many pages, stored once each.
+
+    Pages rendered with a ``shared_assets`` store link to
+    ``<prefix><kind>-<hash>.<ext>`` files instead of embedding their CSS,
+    JavaScript and icons, so a bulk export holds one copy of each variant
+    (theme, JSON view). ``files`` maps the file names to their content.
+    """
+
+    def __init__(self, prefix: str = "assets/"):
+        self.prefix = prefix
+        self.files: Dict[str, str] = {}
+        self._urls: Dict[str, str] = {}
+
+    def url(self, kind: str, extension: str, content: str) -> str:
+        """URL of the asset holding ``content``, adding it on first use."""
+        url = self._urls.get(content)
+        if url is None:
+            name = f"{kind}-{hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]}.{extension}"
+            self.files[name] = content
+            url = self._urls[content] = self.prefix + name
+        return url
+
+
+class DataDisplayGenerator:
+    """Standalone version of the data display generator"""
+
+    def __init__(self):
+        self.title = "LLM Data Display"
+        self.theme_color = DEFAULT_THEME_COLOR
+        self.auto_parse_json = True
+        self.collapsed_by_default = False
+        self.split_mode = DEFAULT_SPLIT_MODE
+        self.split_pattern = None
+        self.json_view = DEFAULT_JSON_VIEW
+        self.max_sections: Optional[int] = None
+        # Sections longer than section_page_size are cut into pages that the
+        # page loads on demand; set by enable_section_paging()
+        self.section_page_size: Optional[int] = None
+        # Server-side id of the rendered page, used to fetch further pages
+        # and to search it (the search box shows when searchable is set)
+        self.document_id: Optional[str] = None
+        self.searchable = False
+        # Shared store of escaped section content, see FragmentCache
+        self.fragment_cache: Optional[FragmentCache] = None
+        # Documents with more than sections_per_page sections are shown one
+        # page at a time; set by paginate_document()
+        self.sections_per_page: Optional[int] = None
+        self.section_count = 0
+        self.page_number = 1
+        # Target of the "Enter New Data" link, and the store of CSS and
+        # JavaScript for pages that link to them instead (static exports)
+        self.home_url = "/"
+        self.shared_assets: Optional[SharedAssets] = None
+
+    def parse_data(self, data: Union[str, bytes, memoryview]) -> Sequence[Section]:
+        """Parse input data into structured sections.
+
+        ``data`` may be text or a UTF-8 byte buffer (``bytes``, ``memoryview``,
+        ``mmap``); text sections reference the buffer instead of copying it.
+        Raises ``ValueError`` for invalid settings or more than
+        ``max_sections`` sections.
+        """
+        if self.split_mode not in SPLITTERS:
+            raise ValueError(f"Unknown split mode: {self.split_mode}")
+        if self.json_view not in JSON_VIEWS:
+            raise ValueError(f"Unknown JSON view: {self.json_view}")
+        sections = self._parse_sections(data)
+        if self.max_sections is not None and len(sections) > self.max_sections:
+            raise ValueError(f"Input has {len(sections)} sections, more than the limit of {self.max_sections}")
+        return sections
+
+    def _parse_sections(self, data: Union[str, bytes, memoryview]) -> Sequence[Section]:
+        """Split ``data`` into sections with the configured strategy."""
+        if self.split_mode == "ndjson" or (
+                self.auto_parse_json and self.split_mode == DEFAULT_SPLIT_MODE
+                and _looks_like_ndjson(data)):
+            # JSON Lines: parse record by record instead of failing a full parse
+            return scan_ndjson(data)
+
+        sections = []
+
+        if self.auto_parse_json and _looks_like_json(data):
+            try:
+                # Try parsing as JSON
+                if not isinstance(data, (str, bytes, bytearray)):
+                    data_for_json = bytes(data)
+                else:
+                    data_for_json = data
+                parsed = json.loads(data_for_json)
+
+                if isinstance(parsed, dict):
+                    # Convert dict to sections
+                    for key, value in parsed.items():
+                        sections.append(Section.from_value(
+                            str(key).replace("_", " ").title(), value
+                        ))
+                elif isinstance(parsed, list):
+                    # Handle list of items
+                    for idx, item in enumerate(parsed):
+                        sections.append(Section.from_value(f"Item {idx + 1}", item))
+                else:
+                    sections.append(Section.from_value("Data", parsed))
+
+                return sections
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        # Fallback: Split by common section markers
+        if self.split_mode == "regex":
+            sections = scan_regex(data, self.split_pattern)
+        else:
+            sections = SPLITTERS[self.split_mode](data)
+        if sections is None:
+            # Single section
+            sections = [Section(data, title="Output")]
+
+        return sections
+
+    def _format_value(self, value: Any) -> str:
+        """Format a value for display."""
+        return format_value(value)
+
+    def _escape_html(self, text: str) -> str:
+        """Escape HTML special characters."""
+        return (text
+                .replace("&", "&amp;")
+                .replace("<", "&lt;")
+                .replace(">", "&gt;")
+                .replace('"', "&quot;")
+                .replace("'", "&#39;"))
+
+    def _darken_color(self, hex_color: str, amount: float) -> str:
+        """Darken a hex color by a percentage."""
+        return darken_color(hex_color, amount)
+
+    def generate_html(self, sections: Sequence[Section], extra_script: str = "", start: int = 0) -> str:
+        """Generate the complete HTML page.
+
+        ``extra_script`` is appended verbatim to the page script, which lets
+        other views (e.g. the live tail page) reuse the same shell. ``start``
+        is the index of the first section, for pages of a longer document.
+        """
+        return "".join(self.iter_html(sections, extra_script, batch_size=None, start=start))
+
+    def write_html(self, sections: Iterable[Section], out: TextIO, extra_script: str = "") -> None:
+        """Write the complete HTML page to a text stream."""
+        write = out.write
+        for chunk in self.iter_html(sections, extra_script):
+            write(chunk)
+
+    def iter_html(self, sections: Iterable[Section], extra_script: str = "",
+                  batch_size: Optional[int] = HTML_BATCH_SIZE, start: int = 0) -> Iterator[str]:
+        """
+        Yield the complete HTML page piece by piece.
+
+        ``sections`` may be any iterable, including a generator, so pages can
+        be streamed while the input is still being parsed. Section content
+        is escaped in bounded chunks read straight from the parsed input, so
+        neither the page nor a whole section is ever held as one string.
+
+        Cards are assembled from the static fragments of
+        ``SECTION_CARD_TEMPLATE`` and the card's own values, and only joined
+        once roughly ``batch_size`` characters have been collected (``None``
+        joins the whole page at once), so no string is built per card.
+
+        With paging enabled, sections longer than ``section_page_size`` only
+        embed their first page, followed by a "load more" button. In the
+        "tree" JSON view, JSON objects and arrays are embedded as compact
+        JSON for the page to expand on demand. With a ``fragment_cache``,
+        content seen in earlier renders is reused instead of escaped again.
+        """
+        (card_open, after_index, after_title, after_copy_index,
+         before_content, after_content, card_end) = card_fragments(self.collapsed_by_default)
+        card_close = after_content + card_end
+        escape = self._escape_html
+        limit = batch_size or sys.maxsize
+        page_size = self.section_page_size
+        tree_view = self.json_view == "tree"
+        fragments = self.fragment_cache
+        render = fragments.new_render() if fragments else 0
+
+        pieces = [self._page_head()]
+        pending = 0
+        for idx, section in enumerate(sections, start):
+            index = str(idx)
+            title = escape(section.title)
+            pieces += (card_open, index, after_index, title, after_title,
+                       index, after_copy_index, index, before_content)
+            length = section.end - section.start
+            close = card_close
+            tree = section.json_container if tree_view else None
+            if tree is not None:
+                data = compact_json(tree)
+                pieces += (after_content, JSON_TREE_OPEN, data, JSON_TREE_CLOSE)
+                pending += len(data)
+                close = card_end
+            elif page_size and length > page_size:
+                text, next_offset = section.read(0, page_size)
+                pieces += (escape(text), after_content,
+                           self._load_more_button(idx, next_offset, length))
+                pending += len(text)
+                close = card_end
+            elif length > CONTENT_CHUNK_SIZE:
+                for chunk in section.iter_chunks():
+                    pieces.append(escape(chunk))
+                    pending += len(chunk)
+            elif fragments:
+                content = fragments.escaped(section, escape, render)
+                pieces.append(content)
+                pending += len(content)
+            else:
+                content = section.content
+                pieces.append(escape(content))
+                pending += len(content)
+            pieces.append(close)
+            pending += CARD_STATIC_SIZE + len(title)
+            if pending >= limit:
+                yield "".join(pieces)
+                pieces.clear()
+                pending = 0
+        if page_size:
+            extra_script += PAGING_SCRIPT
+        if self.searchable:
+            extra_script += SEARCH_SCRIPT
+        if self.sections_per_page:
+            extra_script += PAGER_SCRIPT
+        if tree_view:
+            extra_script += JSON_TREE_SCRIPT
+        pieces.append(self._page_tail(extra_script))
+        yield "".join(pieces)
+
+    def iter_html_utf8(self, sections: Iterable[Section], extra_script: str = "",
+                       batch_size: Optional[int] = HTML_BATCH_SIZE, start: int = 0) -> Iterator[bytes]:
+        """
+        ``iter_html()`` yielding the page as UTF-8 bytes.
+
+        Text sections of byte input are escaped straight from the input
+        buffer (see ``iter_escaped_utf8()``), so raw bodies and uploads are
+        never decoded to ``str`` only to be encoded again for the response.
+        Other sections are rendered like ``iter_html()`` does and encoded.
+        Keep the two methods in step; their output is tested to match.
+        """
+        (card_open, after_index, after_title, after_copy_index,
+         before_content, after_content, card_end) = card_fragments_utf8(self.collapsed_by_default)
+        card_close = after_content + card_end
+        escape = self._escape_html
+        limit = batch_size or sys.maxsize
+        page_size = self.section_page_size
+        tree_view = self.json_view == "tree"
+        fragments = self.fragment_cache
+        render = fragments.new_render() if fragments else 0
+        tree_open = JSON_TREE_OPEN.encode("utf-8")
+        tree_close = JSON_TREE_CLOSE.encode("utf-8")
+
+        pieces = [self._page_head().encode("utf-8", "replace")]
+        pending = 0
+        for idx, section in enumerate(sections, start):
+            index = b"%d" % idx
+            title = escape(section.title).encode("utf-8", "replace")
+            pieces += (card_open, index, after_index, title, after_title,
+                       index, after_copy_index, index, before_content)
+            length = section.end - section.start
+            close = card_close
+            tree = section.json_container if tree_view else None
+            if tree is not None:
+                data = compact_json(tree).encode("utf-8")
+                pieces += (after_content, tree_open, data, tree_close)
+                pending += len(data)
+                close = card_end
+            elif page_size and length > page_size:
+                text, next_offset = section.read(0, page_size)
+                pieces += (escape(text).encode("utf-8", "replace"), after_content,
+                           self._load_more_button(idx, next_offset, length).encode("utf-8"))
+                pending += len(text)
+                close = card_end
+            elif section.is_utf8:
+                for chunk in iter_escaped_utf8(section.source, section.start, section.end):
+                    pieces.append(chunk)
+                    pending += len(chunk)
+            else:
+                if length > CONTENT_CHUNK_SIZE:
+                    chunks = map(escape, section.iter_chunks())
+                elif fragments:
+                    chunks = (fragments.escaped(section, escape, render),)
+                else:
+                    chunks = (escape(section.content),)
+                for chunk in chunks:
+                    chunk = chunk.encode("utf-8", "replace")
+                    pieces.append(chunk)
+                    pending += len(chunk)
+            pieces.append(close)
+            pending += CARD_STATIC_SIZE + len(title)
+            if pending >= limit:
+                yield b"".join(pieces)
+                pieces.clear()
+                pending = 0
+        if page_size:
+            extra_script += PAGING_SCRIPT
+        if self.searchable:
+            extra_script += SEARCH_SCRIPT
+        if self.sections_per_page:
+            extra_script += PAGER_SCRIPT
+        if tree_view:
+            extra_script += JSON_TREE_SCRIPT
+        pieces.append(self._page_tail(extra_script).encode("utf-8", "replace"))
+        yield b"".join(pieces)
+
+    def _load_more_button(self, idx: int, next_offset: int, length: int) -> str:
+        """Markup of the button that fetches the rest of a paged section."""
+        return (f'\n                    <button class="load-more" data-document="{self.document_id}" '
+                f'data-section="{idx}" data-offset="{next_offset}" onclick="loadMore(this)">'
+                f'{load_more_label(length - next_offset)}</button>')
+
+    def _stylesheet(self) -> str:
+        """The page's CSS: the theme plus the styles of the features in use."""
+        return (f'{get_theme(self.theme_color).stylesheet}{PAGING_STYLE if self.section_page_size else ""}'
+                f'{JSON_TREE_STYLE if self.json_view == "tree" else ""}{SEARCH_STYLE if self.searchable else ""}'
+                f'{PAGER_STYLE if self.sections_per_page else ""}')
+
+    def _page_head(self) -> str:
+        """Markup from the doctype up to the sections container."""
+        if self.shared_assets is None:
+            style = f"""    <style>
+{self._stylesheet()}    </style>
+"""
+            sprite = ICON_SPRITE
+        else:
+            style = f'    <link rel="stylesheet" href="{self.shared_assets.url("style", "css", self._stylesheet())}">\n'
+            sprite = ""  # added by the shared script
+        # Titles come from request parameters, so they are escaped here for every route
+        title = escape(self.title)
+        return f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+{style}</head>
 <body>
-    <div class="container">
+{sprite}    <div class="container">
         <div class="header">
-            <h1>{self.title}</h1>
+            <h1>{title}</h1>
             <p>Click on sections to expand/collapse • Click copy to copy text</p>
             <br>
-            <a href="/" class="back-link">← Enter New Data</a>
-        </div>
+            <a href="{self.home_url}" class="back-link">← Enter New Data</a>{self._search_box() if self.searchable else ""}
+        </div>{self._pager() if self.sections_per_page else ""}
 
         <div class="sections-container">
-            {sections_html}
-        </div>
+            """
+
+    def _search_box(self) -> str:
+        """Markup of the form that searches this page's sections on the server."""
+        return (f'\n            <form class="search-box" data-document="{self.document_id}" '
+                f'onsubmit="searchSections(this, event)">'
+                f'\n                <input type="search" name="q" placeholder="Search sections..." '
+                f'aria-label="Search sections" oninput="searchSoon(this.form)">'
+                f'\n                <ul class="search-results"></ul>'
+                f'\n            </form>')
+
+    def _pager(self) -> str:
+        """Markup of the navigation between the pages of a paginated document."""
+        url = f"/documents/{self.document_id}"
+        page = self.page_number
+        pages = -(-self.section_count // self.sections_per_page)
+        first = (page - 1) * self.sections_per_page + 1
+        last = min(page * self.sections_per_page, self.section_count)
+        previous_link = (f'<a href="{url}?page={page - 1}">← Previous</a>' if page > 1
+                         else '<span>← Previous</span>')
+        next_link = f'<a href="{url}?page={page + 1}">Next →</a>' if page < pages else '<span>Next →</span>'
+        return f"""
+        <nav class="pager" data-document="{self.document_id}" data-per-page="{self.sections_per_page}">
+            {previous_link}
+            <form action="{url}" method="get">
+                Page <input type="number" name="page" min="1" max="{pages}" value="{page}" aria-label="Page"> of {pages}
+                <span class="pager-range">(sections {first:,}–{last:,} of {self.section_count:,})</span>
+            </form>
+            {next_link}
+        </nav>"""
+
+    def _page_tail(self, extra_script: str = "") -> str:
+        """Markup from the end of the sections container to the end of the page."""
+        if self.shared_assets is None:
+            script = f"""    <script>
+{self._script(extra_script)}
+    </script>"""
+        else:
+            # The icon sprite goes first in the body, like an embedded one
+            sprite = f"document.body.insertAdjacentHTML('afterbegin', {compact_json(ICON_SPRITE)});\n"
+            url = self.shared_assets.url("script", "js", sprite + self._script(extra_script) + "\n")
+            script = f'    <script src="{url}"></script>'
+        return f"""
+        </div>{self._pager() if self.sections_per_page else ""}
     </div>
 
     <div class="toast" id="toast">Copied to clipboard!</div>
 
-    <script>
-        function toggleSection(sectionId) {{
+{script}
+</body>
+</html>
+        """
+
+    def _script(self, extra_script: str = "") -> str:
+        """The page's JavaScript: card controls, the entry animation and ``extra_script``."""
+        return f"""        function toggleSection(sectionId) {{
             const section = document.getElementById(sectionId).closest('.section-card');
             section.classList.toggle('collapsed');
         }}
@@ -405,19 +1814,27 @@ class DataDisplayGenerator:
         function copyText(sectionId, event) {{
             event.stopPropagation();
 
-            const contentElement = document.getElementById(sectionId).querySelector('.content-text');
-            const text = contentElement.textContent;
+            const section = document.getElementById(sectionId);
+            const jsonData = section.querySelector('.json-data');
+            const text = jsonData
+                ? JSON.stringify(JSON.parse(jsonData.textContent), null, 2)
+                : section.querySelector('.content-text').textContent;
+
+            const btn = event.currentTarget;
+            const icon = btn.querySelector('use');
+            const label = btn.lastChild;
+            const originalLabel = label.textContent;
 
             navigator.clipboard.writeText(text).then(() => {{
                 showToast('Copied to clipboard!');
 
-                const btn = event.currentTarget;
-                const originalText = btn.innerHTML;
-                btn.innerHTML = '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"></polyline></svg> Copied!';
+                icon.setAttribute('href', '#icon-check');
+                label.textContent = ' Copied! ';
                 btn.classList.add('copied');
 
                 setTimeout(() => {{
-                    btn.innerHTML = originalText;
+                    icon.setAttribute('href', '#icon-copy');
+                    label.textContent = originalLabel;
                     btn.classList.remove('copied');
                 }}, 2000);
             }}).catch(err => {{
@@ -436,78 +1853,2113 @@ class DataDisplayGenerator:
             }}, 3000);
         }}
 
-        // Add staggered animation to sections
+        // Add staggered animation to sections (capped, so long pages
+        // do not keep animating in for minutes)
         document.querySelectorAll('.section-card').forEach((card, index) => {{
-            card.style.animationDelay = `${{index * 0.1}}s`;
-        }});
-    </script>
-</body>
-</html>
-        """
-
-        return html
+            card.style.animationDelay = `${{Math.min(index, {MAX_STAGGERED_CARDS}) * 0.1}}s`;
+        }});{extra_script}"""
 
-    def generate(self, data: str, title: str = None, theme_color: str = None,
-                 auto_parse: bool = True, collapsed: bool = False) -> str:
+    def generate(self, data: Union[str, bytes, memoryview], title: str = None, theme_color: str = None,
+                 auto_parse: bool = True, collapsed: bool = False,
+                 split_mode: str = None, split_pattern: str = None, json_view: str = None) -> str:
         """Generate HTML from data with custom settings."""
+        self.configure(title, theme_color, auto_parse, collapsed, split_mode, split_pattern, json_view)
+        sections = self.parse_data(data)
+        return self.generate_html(sections)
+
+    def configure(self, title: str = None, theme_color: str = None,
+                  auto_parse: bool = True, collapsed: bool = False,
+                  split_mode: str = None, split_pattern: str = None, json_view: str = None) -> None:
+        """Apply display settings; empty values keep the current setting."""
         if title:
             self.title = title
         if theme_color:
             self.theme_color = theme_color
         self.auto_parse_json = auto_parse
         self.collapsed_by_default = collapsed
+        if split_mode:
+            self.split_mode = split_mode
+        if split_pattern:
+            self.split_pattern = split_pattern
+        if json_view:
+            self.json_view = json_view
+
+
+class IncrementalSectionParser:
+    """
+    Incremental counterpart of the blank-line fallback in ``parse_data``.
+
+    Text is fed in arbitrary chunks and turned into ``section``/``append``
+    events that add up to the sections ``parse_data`` gives for the whole
+    text. A section is opened once its title is certain: a short first line
+    followed by more text in the same part is a title, a long first line or
+    a part that ends on its first line is not. Trailing whitespace of titled
+    sections is held back until more text follows, as ``parse_data`` strips
+    it. Only the current chunk and the undecided head of the current part
+    are scanned, so each call costs O(chunk) for ordinary text.
+
+    Text without any blank line is a single "Output" section in
+    ``parse_data``, which is only known once the stream closes; the first
+    part is kept until the first blank line so ``close()`` can then rewrite
+    section 0 with a ``replace`` event.
+    """
+
+    TITLE_MAX_LENGTH = 100
 
-        sections = self.parse_data(data)
-        return self.generate_html(sections)
+    def __init__(self):
+        self.part_index = -1
+        self.section_id = -1
+        self._head = ""
+        self._titled: Optional[bool] = None  # None while the current part is undecided
+        self._trailing = ""
+        self._carry_newline = False
+        self._first_part: Optional[List[str]] = []
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of text and return the resulting events."""
+        events: List[Dict[str, Any]] = []
+        if self._carry_newline:
+            chunk = "\n" + chunk
+            self._carry_newline = False
+
+        parts = chunk.split("\n\n")
+        if parts[-1].endswith("\n"):
+            # Hold back a trailing newline: it may pair with the next chunk
+            self._carry_newline = True
+            parts[-1] = parts[-1][:-1]
+        if self.part_index < 0:
+            self.part_index = 0
+        self._extend(parts[0], events)
+        for part in parts[1:]:
+            self._finish_part(events)
+            self._first_part = None
+            self.part_index += 1
+            self._extend(part, events)
+        return events
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Flush any pending text once the producer is done."""
+        events: List[Dict[str, Any]] = []
+        if self._carry_newline:
+            self._carry_newline = False
+            self._extend("\n", events)
+        if self._first_part is None:
+            self._finish_part(events)
+            return events
+
+        # No blank line at all: the whole text is one section, as is
+        text = "".join(self._first_part)
+        self._first_part = None
+        if self.section_id < 0:
+            self._open("Output", False, events)
+            self._append(text, events)
+        else:
+            events.append({"type": "replace", "id": 0, "title": "Output", "text": text})
+        return events
+
+    def _extend(self, text: str, events: List[Dict[str, Any]]) -> None:
+        if not text:
+            return
+        if self._first_part is not None:
+            self._first_part.append(text)
+        if self._titled:
+            self._append_stripped(text, events)
+            return
+        if self._titled is not None:
+            self._append(text, events)
+            return
+
+        head = self._head = self._head + text
+        stripped = head.lstrip()
+        newline = stripped.find("\n")
+        if (newline if newline != -1 else len(stripped)) >= self.TITLE_MAX_LENGTH:
+            # The first line is too long to be a title: the raw part is the content
+            self._open(f"Section {self.part_index + 1}", False, events)
+            self._append(head, events)
+        elif newline != -1 and stripped[newline + 1:].strip():
+            self._open(stripped[:newline].strip("#* "), True, events)
+            self._append_stripped(stripped[newline + 1:], events)
+
+    def _open(self, title: str, titled: bool, events: List[Dict[str, Any]]) -> None:
+        self.section_id += 1
+        self._titled = titled
+        self._head = ""
+        events.append({"type": "section", "id": self.section_id, "title": title})
+
+    def _append(self, text: str, events: List[Dict[str, Any]]) -> None:
+        if text:
+            events.append({"type": "append", "id": self.section_id, "text": text})
+
+    def _append_stripped(self, text: str, events: List[Dict[str, Any]]) -> None:
+        text = self._trailing + text
+        body = text.rstrip()
+        self._trailing = text[len(body):]
+        self._append(body, events)
+
+    def _finish_part(self, events: List[Dict[str, Any]]) -> None:
+        head = self._head
+        if self._titled is None and head.strip():
+            # Part ended on its first line: untitled section of the raw part, like parse_data
+            self._open(f"Section {self.part_index + 1}", False, events)
+            self._append(head, events)
+        self._head = ""
+        self._trailing = ""
+        self._titled = None
+
+
+class LiveStream:
+    """Event log for one live tail, shared by the producer and subscribers."""
+
+    def __init__(self):
+        self.parser = IncrementalSectionParser()
+        self.events: List[Dict[str, Any]] = []
+        self.closed = False
+        self.size = 0
+        self.updated = time.time()
+        self.condition = threading.Condition()
+
+    def push(self, chunk: str) -> int:
+        with self.condition:
+            new_events = self.parser.feed(chunk)
+            self.events.extend(new_events)
+            self.size += len(chunk)
+            self.updated = time.time()
+            self.condition.notify_all()
+        return len(new_events)
+
+    def close(self) -> None:
+        with self.condition:
+            self.events.extend(self.parser.close())
+            self.closed = True
+            self.updated = time.time()
+            self.condition.notify_all()
+
+    def wait_for(self, index: int, timeout: float) -> None:
+        """Block until there are events past ``index`` or the stream closes."""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: len(self.events) > index or self.closed, timeout=timeout
+            )
+
+
+LIVE_STREAM_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+LIVE_KEEPALIVE_SECONDS = 15.0
+
+live_streams: "OrderedDict[str, LiveStream]" = OrderedDict()
+live_streams_lock = threading.Lock()
+
+
+def get_live_stream(stream_id: str, create: bool = False) -> Optional[LiveStream]:
+    """
+    Look up a live stream, optionally creating it on first use. Beyond
+    ``LIVE_STREAMS_MAX`` streams the least recently used are dropped.
+    """
+    evict_live_streams()
+    with live_streams_lock:
+        stream = live_streams.get(stream_id)
+        if stream is None:
+            if not create:
+                return None
+            stream = live_streams[stream_id] = LiveStream()
+            while len(live_streams) > app.config['LIVE_STREAMS_MAX']:
+                live_streams.popitem(last=False)
+        live_streams.move_to_end(stream_id)
+        return stream
+
+
+def evict_live_streams() -> None:
+    """Forget streams closed, or left without new text, ``LIVE_STREAM_TTL`` seconds ago."""
+    cutoff = time.time() - app.config['LIVE_STREAM_TTL']
+    with live_streams_lock:
+        for stream_id in [stream_id for stream_id, stream in live_streams.items() if stream.updated <= cutoff]:
+            del live_streams[stream_id]
+
+
+def section_card_script(collapsed: bool) -> str:
+    """
+    Client-side twin of the section card markup built by ``iter_html``.
+
+    Defines ``addSectionCard(id, title, text)`` for pages that build their
+    cards in the browser (live tail, client-side rendering).
+    """
+    collapsed_class = "collapsed" if collapsed else ""
+    return """
+
+        const sectionsContainer = document.querySelector('.sections-container');
+
+        function addSectionCard(id, title, text) {
+            const sectionId = `section-${id}`;
+            const card = document.createElement('div');
+            card.className = %(card_class)s;
+            card.innerHTML = `
+                <div class="section-header" onclick="toggleSection('${sectionId}')">
+                    <div class="section-title">
+                        <span class="toggle-icon">▼</span>
+                        <h3></h3>
+                    </div>
+                    <button class="copy-btn" onclick="copyText('${sectionId}', event)" title="Copy to clipboard">
+                        <svg class="icon"><use href="#icon-copy"></use></svg>
+                        Copy
+                    </button>
+                </div>
+                <div class="section-content" id="${sectionId}">
+                    <pre class="content-text"></pre>
+                </div>`;
+            card.querySelector('h3').textContent = title;
+            card.querySelector('.content-text').textContent = text;
+            sectionsContainer.appendChild(card);
+            return card;
+        }""" % {"card_class": json.dumps(f"section-card {collapsed_class}".strip())}
+
+
+def live_page_script(stream_id: str, collapsed: bool) -> str:
+    """Client script that turns SSE events into section cards."""
+    return section_card_script(collapsed) + """
+
+        // Live tail: build cards as the producer streams text in. The feed
+        // is 404 until the producer's first chunk, so retry until it opens.
+        let liveOpened = false;
+
+        function followLiveStream() {
+            const liveSource = new EventSource(%(events_url)s);
+
+            liveSource.addEventListener('open', () => { liveOpened = true; });
+
+            liveSource.addEventListener('error', () => {
+                if (!liveOpened && liveSource.readyState === EventSource.CLOSED) {
+                    setTimeout(followLiveStream, 2000);
+                }
+            });
+
+            liveSource.addEventListener('section', (e) => {
+                const event = JSON.parse(e.data);
+                addSectionCard(event.id, event.title, '');
+            });
+
+            liveSource.addEventListener('append', (e) => {
+                const event = JSON.parse(e.data);
+                const content = document.getElementById(`section-${event.id}`);
+                if (content) {
+                    content.querySelector('.content-text').append(event.text);
+                }
+            });
+
+            // Sent on close when the text had no blank line: it is all one section
+            liveSource.addEventListener('replace', (e) => {
+                const event = JSON.parse(e.data);
+                const content = document.getElementById(`section-${event.id}`);
+                if (content) {
+                    content.closest('.section-card').querySelector('h3').textContent = event.title;
+                    content.querySelector('.content-text').textContent = event.text;
+                }
+            });
+
+            liveSource.addEventListener('done', () => liveSource.close());
+        }
+
+        followLiveStream();""" % {
+        "events_url": json.dumps(f"/live/{stream_id}/events"),
+    }
+
+
+# IndexedDB database and object store the input page hands parsed sections over in
+CLIENT_SECTIONS_DB = "dataDisplay"
+CLIENT_SECTIONS_STORE = "sections"
+
+
+def client_page_script(collapsed: bool) -> str:
+    """Client script that renders sections parsed by ``/api/parse``."""
+    return section_card_script(collapsed) + """
+
+        // Client-side rendering: the input page stores the parsed sections in
+        // IndexedDB under the key passed as ?sections=
+        const sectionsKey = new URLSearchParams(location.search).get('sections');
+        if (sectionsKey && window.indexedDB) {
+            const openRequest = indexedDB.open(%(db)s, 1);
+            openRequest.onupgradeneeded = () => openRequest.result.createObjectStore(%(store)s);
+            openRequest.onsuccess = () => {
+                const db = openRequest.result;
+                const getRequest = db.transaction(%(store)s).objectStore(%(store)s).get(sectionsKey);
+                getRequest.onsuccess = () => {
+                    (getRequest.result ? getRequest.result.sections : []).forEach((section, index) => {
+                        const card = addSectionCard(index, section.title, section.content);
+                        card.style.animationDelay = `${Math.min(index, %(max_staggered)d) * 0.1}s`;
+                    });
+                    db.close();
+                };
+            };
+        }""" % {"db": json.dumps(CLIENT_SECTIONS_DB), "store": json.dumps(CLIENT_SECTIONS_STORE),
+                "max_staggered": MAX_STAGGERED_CARDS}
+
+
+@lru_cache(maxsize=32)
+def client_page_shell(title: str, theme_color: str, collapsed: bool) -> str:
+    """The (cacheable) page shell used for client-side rendering."""
+    generator = DataDisplayGenerator()
+    generator.title = title
+    generator.theme_color = theme_color
+    generator.collapsed_by_default = collapsed
+    return generator.generate_html([], extra_script=client_page_script(collapsed))
+
+
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+CHUNK_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+UPLOAD_MAX_CHUNK_SIZE = 8 << 20
+
+
+def upload_path(*parts: str) -> str:
+    """Path inside the upload folder (chunks/, manifests/ and files/)."""
+    return os.path.join(app.config['UPLOAD_FOLDER'], *parts)
+
+
+def write_file_atomic(path: str, chunks: Iterable[bytes]) -> None:
+    """Write a file so readers never observe it half-written."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_upload_manifest(upload_id: str) -> Optional[List[str]]:
+    """Ordered chunk hashes of an upload, or ``None`` if it does not exist."""
+    if not UPLOAD_ID_PATTERN.match(upload_id):
+        return None
+    try:
+        with open(upload_path('manifests', f'{upload_id}.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def missing_upload_chunks(upload_id: str, chunks: List[str]) -> List[str]:
+    """Chunk hashes not yet stored, in upload order and without duplicates."""
+    if os.path.exists(upload_path('files', upload_id)):
+        return []
+    missing = []
+    for chunk_hash in dict.fromkeys(chunks):
+        if not os.path.exists(upload_path('chunks', chunk_hash)):
+            missing.append(chunk_hash)
+    return missing
+
+
+def iter_upload_chunks(chunks: List[str]) -> Iterator[bytes]:
+    for chunk_hash in chunks:
+        with open(upload_path('chunks', chunk_hash), 'rb') as f:
+            yield f.read()
+
+
+def stored_upload_size(chunks: List[str]) -> int:
+    """Size the stored chunks of an upload add up to, counting repeated chunks each time."""
+    sizes = {}
+    for chunk_hash in dict.fromkeys(chunks):
+        try:
+            sizes[chunk_hash] = os.path.getsize(upload_path('chunks', chunk_hash))
+        except OSError:
+            sizes[chunk_hash] = 0
+    return sum(sizes[chunk_hash] for chunk_hash in chunks)
+
+
+def touch_upload(upload_id: str) -> None:
+    """Mark an upload as used, so ``evict_uploads()`` keeps it."""
+    for path in (upload_path('manifests', f'{upload_id}.json'), upload_path('files', upload_id)):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+
+def delete_upload_chunks(upload_id: str, chunks: List[str]) -> None:
+    """Delete an assembled upload's chunks, except those other unassembled uploads still need."""
+    needed = set()
+    for name in os.listdir(upload_path('manifests')):
+        other_id = name[:-len('.json')]
+        if other_id != upload_id and not os.path.exists(upload_path('files', other_id)):
+            needed.update(load_upload_manifest(other_id) or ())
+    for chunk_hash in set(chunks) - needed:
+        try:
+            os.unlink(upload_path('chunks', chunk_hash))
+        except FileNotFoundError:
+            pass
+
+
+def evict_uploads() -> None:
+    """
+    Delete uploads (manifest and assembled file) and stray chunks not used
+    for ``UPLOAD_TTL`` seconds. An unfinished upload that loses chunks this
+    way reports them as missing again when it is resumed.
+    """
+    cutoff = time.time() - app.config['UPLOAD_TTL']
+    for folder in ('manifests', 'files', 'chunks'):
+        try:
+            entries = list(os.scandir(upload_path(folder)))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime <= cutoff:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+class RenderLane:
+    """
+    Admission control for one class of renders.
+
+    At most ``slots`` renders run at once and at most ``queue_size`` more
+    requests wait for a slot; anything beyond that is turned away.
+    """
+
+    def __init__(self, slots: int, queue_size: int):
+        self.slots = threading.BoundedSemaphore(slots)
+        self.queue_size = queue_size
+        self.waiting = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> Optional[int]:
+        """Take a slot; returns ``None`` on success or the HTTP status to reject with."""
+        if self.slots.acquire(blocking=False):
+            return None
+        with self.lock:
+            if self.waiting >= self.queue_size:
+                return 429
+            self.waiting += 1
+        try:
+            return None if self.slots.acquire(timeout=timeout) else 503
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def release(self) -> None:
+        self.slots.release()
+
+
+render_lanes: Dict[str, RenderLane] = {}
+render_lanes_lock = threading.Lock()
+
+
+def get_render_lane(large: bool) -> RenderLane:
+    """The lane for small or large renders, created from the app config on first use."""
+    name = 'LARGE_RENDER' if large else 'RENDER'
+    with render_lanes_lock:
+        lane = render_lanes.get(name)
+        if lane is None:
+            lane = render_lanes[name] = RenderLane(
+                app.config[f'{name}_SLOTS'], app.config[f'{name}_QUEUE_SIZE']
+            )
+        return lane
+
+
+def error_response(status: int, message: str, retry_after: Optional[int] = None) -> Response:
+    """An error in the style of the current route: JSON under /api/, plain text elsewhere."""
+    if request.path.startswith('/api/'):
+        response = jsonify({'error': message, 'success': False})
+    else:
+        response = Response(message, mimetype='text/plain')
+    response.status_code = status
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def request_json() -> Any:
+    """
+    The request's JSON body, decompressed first if it was sent with
+    ``Content-Encoding: gzip`` (or ``deflate``). The decompressed body is
+    held to ``MAX_CONTENT_LENGTH`` too; raises ``ValueError`` beyond it.
+    """
+    encoding = request.headers.get('Content-Encoding', 'identity').lower()
+    if encoding == 'identity':
+        return request.json
+    if encoding not in ('gzip', 'deflate'):
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    limit = request.max_content_length
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | (16 if encoding == 'gzip' else 0))
+    try:
+        body = decompressor.decompress(request.get_data(), 0 if limit is None else limit + 1)
+    except zlib.error as e:
+        raise ValueError(f"Invalid {encoding} body: {e}") from e
+    if limit is not None and len(body) > limit:
+        raise ValueError(f"Request body is larger than {limit} bytes once decompressed")
+    return json.loads(body)
+
+
+def admission_controlled(request_size: Optional[Callable[..., int]] = None):
+    """
+    Run a render view under admission control.
+
+    The request is sized by ``request_size(**view_args)`` (default: its
+    body length) to pick the small or large lane. A slot is held until the
+    response is built, or until it has been sent if it is streamed. When
+    the lane's queue is full the request gets 429, and 503 if no slot frees
+    up within ``RENDER_QUEUE_TIMEOUT``, both with a ``Retry-After`` header.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            max_length = request.max_content_length
+            if max_length is not None and (request.content_length or 0) > max_length:
+                return error_response(413, f"Request body is larger than {max_length} bytes")
+
+            size = request_size(**kwargs) if request_size else request.content_length or 0
+            lane = get_render_lane(size >= app.config['LARGE_RENDER_THRESHOLD'])
+            rejected = lane.acquire(app.config['RENDER_QUEUE_TIMEOUT'])
+            if rejected is not None:
+                message = "Too many renders queued" if rejected == 429 else "Timed out waiting to render"
+                return error_response(rejected, message, app.config['RENDER_RETRY_AFTER'])
+
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            except BaseException:
+                lane.release()
+                raise
+            if response.is_streamed:
+                response.response = _release_when_sent(response.response, lane)
+            else:
+                lane.release()
+            return response
+        return wrapper
+    return decorator
+
+
+def _release_when_sent(chunks: Iterable, lane: RenderLane) -> Iterator:
+    """Pass a streamed body through, freeing its render slot once it is sent or closed."""
+    try:
+        yield from chunks
+    finally:
+        lane.release()
+
+
+@app.errorhandler(413)
+def request_too_large(error):
+    """Reply to oversized bodies in the route's error format"""
+    return error_response(413, "Request body is too large")
+
+
+def upload_size(upload_id: str) -> int:
+    """Size of an assembled upload, for picking its render lane."""
+    try:
+        return os.path.getsize(upload_path('files', upload_id)) if UPLOAD_ID_PATTERN.match(upload_id) else 0
+    except OSError:
+        return 0
+
+
+def upload_assembly_size(upload_id: str) -> int:
+    """Size of the file an upload assembles to, for picking the lane that writes it."""
+    return stored_upload_size(load_upload_manifest(upload_id) or [])
+
+
+# Documents with paged sections or pages: sections, generator, input size
+# and the callback releasing the input (e.g. an upload's mapping), least
+# recently used first
+paged_documents: "OrderedDict[str, Tuple[Sequence[Section], DataDisplayGenerator, int, Optional[Callable]]]" = \
+    OrderedDict()
+paged_documents_lock = threading.Lock()
+# Rendered pages of paginated documents by (document id, page number)
+rendered_pages: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+rendered_pages_lock = threading.Lock()
+
+
+def requested_page_size(section_page_kb: Optional[str]) -> Optional[int]:
+    """Section page size for a request; ``section_page_kb=0`` turns paging off."""
+    if section_page_kb is None or not section_page_kb.strip():
+        return app.config['SECTION_PAGE_SIZE']
+    try:
+        return max(int(section_page_kb), 0) * 1024 or None
+    except ValueError:
+        return app.config['SECTION_PAGE_SIZE']
+
+
+def enable_section_paging(generator: DataDisplayGenerator, sections: Sequence[Section],
+                          page_size: Optional[int], close: Optional[Callable[[], None]] = None) -> Sequence[Section]:
+    """
+    Render sections longer than ``page_size`` one page at a time.
+
+    Documents with such a section are kept in ``paged_documents`` (within
+    ``PAGED_DOCUMENTS_MAX_SIZE``) so their cards can fetch further pages;
+    ``close`` is called once they are dropped from it. Returns the sections
+    to render, with JSON values formatted once so they can be read by offset.
+    """
+    if not page_size:
+        return sections
+    if isinstance(sections, SectionSpans):
+        longest = sections.max_length()
+    else:
+        keep_json = generator.json_view == "tree"
+        sections = [section if keep_json and section.json_container is not None else section.as_text()
+                    for section in sections]
+        longest = max((section.end - section.start for section in sections), default=0)
+    if longest <= page_size:
+        return sections
+
+    generator.section_page_size = page_size
+    store_document(generator, sections, close)
+    return sections
+
+
+def requested_sections_per_page(sections_per_page: Optional[str]) -> Optional[int]:
+    """Sections per page for a request; ``sections_per_page=0`` puts them all on one page."""
+    if sections_per_page is None or not sections_per_page.strip():
+        return app.config['SECTIONS_PER_PAGE'] or None
+    try:
+        return max(int(sections_per_page), 0) or None
+    except ValueError:
+        return app.config['SECTIONS_PER_PAGE'] or None
+
+
+def paginate_document(generator: DataDisplayGenerator, sections: Sequence[Section],
+                      sections_per_page: Optional[int], close: Optional[Callable[[], None]] = None) -> bool:
+    """
+    Show documents with more than ``sections_per_page`` sections one page at a time.
+
+    The parsed document is kept like paged sections are (``close`` is
+    called once it is dropped), so each page only formats and escapes its
+    own slice; render pages with ``render_document_page()``. Returns
+    whether the document was paginated.
+    """
+    if not sections_per_page or len(sections) <= sections_per_page:
+        return False
+    generator.sections_per_page = sections_per_page
+    generator.section_count = len(sections)
+    store_document(generator, sections, close)
+    return True
+
+
+def store_document(generator: DataDisplayGenerator, sections: Sequence[Section],
+                   close: Optional[Callable[[], None]] = None) -> None:
+    """
+    Keep a document's sections and settings (within ``PAGED_DOCUMENTS_MAX_SIZE``)
+    under its id. ``close`` is called when it is evicted.
+    """
+    if isinstance(sections, SectionSpans):
+        size = len(sections.source)
+    else:
+        # Sections often share one source (JSON Lines records): count each source once
+        sources = {id(section.source): section.source for section in sections}
+        size = sum(map(len, sources.values()))
+    if generator.document_id is None:
+        generator.document_id = os.urandom(16).hex()
+    evicted = []
+    with paged_documents_lock:
+        paged_documents[generator.document_id] = (sections, generator, size, close)
+        paged_documents.move_to_end(generator.document_id)
+        total = sum(entry[2] for entry in paged_documents.values())
+        while total > app.config['PAGED_DOCUMENTS_MAX_SIZE'] and len(paged_documents) > 1:
+            entry = paged_documents.popitem(last=False)[1]
+            total -= entry[2]
+            evicted.append(entry[3])
+    for evicted_close in evicted:
+        if evicted_close is not None:
+            try:
+                evicted_close()
+            except BufferError:
+                # A render still reads the mapping; it closes once collected
+                pass
+
+
+def render_document_page(generator: DataDisplayGenerator, sections: Sequence[Section], page: int) -> str:
+    """Render (or fetch from ``rendered_pages``) one page of a paginated document."""
+    key = (generator.document_id, page)
+    with rendered_pages_lock:
+        html = rendered_pages.get(key)
+        if html is not None:
+            rendered_pages.move_to_end(key)
+            return html
+
+    page_generator = copy.copy(generator)
+    page_generator.page_number = page
+    start = (page - 1) * generator.sections_per_page
+    html = page_generator.generate_html(sections[start:start + generator.sections_per_page], start=start)
+
+    with rendered_pages_lock:
+        rendered_pages[key] = html
+        total = sum(map(len, rendered_pages.values()))
+        while total > app.config['RENDERED_PAGES_MAX_SIZE'] and len(rendered_pages) > 1:
+            total -= len(rendered_pages.popitem(last=False)[1])
+    return html
+
+
+fragment_cache = FragmentCache(app.config['FRAGMENT_CACHE_MAX_SIZE'], app.config['FRAGMENT_CACHE_MIN_SIZE'])
+
+
+def get_fragment_cache() -> Optional[FragmentCache]:
+    """The shared fragment cache with the current limits, or ``None`` when it is turned off."""
+    if not app.config['FRAGMENT_CACHE_MAX_SIZE']:
+        return None
+    fragment_cache.max_size = app.config['FRAGMENT_CACHE_MAX_SIZE']
+    fragment_cache.min_size = app.config['FRAGMENT_CACHE_MIN_SIZE']
+    return fragment_cache
+
+
+RENDER_STRATEGIES = ("inline", "streamed", "paged", "parallel")
+
+# Renders, input bytes and seconds spent per strategy, for /api/stats
+render_metrics: Dict[str, Dict[str, float]] = {
+    strategy: {'count': 0, 'input_bytes': 0, 'seconds': 0.0} for strategy in RENDER_STRATEGIES
+}
+render_metrics_lock = threading.Lock()
+# concurrent.futures.ProcessPoolExecutor for "parallel" renders, created with the first one
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def select_render_strategy(sections: Sequence[Section], data_size: int, page_size: Optional[int],
+                           sections_per_page: Optional[int], json_view: str = DEFAULT_JSON_VIEW) -> str:
+    """
+    Pick how to render a parsed document from cheap facts about it: input
+    size, section count, the longest text section and how many sections
+    hold JSON objects or arrays.
+
+    - ``paged``: more sections than a page holds, or a section longer than
+      a section page; only the first page of either is rendered up front
+    - ``parallel``: large JSON documents, whose values are formatted by a
+      pool of processes before the page is streamed (never on one CPU,
+      where the workers would only compete with the server)
+    - ``streamed``: other large inputs, sent in batches as they are built
+    - ``inline``: small inputs, built in one string and sent at once
+    """
+    if sections_per_page and len(sections) > sections_per_page:
+        return "paged"
+    if isinstance(sections, SectionSpans):
+        if page_size and sections.max_length() > page_size:
+            return "paged"
+    else:
+        if page_size and max((section.end - section.start for section in sections), default=0) > page_size:
+            return "paged"
+        if (json_view != "tree" and data_size >= app.config['PARALLEL_RENDER_MIN_SIZE']
+                and app.config['PARALLEL_RENDER_WORKERS'] and (os.cpu_count() or 1) > 1
+                and sum(section.json_container is not None for section in sections) > 1):
+            return "parallel"
+    if data_size >= app.config['STREAMED_RENDER_MIN_SIZE']:
+        return "streamed"
+    return "inline"
+
+
+def format_json_text(data: str) -> str:
+    """Indent compact JSON for display; runs in the render worker processes."""
+    return format_value(json.loads(data))
+
+
+def format_json_in_pool(sections: Sequence[Section]) -> Sequence[Section]:
+    """``format_json_sections()`` on the render pool, or ``sections`` as they are if the pool fails."""
+    try:
+        return format_json_sections(sections, get_render_pool())
+    except Exception as e:
+        app.logger.warning("Parallel formatting failed, formatting in process: %s", e)
+        return sections
+
+
+def format_json_sections(sections: Sequence[Section], executor) -> List[Section]:
+    """
+    Format the JSON objects and arrays of ``sections`` on ``executor``'s workers.
+
+    Values are sent as compact JSON, which is quick to produce and to pass
+    between processes, and come back indented. Other sections are kept.
+    """
+    containers = [idx for idx, section in enumerate(sections) if section.json_container is not None]
+    payloads = [json.dumps(sections[idx].json_container) for idx in containers]
+    formatted = list(sections)
+    chunk_size = max(1, len(payloads) // (4 * app.config['PARALLEL_RENDER_WORKERS'] or 1))
+    for idx, text in zip(containers, executor.map(format_json_text, payloads, chunksize=chunk_size)):
+        formatted[idx] = Section(text, title=sections[idx].title)
+    return formatted
+
+
+def get_render_pool():
+    """The process pool for "parallel" renders (started, not forked, so it is safe next to threads)."""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            _render_pool = ProcessPoolExecutor(app.config['PARALLEL_RENDER_WORKERS'],
+                                               mp_context=multiprocessing.get_context('spawn'))
+        return _render_pool
+
+
+def record_render(strategy: str, data_size: int, seconds: float) -> None:
+    with render_metrics_lock:
+        metrics = render_metrics[strategy]
+        metrics['count'] += 1
+        metrics['input_bytes'] += data_size
+        metrics['seconds'] += seconds
+
+
+# Block size used to send spilled responses back from disk
+SPOOL_READ_SIZE = 256 * 1024
+
+# Responses spilled to disk by spool_response() and their bytes, for /api/stats
+spill_metrics = {'count': 0, 'bytes': 0}
+
+
+class SpooledBody:
+    """
+    A response body spilled to a temporary file, read back in
+    ``SPOOL_READ_SIZE`` blocks. The file is deleted once sent or closed.
+
+    The body is sized, so werkzeug does not treat it as streamed: its
+    render slot is freed and its profile finished once the page is on disk,
+    not once a slow client has read all of it.
+    """
+
+    def __init__(self, file, size: int):
+        self.file = file
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            self.file.seek(0)
+            read = self.file.read
+            while True:
+                block = read(SPOOL_READ_SIZE)
+                if not block:
+                    break
+                yield block
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def spool_response(chunks: Iterable[bytes], mimetype: str) -> Response:
+    """
+    A response assembled from ``chunks``, kept in memory up to
+    ``RENDER_MEMORY_BUDGET`` bytes and spilled to a temporary file beyond.
+
+    The render still finishes before anything is sent, so errors can be
+    reported, but a huge page costs disk space rather than worker memory.
+    """
+    budget = app.config['RENDER_MEMORY_BUDGET']
+    if budget is None:
+        return Response(b"".join(chunks), mimetype=mimetype)
+    held: List[bytes] = []
+    size = 0
+    spill = None
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            if spill is not None:
+                spill.write(chunk)
+            elif size > budget:
+                spill = tempfile.TemporaryFile(dir=app.config['RENDER_SPOOL_DIR'])
+                spill.writelines(held)
+                spill.write(chunk)
+                held = []
+            else:
+                held.append(chunk)
+    except BaseException:
+        if spill is not None:
+            spill.close()
+        raise
+    if spill is None:
+        return Response(b"".join(held), mimetype=mimetype)
+
+    with render_metrics_lock:
+        spill_metrics['count'] += 1
+        spill_metrics['bytes'] += size
+    response = Response(SpooledBody(spill, size), mimetype=mimetype)
+    response.content_length = size
+    return response
+
+
+def render_document(generator: DataDisplayGenerator, sections: Sequence[Section], data_size: int,
+                    page_size: Optional[int], sections_per_page: Optional[int],
+                    close: Optional[Callable[[], None]] = None) -> Response:
+    """
+    Render a parsed document with the strategy ``select_render_strategy()``
+    picks, reported in the ``X-Render-Strategy`` header and ``render_metrics``.
+
+    ``close`` releases the input once the page is sent, unless the document
+    is kept for paging.
+    """
+    strategy = select_render_strategy(sections, data_size, page_size, sections_per_page, generator.json_view)
+    started = time.perf_counter()
+    if strategy == "parallel":
+        sections = format_json_in_pool(sections)
+
+    sections = enable_section_paging(generator, sections, page_size, close)
+    kept = paginate_document(generator, sections, sections_per_page, close) or generator.section_page_size is not None
+    if kept and strategy != "parallel":
+        strategy = "paged"
+
+    def finish():
+        record_render(strategy, data_size, time.perf_counter() - started)
+        if close is not None and not kept:
+            close()
+
+    # Byte input is escaped and sent as bytes, without a round trip through str
+    utf8 = len(sections) > 0 and sections[0].is_utf8
+    iter_html = generator.iter_html_utf8 if utf8 else generator.iter_html
+    if generator.sections_per_page:
+        response = Response(render_document_page(generator, sections, 1), mimetype='text/html')
+    elif strategy == "inline":
+        # Assembled before it is sent, within the per-request memory budget
+        chunks = iter_html(sections)
+        try:
+            response = spool_response(chunks if utf8 else (chunk.encode('utf-8') for chunk in chunks),
+                                      'text/html')
+        except BaseException:
+            if close is not None:
+                close()
+            raise
+    else:
+        def body_chunks():
+            try:
+                yield from iter_html(sections)
+            finally:
+                finish()
+
+        response = Response(stream_with_context(body_chunks()), mimetype='text/html')
+        response.headers['X-Render-Strategy'] = strategy
+        return response
+
+    finish()
+    response.headers['X-Render-Strategy'] = strategy
+    return response
+
+
+def get_paged_document(document_id: str) -> Optional[Tuple[Sequence[Section], DataDisplayGenerator]]:
+    """Look up a kept document's sections and the generator that rendered it."""
+    with paged_documents_lock:
+        entry = paged_documents.get(document_id)
+        if entry is None:
+            return None
+        paged_documents.move_to_end(document_id)
+        return entry[0], entry[1]
+
+
+# Highlight markers passed to FTS5's snippet(), replaced once the snippet is escaped
+SNIPPET_OPEN = "\x02"
+SNIPPET_CLOSE = "\x03"
+
+
+def fts_query(text: str) -> str:
+    """FTS5 query matching every word of ``text``, the last one as a prefix."""
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    return " ".join(words) + "*" if words else ""
+
+
+class SearchIndex:
+    """
+    Full-text index of rendered sections in an SQLite FTS5 table.
+
+    Each document's sections get consecutive rowids, recorded in
+    ``documents``, so one document can be searched or dropped by rowid
+    range. Connections are per thread; only the indexing thread writes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            created REAL NOT NULL,
+            first_row INTEGER NOT NULL,
+            last_row INTEGER NOT NULL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS sections USING fts5(
+            title, content, document_id UNINDEXED, section UNINDEXED
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def connect(self):
+        """This thread's connection, creating the index on first use."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            import sqlite3  # only needed once something is indexed or searched
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(self.SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def add(self, document_id: str, title: str, sections: Iterable[Section], max_documents: int) -> None:
+        """Index a document's sections, dropping the oldest documents beyond ``max_documents``."""
+        connection = self.connect()
+        with connection:
+            first_row = connection.execute('SELECT coalesce(max(last_row), 0) + 1 FROM documents').fetchone()[0]
+            count = 0
+            rows = ((first_row + idx, section.title, section.content, document_id, idx)
+                    for idx, section in enumerate(sections))
+            for batch in iter(lambda: list(islice(rows, 256)), []):
+                connection.executemany(
+                    'INSERT INTO sections (rowid, title, content, document_id, section) VALUES (?, ?, ?, ?, ?)',
+                    batch)
+                count += len(batch)
+            if not count:
+                return
+            connection.execute('INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?)',
+                                (document_id, title, time.time(), first_row, first_row + count - 1))
+            stale = connection.execute('SELECT id, first_row, last_row FROM documents '
+                                       'ORDER BY first_row DESC LIMIT -1 OFFSET ?', (max_documents,)).fetchall()
+            for stale_id, stale_first, stale_last in stale:
+                connection.execute('DELETE FROM sections WHERE rowid BETWEEN ? AND ?', (stale_first, stale_last))
+                connection.execute('DELETE FROM documents WHERE id = ?', (stale_id,))
+
+    def search(self, query: str, document_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Best matches for ``query``, across all documents or in document order
+        within one. Snippets are HTML with the matched words in ``<mark>``.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        connection = self.connect()
+        sql = ('SELECT document_id, section, title, snippet(sections, -1, ?, ?, ?, 16) '
+               'FROM sections WHERE sections MATCH ?')
+        params: List[Any] = [SNIPPET_OPEN, SNIPPET_CLOSE, '...', match]
+        if document_id is None:
+            sql += ' ORDER BY rank'
+        else:
+            rows = connection.execute('SELECT first_row, last_row FROM documents WHERE id = ?',
+                                      (document_id,)).fetchone()
+            if rows is None:
+                return []
+            sql += ' AND rowid BETWEEN ? AND ? ORDER BY rowid'
+            params += rows
+        params.append(limit)
+        return [{
+            'document_id': found_id,
+            'section': section,
+            'title': title,
+            'snippet': str(escape(snippet)).replace(SNIPPET_OPEN, '<mark>').replace(SNIPPET_CLOSE, '</mark>'),
+        } for found_id, section, title, snippet in connection.execute(sql + ' LIMIT ?', params)]
+
+
+_search_index: Optional[SearchIndex] = None
+# concurrent.futures.ThreadPoolExecutor with the one indexing thread, created with the first document
+_search_executor = None
+_search_pending = 0
+search_lock = threading.Lock()
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """The index at ``SEARCH_INDEX_PATH``, or ``None`` when search is turned off."""
+    global _search_index
+    path = app.config['SEARCH_INDEX_PATH']
+    if not path:
+        return None
+    with search_lock:
+        if _search_index is None or _search_index.path != path:
+            _search_index = SearchIndex(path)
+        return _search_index
+
+
+def index_document(generator: DataDisplayGenerator, sections: Sequence[Section]) -> bool:
+    """
+    Queue a parsed document for the search index and give its page a search box.
+
+    Indexing runs on a background thread, so the page is not held up by it.
+    Documents arriving while ``SEARCH_QUEUE_SIZE`` others wait are not indexed.
+    """
+    global _search_executor, _search_pending
+    index = get_search_index()
+    if index is None:
+        return False
+    with search_lock:
+        if _search_pending >= app.config['SEARCH_QUEUE_SIZE']:
+            return False
+        if _search_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _search_executor = ThreadPoolExecutor(1, thread_name_prefix='search-index')
+        _search_pending += 1
+    if generator.document_id is None:
+        generator.document_id = os.urandom(16).hex()
+    generator.searchable = True
+    _search_executor.submit(_index_sections, index, generator.document_id, generator.title, sections)
+    return True
+
+
+def _index_sections(index: SearchIndex, document_id: str, title: str, sections: Sequence[Section]) -> None:
+    global _search_pending
+    try:
+        index.add(document_id, title, sections, app.config['SEARCH_INDEX_MAX_DOCUMENTS'])
+    except Exception as e:
+        app.logger.warning("Indexing document %s failed: %s", document_id, e)
+    finally:
+        with search_lock:
+            _search_pending -= 1
+
+
+class RenderJob:
+    """A render submitted to the background worker pool."""
+
+    def __init__(self, job_id: str, settings: Dict[str, Any], callback_url: Optional[str]):
+        self.id = job_id
+        self.settings = settings
+        self.callback_url = callback_url
+        self.status = 'queued'
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+
+    @property
+    def result_path(self) -> str:
+        return upload_path('jobs', f'{self.id}.html')
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'created': self.created,
+            'finished': self.finished,
+            'result_url': f'/api/jobs/{self.id}/result' if self.status == 'done' else None,
+        }
+
+
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+render_jobs: Dict[str, RenderJob] = {}
+render_jobs_lock = threading.Lock()
+# concurrent.futures.ThreadPoolExecutor, created (and imported) with the first job
+_job_executor = None
+
+
+def submit_render_job(settings: Dict[str, Any], callback_url: Optional[str]) -> Optional[RenderJob]:
+    """Queue a render on the worker pool; ``None`` when ``JOB_QUEUE_SIZE`` jobs are already pending."""
+    global _job_executor
+    evict_render_jobs()
+    job = RenderJob(os.urandom(16).hex(), settings, callback_url)
+    with render_jobs_lock:
+        pending = sum(1 for other in render_jobs.values() if other.status in ('queued', 'running'))
+        if pending >= app.config['JOB_QUEUE_SIZE']:
+            return None
+        if _job_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _job_executor = ThreadPoolExecutor(app.config['JOB_WORKERS'], thread_name_prefix='render-job')
+        render_jobs[job.id] = job
+    _job_executor.submit(run_render_job, job)
+    return job
+
+
+def run_render_job(job: RenderJob) -> None:
+    """Render a job's input to its result file, then notify its callback."""
+    job.status = 'running'
+    settings, job.settings = job.settings, {}
+    try:
+        generator = DataDisplayGenerator()
+        generator.max_sections = app.config['MAX_SECTIONS']
+        generator.fragment_cache = get_fragment_cache()
+        generator.configure(
+            title=settings.get('title', 'LLM Data Display'),
+            theme_color=settings.get('theme_color', '#4F46E5'),
+            auto_parse=settings.get('auto_parse', True),
+            collapsed=settings.get('collapsed', False),
+            split_mode=settings.get('split_mode'),
+            split_pattern=settings.get('split_pattern'),
+            json_view=settings.get('json_view')
+        )
+        sections = generator.parse_data(settings.get('data', ''))
+        write_file_atomic(job.result_path,
+                          (chunk.encode('utf-8') for chunk in generator.iter_html(sections)))
+        job.status = 'done'
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+    job.finished = time.time()
+
+    if job.callback_url:
+        import urllib.request  # only needed for callbacks; slow to import
+
+        body = json.dumps(job.to_dict()).encode('utf-8')
+        callback = urllib.request.Request(job.callback_url, data=body, method='POST',
+                                          headers={'Content-Type': 'application/json'})
+        try:
+            urllib.request.urlopen(callback, timeout=5).close()
+        except OSError as e:
+            app.logger.warning("Callback for job %s failed: %s", job.id, e)
+
+
+def evict_render_jobs() -> None:
+    """Forget finished jobs older than ``JOB_RESULT_TTL`` and delete their results."""
+    cutoff = time.time() - app.config['JOB_RESULT_TTL']
+    with render_jobs_lock:
+        expired = [job for job in render_jobs.values()
+                   if job.finished is not None and job.finished <= cutoff]
+        for job in expired:
+            del render_jobs[job.id]
+    for job in expired:
+        try:
+            os.unlink(job.result_path)
+        except FileNotFoundError:
+            pass
+
+
+def get_render_job(job_id: str) -> Optional[RenderJob]:
+    """Look up a job that has not expired yet."""
+    evict_render_jobs()
+    with render_jobs_lock:
+        return render_jobs.get(job_id)
+
+
+def is_local_callback(url: str) -> bool:
+    """Whether a callback URL is plain HTTP(S) to one of ``JOB_CALLBACK_HOSTS``."""
+    try:
+        parts = urllib.parse.urlsplit(url)
+        return parts.scheme in ('http', 'https') and parts.hostname in app.config['JOB_CALLBACK_HOSTS']
+    except ValueError:
+        return False
+
+
+class StackSampler:
+    """
+    Sampling profiler for the threads serving profiled requests.
+
+    One background thread records the Python stack of every registered
+    thread each ``interval`` seconds, as counts per folded stack
+    (``outer;inner;leaf``, the flame graph input format). It costs far less
+    than cProfile, so slow renders can be caught without profiling every
+    request in full; the thread exits when no thread is registered.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.samples: Dict[int, Dict[str, int]] = {}
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: int) -> None:
+        with self.lock:
+            self.samples[thread_id] = {}
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self.thread.start()
+
+    def stop(self, thread_id: int) -> Dict[str, int]:
+        """Stop sampling a thread and return its stack counts."""
+        with self.lock:
+            return self.samples.pop(thread_id, {})
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.samples:
+                    self.thread = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, counts in self.samples.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stack = folded_stack(frame)
+                        counts[stack] = counts.get(stack, 0) + 1
+
+
+def folded_stack(frame: Any) -> str:
+    """A frame's call stack as ``function (file:line);...``, outermost first."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+# Files stored per profile besides its metadata, with their download types
+PROFILE_FILES = {
+    'prof': 'application/octet-stream',  # cProfile stats, for pstats/snakeviz
+    'folded': 'text/plain',  # sampled stacks, for flamegraph.pl/speedscope
+    'tracemalloc': 'application/octet-stream',  # tracemalloc.Snapshot.load()
+}
+
+stack_sampler = StackSampler(app.config['PROFILE_SAMPLE_INTERVAL'])
+# Held by the request being profiled with cProfile and tracemalloc; they
+# trace the whole process, so concurrent requests fall back to sampling
+profile_lock = threading.Lock()
+
+
+def profile_requested() -> bool:
+    """Whether the request carries the ``PROFILE_TOKEN``."""
+    token = app.config['PROFILE_TOKEN']
+    supplied = request.headers.get('X-Profile') or request.args.get('profile')
+    return bool(token and supplied) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+class ProfileCapture:
+    """
+    A profile of the current request being captured.
+
+    Requested profiles run under cProfile and tracemalloc when no other
+    request holds them; other captures sample the request thread's stack.
+    ``finish()`` stores the profile unless it was not requested and the
+    request was faster than ``PROFILE_SLOW_RENDER_SECONDS``.
+    """
+
+    def __init__(self, requested: bool):
+        self.id = os.urandom(16).hex()
+        self.requested = requested
+        self.thread_id = threading.get_ident()
+        self.metadata = {
+            'id': self.id,
+            'trigger': 'requested' if requested else 'slow',
+            'method': request.method,
+            'path': request.path,
+            'query': {key: value for key, value in request.args.items() if key != 'profile'},
+            'content_length': request.content_length,
+            'content_type': request.content_type,
+            'remote_addr': request.remote_addr,
+            'user_agent': request.user_agent.string,
+            'created': time.time(),
+        }
+        self.profiler = None
+        if requested and profile_lock.acquire(blocking=False):
+            import cProfile
+            import tracemalloc
+
+            self.started_tracing = not tracemalloc.is_tracing()
+            if self.started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.memory_baseline = tracemalloc.get_traced_memory()[0]
+            self.profiler = cProfile.Profile()
+        else:
+            stack_sampler.interval = app.config['PROFILE_SAMPLE_INTERVAL']
+            stack_sampler.start(self.thread_id)
+        self.started = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def finish(self, response: Optional[Response]) -> None:
+        seconds = time.perf_counter() - self.started
+        if self.profiler is None:
+            samples = stack_sampler.stop(self.thread_id)
+            threshold = app.config['PROFILE_SLOW_RENDER_SECONDS']
+            if not self.requested and (threshold is None or seconds < threshold):
+                return
+            self.metadata.update(mode='sampled', samples=sum(samples.values()),
+                                 top=_top_sampled_functions(samples))
+            files = {'folded': "".join(f"{stack} {count}\n" for stack, count in samples.items()).encode('utf-8')}
+        else:
+            import marshal
+            import tracemalloc
+
+            self.profiler.disable()
+            try:
+                peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                if self.started_tracing:
+                    tracemalloc.stop()
+            finally:
+                profile_lock.release()
+            self.profiler.create_stats()
+            self.metadata.update(mode='cprofile', peak_memory=peak - self.memory_baseline,
+                                 top=_top_profiled_functions(self.profiler.stats))
+            files = {'prof': marshal.dumps(self.profiler.stats), 'tracemalloc': snapshot}
+
+        self.metadata.update(seconds=seconds,
+                             status=response.status_code if response is not None else None,
+                             render_strategy=response.headers.get('X-Render-Strategy') if response is not None else None,
+                             files=sorted(files))
+        try:
+            store_profile(self.id, self.metadata, files)
+        except OSError as e:
+            app.logger.warning("Storing profile %s failed: %s", self.id, e)
+
+
+def _top_profiled_functions(stats: Dict, count: int = 20) -> List[Dict[str, Any]]:
+    """The functions with the most time of their own in cProfile stats."""
+    top = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:count]
+    return [{'function': f"{name} ({os.path.basename(filename)}:{line})", 'calls': calls,
+             'seconds': own, 'cumulative_seconds': cumulative}
+            for (filename, line, name), (_, calls, own, cumulative, _) in top]
+
+
+def _top_sampled_functions(samples: Dict[str, int], count: int = 20) -> List[Dict[str, Any]]:
+    """The functions most often on top of the sampled stacks."""
+    leaves: Dict[str, int] = {}
+    for stack, hits in samples.items():
+        leaf = stack.rsplit(";", 1)[-1]
+        leaves[leaf] = leaves.get(leaf, 0) + hits
+    top = sorted(leaves.items(), key=lambda item: item[1], reverse=True)[:count]
+    return [{'function': function, 'samples': hits} for function, hits in top]
+
+
+def store_profile(profile_id: str, metadata: Dict[str, Any], files: Dict[str, Any]) -> None:
+    """Write a profile's files, then its metadata, and drop the oldest beyond ``PROFILE_MAX_COUNT``."""
+    for kind, data in files.items():
+        path = upload_path('profiles', f'{profile_id}.{kind}')
+        if kind == 'tracemalloc':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data.dump(path)
+        else:
+            write_file_atomic(path, (data,))
+    # Listed only once the metadata exists, so never half-written
+    write_file_atomic(upload_path('profiles', f'{profile_id}.json'), (json.dumps(metadata).encode('utf-8'),))
+
+    for expired in list_profiles()[app.config['PROFILE_MAX_COUNT']:]:
+        for kind in ['json', *expired['files']]:
+            try:
+                os.unlink(upload_path('profiles', f"{expired['id']}.{kind}"))
+            except FileNotFoundError:
+                pass
+
+
+def load_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    """A stored profile's metadata, or ``None`` if it does not exist."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    try:
+        with open(upload_path('profiles', f'{profile_id}.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Metadata of the stored profiles, newest first."""
+    try:
+        names = os.listdir(upload_path('profiles'))
+    except FileNotFoundError:
+        return []
+    profiles = (load_profile(name[:-len('.json')]) for name in names if name.endswith('.json'))
+    return sorted((profile for profile in profiles if profile is not None),
+                  key=lambda profile: profile['created'], reverse=True)
+
+
+def profiled(view):
+    """
+    Profile a render view when the request asks for it (see
+    ``profile_requested()``) or, with ``PROFILE_SLOW_RENDER_SECONDS`` set,
+    when it turns out slow. Streamed responses are profiled until sent.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        requested = profile_requested()
+        if not requested and app.config['PROFILE_SLOW_RENDER_SECONDS'] is None:
+            return view(*args, **kwargs)
+
+        capture = ProfileCapture(requested)
+        try:
+            response = app.make_response(view(*args, **kwargs))
+        except BaseException:
+            capture.finish(None)
+            raise
+        if response.is_streamed:
+            response.response = _finish_when_sent(response.response, capture, response)
+        else:
+            capture.finish(response)
+        return response
+    return wrapper
+
+
+def _finish_when_sent(chunks: Iterable, capture: ProfileCapture, response: Response) -> Iterator:
+    """Pass a streamed body through, storing its profile once it is sent or closed."""
+    try:
+        yield from chunks
+    finally:
+        capture.finish(response)
+
+
+def profiles_authorized() -> bool:
+    """
+    Whether the request may read profiles: it has to carry ``PROFILE_TOKEN``.
+    Without a token the endpoints are off, as behind a reverse proxy every
+    request seems to come from this machine.
+    """
+    return profile_requested()
 
 
 # Flask routes
 @app.route('/')
 def index():
     """Display the input form"""
-    return render_template('input.html')
+    return render_template('input.html', theme_presets=THEME_PRESETS)
 
 
 @app.route('/display', methods=['POST'])
+@admission_controlled()
+@profiled
 def display():
     """Process and display the data"""
     data = request.form.get('data', '')
     title = request.form.get('title', 'LLM Data Display')
     theme_color = request.form.get('theme_color', '#4F46E5')
     collapsed = request.form.get('collapsed', 'off') == 'on'
+    split_mode = request.form.get('split_mode', DEFAULT_SPLIT_MODE)
+    split_pattern = request.form.get('split_pattern', '')
+    json_view = request.form.get('json_view', DEFAULT_JSON_VIEW)
 
     if not data:
         return "No data provided", 400
 
     generator = DataDisplayGenerator()
-    html = generator.generate(
-        data=data,
-        title=title,
-        theme_color=theme_color,
-        collapsed=collapsed
+    generator.title = title or generator.title
+    generator.theme_color = theme_color or generator.theme_color
+    generator.collapsed_by_default = collapsed
+    generator.split_mode = split_mode or generator.split_mode
+    generator.split_pattern = split_pattern or None
+    generator.json_view = json_view or generator.json_view
+    generator.max_sections = app.config['MAX_SECTIONS']
+    generator.fragment_cache = get_fragment_cache()
+    try:
+        sections = generator.parse_data(data)
+    except ValueError as e:
+        return str(e), 400
+
+    index_document(generator, sections)
+    return render_document(generator, sections, len(data),
+                           requested_page_size(request.form.get('section_page_kb')),
+                           requested_sections_per_page(request.form.get('sections_per_page')))
+
+
+@app.route('/documents/<document_id>')
+@admission_controlled()
+@profiled
+def document_page(document_id):
+    """Show one page of a document split into pages"""
+    document = get_paged_document(document_id)
+    if document is None:
+        return "This document has expired, please generate it again", 404
+    sections, generator = document
+    page = request.args.get('page', 1, type=int)
+    if not generator.sections_per_page or not 1 <= page <= -(-len(sections) // generator.sections_per_page):
+        return "No such page", 404
+    return Response(render_document_page(generator, sections, page), mimetype='text/html',
+                    headers={'Cache-Control': 'private, max-age=3600'})
+
+
+def prepare_document(settings: Dict[str, Any], index: bool = True) -> Tuple[DataDisplayGenerator, Sequence[Section]]:
+    """
+    Configure a generator for one ``/api/generate`` request body and parse
+    its data, queueing it for the search index unless ``index`` is false.
+    """
+    generator = DataDisplayGenerator()
+    generator.max_sections = app.config['MAX_SECTIONS']
+    generator.fragment_cache = get_fragment_cache()
+    generator.configure(
+        title=settings.get('title', 'LLM Data Display'),
+        theme_color=settings.get('theme_color', '#4F46E5'),
+        auto_parse=settings.get('auto_parse', True),
+        collapsed=settings.get('collapsed', False),
+        split_mode=settings.get('split_mode'),
+        split_pattern=settings.get('split_pattern'),
+        json_view=settings.get('json_view')
     )
+    sections = generator.parse_data(settings.get('data', ''))
+    if index:
+        index_document(generator, sections)
+    return generator, sections
+
+
+def generate_document(settings: Dict[str, Any], index: bool = True) -> Dict[str, Any]:
+    """Render one ``/api/generate`` request body into that endpoint's JSON reply."""
+    generator, sections = prepare_document(settings, index)
+    return {'html': generator.generate_html(sections), 'document_id': generator.document_id, 'success': True}
 
-    return html
+
+def iter_document_json(generator: DataDisplayGenerator, sections: Sequence[Section]) -> Iterator[bytes]:
+    """``generate_document()``'s reply as compact JSON, the page escaped batch by batch as it is rendered."""
+    yield b'{"document_id":%s,"html":"' % json.dumps(generator.document_id).encode('ascii')
+    for chunk in generator.iter_html(sections):
+        yield json.dumps(chunk)[1:-1].encode('ascii')
+    yield b'","success":true}'
+
+
+def iter_batch_json(batch: List[Any]) -> Iterator[bytes]:
+    """The ``/api/generate/batch`` reply for ``batch``, parsing each document only once the previous one is written."""
+    yield b'{"results":['
+    for idx, settings in enumerate(batch):
+        if idx:
+            yield b','
+        try:
+            generator, sections = prepare_document(settings)
+        except Exception as e:
+            yield json.dumps({'error': str(e), 'success': False}, separators=(',', ':')).encode('ascii')
+        else:
+            yield from iter_document_json(generator, sections)
+    yield b'],"success":true}'
 
 
 @app.route('/api/generate', methods=['POST'])
+@admission_controlled()
+@profiled
 def api_generate():
     """API endpoint for generating display HTML"""
+    try:
+        settings = request_json()
+        generator, sections = prepare_document(settings)
+    except Exception as e:
+        return jsonify({'error': str(e), 'success': False}), 400
+
+    # The reply holds the whole page, so it is never paged; inline and
+    # streamed replies are both built batch by batch within the memory budget
+    data = settings.get('data', '')
+    data_size = len(data) if isinstance(data, str) else 0
+    strategy = select_render_strategy(sections, data_size, None, None, generator.json_view)
+    started = time.perf_counter()
+    if strategy == "parallel":
+        sections = format_json_in_pool(sections)
+    response = spool_response(iter_document_json(generator, sections), 'application/json')
+    record_render(strategy, data_size, time.perf_counter() - started)
+    response.headers['X-Render-Strategy'] = strategy
+    return response
+
+
+@app.route('/api/generate/batch', methods=['POST'])
+@admission_controlled()
+@profiled
+def api_generate_batch():
+    """Render several /api/generate request bodies in one request"""
+    try:
+        batch = request_json()['requests']
+        if not isinstance(batch, list):
+            raise ValueError("'requests' must be a list")
+    except Exception as e:
+        return jsonify({'error': f"Invalid batch: {e}", 'success': False}), 400
+    if len(batch) > app.config['BATCH_MAX_REQUESTS']:
+        return jsonify({'error': f"A batch holds at most {app.config['BATCH_MAX_REQUESTS']} requests",
+                        'success': False}), 400
+
+    return spool_response(iter_batch_json(batch), 'application/json')
+
+
+@app.route('/api/parse', methods=['POST'])
+@admission_controlled()
+def api_parse():
+    """API endpoint returning parsed sections for client-side rendering"""
     try:
         data = request.json
         generator = DataDisplayGenerator()
-        html = generator.generate(
-            data=data.get('data', ''),
-            title=data.get('title', 'LLM Data Display'),
-            theme_color=data.get('theme_color', '#4F46E5'),
-            auto_parse=data.get('auto_parse', True),
-            collapsed=data.get('collapsed', False)
-        )
-        return jsonify({'html': html, 'success': True})
+        generator.auto_parse_json = data.get('auto_parse', True)
+        generator.split_mode = data.get('split_mode') or DEFAULT_SPLIT_MODE
+        generator.split_pattern = data.get('split_pattern')
+        generator.max_sections = app.config['MAX_SECTIONS']
+        sections = generator.parse_data(data.get('data', ''))
+        return jsonify({'sections': [section.to_dict() for section in sections], 'success': True})
     except Exception as e:
         return jsonify({'error': str(e), 'success': False}), 400
 
 
+@app.route('/view')
+def client_view():
+    """Display page shell that renders the sections in the browser"""
+    html = client_page_shell(
+        request.args.get('title', 'LLM Data Display'),
+        request.args.get('theme_color', '#4F46E5'),
+        request.args.get('collapsed', 'off') == 'on'
+    )
+    # The shell varies with the query string, so shared caches must not keep it
+    return Response(html, mimetype='text/html', headers={'Cache-Control': 'private, max-age=3600'})
+
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-lines')
+
+
+@app.route('/api/render', methods=['POST'])
+@admission_controlled()
+@profiled
+def api_render():
+    """Render a raw request body and send the HTML page back.
+
+    Settings come from the query string. JSON Lines bodies (``split_mode=ndjson``
+    or an NDJSON content type) are parsed line by line straight from the
+    request stream, so neither the input nor the page is held in memory.
+    Other bodies are rendered with the strategy that suits them.
+    """
+    generator = DataDisplayGenerator()
+    generator.title = request.args.get('title', 'LLM Data Display')
+    generator.theme_color = request.args.get('theme_color', '#4F46E5')
+    generator.auto_parse_json = request.args.get('auto_parse', 'true') != 'false'
+    generator.collapsed_by_default = request.args.get('collapsed', 'false') == 'true'
+    generator.split_mode = request.args.get('split_mode', DEFAULT_SPLIT_MODE)
+    generator.split_pattern = request.args.get('split_pattern')
+    generator.json_view = request.args.get('json_view', DEFAULT_JSON_VIEW)
+    generator.max_sections = app.config['MAX_SECTIONS']
+    generator.fragment_cache = get_fragment_cache()
+
+    if generator.split_mode == 'ndjson' or request.mimetype in NDJSON_MIMETYPES:
+        # Streamed records cannot be counted up front, so stop at the limit
+        sections = islice(iter_ndjson_sections(request.stream), generator.max_sections)
+        size = request.content_length or 0
+        started = time.perf_counter()
+
+        def body_chunks():
+            try:
+                yield from generator.iter_html(sections)
+            finally:
+                record_render("streamed", size, time.perf_counter() - started)
+
+        return Response(stream_with_context(body_chunks()), mimetype='text/html',
+                        headers={'X-Render-Strategy': 'streamed'})
+
+    data = request.get_data()
+    if not data:
+        return "No data provided", 400
+    try:
+        sections = generator.parse_data(data)
+    except ValueError as e:
+        return str(e), 400
+    return render_document(generator, sections, len(data),
+                           requested_page_size(request.args.get('section_page_kb')),
+                           requested_sections_per_page(request.args.get('sections_per_page')))
+
+
+@app.route('/api/documents/<document_id>/sections/<int:index>')
+def document_section_page(document_id, index):
+    """Return the next page of an oversized section"""
+    document = get_paged_document(document_id)
+    if document is None:
+        return jsonify({'error': 'Unknown or expired document', 'success': False}), 404
+    sections, generator = document
+    page_size = generator.section_page_size
+    if not page_size or index >= len(sections):
+        return jsonify({'error': 'Unknown section', 'success': False}), 404
+
+    section = sections[index]
+    length = section.end - section.start
+    offset = request.args.get('offset', 0, type=int)
+    if not 0 <= offset < length:
+        return jsonify({'error': 'Offset out of range', 'success': False}), 400
+
+    text, next_offset = section.read(offset, page_size)
+    label = None if next_offset is None else load_more_label(length - next_offset)
+    return jsonify({'text': text, 'next_offset': next_offset, 'label': label, 'success': True})
+
+
+@app.route('/api/search')
+def api_search():
+    """Search the sections of rendered documents, optionally within one document"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'No query provided', 'success': False}), 400
+    index = get_search_index()
+    if index is None:
+        return jsonify({'error': 'Search is turned off', 'success': False}), 404
+    limit = min(max(request.args.get('limit', 20, type=int), 1), app.config['SEARCH_RESULTS_LIMIT'])
+    try:
+        results = index.search(query, request.args.get('document'), limit)
+    except Exception as e:
+        return jsonify({'error': str(e), 'success': False}), 400
+    return jsonify({'results': results, 'success': True})
+
+
+@app.route('/api/stats')
+def api_stats():
+    """Counters of the shared render caches and of the render strategies used"""
+    cache = get_fragment_cache()
+    with render_metrics_lock:
+        strategies = {strategy: dict(metrics) for strategy, metrics in render_metrics.items()}
+        spilled = dict(spill_metrics)
+    return jsonify({'fragment_cache': cache.stats() if cache else None,
+                    'render_strategies': strategies, 'spilled_responses': spilled, 'success': True})
+
+
+@app.route('/api/profiles')
+def profile_list():
+    """List the stored render profiles, newest first"""
+    if not profiles_authorized():
+        return jsonify({'error': 'Not authorized', 'success': False}), 403
+    return jsonify({'profiles': list_profiles(), 'success': True})
+
+
+@app.route('/api/profiles/<profile_id>')
+def profile_details(profile_id):
+    """Metadata of one stored profile"""
+    if not profiles_authorized():
+        return jsonify({'error': 'Not authorized', 'success': False}), 403
+    profile = load_profile(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Unknown profile', 'success': False}), 404
+    return jsonify({'profile': profile, 'success': True})
+
+
+@app.route('/api/profiles/<profile_id>/<kind>')
+def profile_download(profile_id, kind):
+    """Download one of a stored profile's files"""
+    if not profiles_authorized():
+        return jsonify({'error': 'Not authorized', 'success': False}), 403
+    profile = load_profile(profile_id)
+    if profile is None or kind not in profile['files']:
+        return jsonify({'error': 'Unknown profile', 'success': False}), 404
+    return send_file(upload_path('profiles', f'{profile_id}.{kind}'), mimetype=PROFILE_FILES[kind],
+                     as_attachment=True, download_name=f'{profile_id}.{kind}')
+
+
+@app.route('/api/jobs', methods=['POST'])
+def job_submit():
+    """Queue a render in the background and return its job ID right away"""
+    settings = request.get_json(silent=True)
+    if not isinstance(settings, dict) or not settings.get('data'):
+        return jsonify({'error': 'No data provided', 'success': False}), 400
+    callback_url = settings.pop('callback_url', None)
+    if callback_url is not None and not is_local_callback(callback_url):
+        return jsonify({'error': 'Callbacks can only go to a local address', 'success': False}), 400
+
+    job = submit_render_job(settings, callback_url)
+    if job is None:
+        return error_response(429, "Too many jobs queued", app.config['RENDER_RETRY_AFTER'])
+    return jsonify({**job.to_dict(), 'status_url': f'/api/jobs/{job.id}', 'success': True}), 202
+
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Report a job's status"""
+    job = get_render_job(job_id) if JOB_ID_PATTERN.match(job_id) else None
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job', 'success': False}), 404
+    return jsonify({**job.to_dict(), 'success': True})
+
+
+@app.route('/api/jobs/<job_id>/result')
+def job_result(job_id):
+    """Download a finished job's HTML page"""
+    job = get_render_job(job_id) if JOB_ID_PATTERN.match(job_id) else None
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job', 'success': False}), 404
+    if job.status != 'done':
+        return jsonify({**job.to_dict(), 'error': job.error or 'Job has not finished', 'success': False}), 409
+    return send_file(job.result_path, mimetype='text/html')
+
+
+@app.route('/api/uploads', methods=['POST'])
+@admission_controlled()
+def upload_start():
+    """Start (or resume) a chunked upload from its list of chunk hashes"""
+    chunks = (request.get_json(silent=True) or {}).get('chunks')
+    if not chunks or not all(isinstance(h, str) and CHUNK_HASH_PATTERN.match(h) for h in chunks):
+        return jsonify({'error': 'Expected a list of SHA-256 chunk hashes', 'success': False}), 400
+    if len(chunks) > app.config['UPLOAD_MAX_CHUNKS']:
+        return jsonify({'error': f"Upload has more than {app.config['UPLOAD_MAX_CHUNKS']} chunks",
+                        'success': False}), 413
+
+    evict_uploads()
+    # The same content always maps to the same upload, so retries resume it
+    upload_id = hashlib.sha256(','.join(chunks).encode('ascii')).hexdigest()[:32]
+    manifest_path = upload_path('manifests', f'{upload_id}.json')
+    if os.path.exists(manifest_path):
+        touch_upload(upload_id)
+    else:
+        write_file_atomic(manifest_path, [json.dumps(chunks).encode('ascii')])
+
+    return jsonify({'upload_id': upload_id, 'missing': missing_upload_chunks(upload_id, chunks), 'success': True})
+
+
+@app.route('/api/uploads/<upload_id>')
+def upload_status(upload_id):
+    """List the chunks the server still needs for an upload"""
+    chunks = load_upload_manifest(upload_id)
+    if chunks is None:
+        return jsonify({'error': 'Unknown upload', 'success': False}), 404
+    return jsonify({'upload_id': upload_id, 'missing': missing_upload_chunks(upload_id, chunks), 'success': True})
+
+
+@app.route('/api/uploads/<upload_id>/chunks/<chunk_hash>', methods=['PUT'])
+@admission_controlled()
+def upload_chunk(upload_id, chunk_hash):
+    """Store one content-addressed chunk; already stored chunks are skipped"""
+    chunks = load_upload_manifest(upload_id)
+    if chunks is None:
+        return jsonify({'error': 'Unknown upload', 'success': False}), 404
+    if chunk_hash not in chunks:
+        return jsonify({'error': 'Chunk is not part of this upload', 'success': False}), 400
+
+    chunk_path = upload_path('chunks', chunk_hash)
+    if os.path.exists(chunk_path):
+        return jsonify({'success': True, 'stored': False})
+
+    if (request.content_length or 0) > UPLOAD_MAX_CHUNK_SIZE:
+        return jsonify({'error': 'Chunk too large', 'success': False}), 413
+    # Counted as often as the chunk repeats, so repeated chunks cannot inflate the file
+    size = stored_upload_size(chunks) + (request.content_length or 0) * chunks.count(chunk_hash)
+    if size > app.config['UPLOAD_MAX_SIZE']:
+        return jsonify({'error': f"Upload is larger than {app.config['UPLOAD_MAX_SIZE']} bytes",
+                        'success': False}), 413
+    body = request.get_data()
+    if hashlib.sha256(body).hexdigest() != chunk_hash:
+        return jsonify({'error': 'Chunk hash mismatch', 'success': False}), 400
+
+    write_file_atomic(chunk_path, [body])
+    touch_upload(upload_id)
+    return jsonify({'success': True, 'stored': True})
+
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+@admission_controlled(upload_assembly_size)
+def upload_complete(upload_id):
+    """Assemble a fully uploaded file on disk and drop its chunks"""
+    chunks = load_upload_manifest(upload_id)
+    if chunks is None:
+        return jsonify({'error': 'Unknown upload', 'success': False}), 404
+
+    file_path = upload_path('files', upload_id)
+    if not os.path.exists(file_path):
+        missing = missing_upload_chunks(upload_id, chunks)
+        if missing:
+            return jsonify({'error': 'Upload incomplete', 'missing': missing, 'success': False}), 409
+        if stored_upload_size(chunks) > app.config['UPLOAD_MAX_SIZE']:
+            return jsonify({'error': f"Upload is larger than {app.config['UPLOAD_MAX_SIZE']} bytes",
+                            'success': False}), 413
+        try:
+            write_file_atomic(file_path, iter_upload_chunks(chunks))
+        except FileNotFoundError:
+            # A chunk was deleted meanwhile (expired, or shared with an upload that just finished)
+            missing = missing_upload_chunks(upload_id, chunks)
+            return jsonify({'error': 'Upload incomplete', 'missing': missing, 'success': False}), 409
+        delete_upload_chunks(upload_id, chunks)
+    touch_upload(upload_id)
+
+    return jsonify({'upload_id': upload_id, 'url': f'/uploads/{upload_id}/display', 'success': True})
+
+
+@app.route('/uploads/<upload_id>/display')
+@admission_controlled(upload_size)
+@profiled
+def upload_display(upload_id):
+    """Render an assembled upload straight from disk"""
+    if not UPLOAD_ID_PATTERN.match(upload_id):
+        return "Unknown upload", 404
+    try:
+        upload_file = open(upload_path('files', upload_id), 'rb')
+    except FileNotFoundError:
+        return "Unknown upload", 404
+    touch_upload(upload_id)
+
+    generator = DataDisplayGenerator()
+    generator.title = request.args.get('title', 'LLM Data Display')
+    generator.theme_color = request.args.get('theme_color', '#4F46E5')
+    generator.collapsed_by_default = request.args.get('collapsed', 'off') == 'on'
+    generator.split_mode = request.args.get('split_mode') or DEFAULT_SPLIT_MODE
+    generator.split_pattern = request.args.get('split_pattern')
+    generator.json_view = request.args.get('json_view') or DEFAULT_JSON_VIEW
+    generator.max_sections = app.config['MAX_SECTIONS']
+    generator.fragment_cache = get_fragment_cache()
+
+    buffer = None
+    try:
+        # Sections reference the memory-mapped file instead of copying it
+        buffer = mmap.mmap(upload_file.fileno(), 0, access=mmap.ACCESS_READ)
+        sections = generator.parse_data(buffer)
+    except ValueError as e:
+        if buffer is not None:
+            buffer.close()
+        upload_file.close()
+        return str(e), 400
+
+    def close():
+        upload_file.close()
+        buffer.close()
+
+    # Documents kept for paging keep reading the mapping; it closes once evicted
+    return render_document(generator, sections, len(buffer),
+                           requested_page_size(request.args.get('section_page_kb')),
+                           requested_sections_per_page(request.args.get('sections_per_page')), close)
+
+
+@app.route('/api/live/<stream_id>', methods=['POST'])
+def live_ingest(stream_id):
+    """Append a chunk of producer output to a live stream"""
+    if not LIVE_STREAM_ID_PATTERN.match(stream_id):
+        return jsonify({'error': 'Invalid stream id', 'success': False}), 400
+
+    stream = get_live_stream(stream_id, create=True)
+    if stream.closed:
+        return jsonify({'error': 'Stream is closed', 'success': False}), 409
+
+    chunk = request.get_data(as_text=True)
+    max_size = app.config['LIVE_STREAM_MAX_SIZE']
+    if stream.size + len(chunk) > max_size:
+        return jsonify({'error': f"A live stream holds at most {max_size} characters", 'success': False}), 413
+    events = stream.push(chunk) if chunk else 0
+    if request.args.get('close') in ('1', 'true'):
+        stream.close()
+
+    return jsonify({'success': True, 'events': events, 'closed': stream.closed})
+
+
+@app.route('/live/<stream_id>')
+def live_display(stream_id):
+    """Display page that follows a live stream as it is produced"""
+    if not LIVE_STREAM_ID_PATTERN.match(stream_id):
+        return "Invalid stream id", 400
+
+    collapsed = request.args.get('collapsed', 'off') == 'on'
+    generator = DataDisplayGenerator()
+    generator.title = request.args.get('title', 'LLM Data Display')
+    generator.theme_color = request.args.get('theme_color', '#4F46E5')
+    generator.collapsed_by_default = collapsed
+    return generator.generate_html([], extra_script=live_page_script(stream_id, collapsed))
+
+
+@app.route('/live/<stream_id>/events')
+def live_events(stream_id):
+    """Server-sent events feed for a live stream"""
+    if not LIVE_STREAM_ID_PATTERN.match(stream_id):
+        return "Invalid stream id", 400
+
+    stream = get_live_stream(stream_id)
+    if stream is None:
+        return "Unknown or expired stream", 404
+    try:
+        start = int(request.headers.get('Last-Event-ID', -1)) + 1
+    except ValueError:
+        start = 0
+
+    def event_feed():
+        index = start
+        while True:
+            stream.wait_for(index, LIVE_KEEPALIVE_SECONDS)
+            events = stream.events[index:]
+            if not events:
+                if stream.closed:
+                    yield "event: done\ndata: {}\n\n"
+                    return
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                payload = {key: value for key, value in event.items() if key != 'type'}
+                yield f"id: {index}\nevent: {event['type']}\ndata: {json.dumps(payload)}\n\n"
+                index += 1
+
+    return Response(
+        stream_with_context(event_feed()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def warm_up() -> None:
+    """
+    Do the one-time work of the first requests ahead of time.
+
+    Loads the input page template (through the ``TEMPLATE_CACHE_DIR``
+    bytecode cache, if configured), builds the card fragments and renders
+    small documents through the text, JSON and tree code paths. Call it
+    from the server's worker start hook, e.g. gunicorn's ``post_worker_init``.
+    """
+    cache_dir = app.config['TEMPLATE_CACHE_DIR']
+    if cache_dir and app.jinja_env.bytecode_cache is None:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        if app.jinja_env.cache is not None:
+            app.jinja_env.cache.clear()  # reload already compiled templates through it
+    app.jinja_env.get_template('input.html')
+
+    for collapsed in (False, True):
+        card_fragments(collapsed)
+    generator = DataDisplayGenerator()
+    for data in ('{"warm_up": [1, {"nested": true}]}', 'Warm up\ntext\n\nsections', b'bytes\n\ninput'):
+        generator.generate(data)
+    generator.json_view = "tree"
+    generator.generate('{"warm_up": {"tree": []}}')
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("🚀 Interactive Data Display - Local Web Server")
@@ -520,4 +3972,5 @@ if __name__ == '__main__':
     print("=" * 60)
     print()
 
+    warm_up()
     app.run(debug=True, host='127.0.0.1', port=5000)
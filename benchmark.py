@@ -0,0 +1,545 @@
+"""
+Benchmark suite for the data display renderer
+Run this to measure parsing and rendering throughput locally
+
+Usage:
+    python benchmark.py                 # run every benchmark
+    python benchmark.py splitters       # run selected benchmarks only
+    python benchmark.py --size-mb 50    # use a larger generated corpus
+"""
+
+import argparse
+import gzip
+from html.parser import HTMLParser
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app import DataDisplayGenerator, FragmentCache, ICON_SPRITE, JSON_VIEWS, SPLITTERS, card_fragments
+
+
+def make_blank_line_corpus(size: int) -> str:
+    """Plain text sections separated by blank lines."""
+    block = ("Section heading {n}\n"
+             "Some <content> & \"quoted\" text for section {n}, with a second line.\n"
+             "And a third line so sections are not trivially small.\n\n")
+    return _repeat_to_size(block, size)
+
+
+def make_markdown_corpus(size: int) -> str:
+    """Long markdown answer with headings, paragraphs and code fences."""
+    block = ("## Heading {n}\n"
+             "A paragraph about topic {n} that wraps over a couple of lines and\n"
+             "mentions <tags> & entities.\n\n"
+             "```python\n# a comment, not a heading\nprint({n})\n```\n\n")
+    return _repeat_to_size(block, size)
+
+
+def make_rule_corpus(size: int) -> str:
+    """Text blocks separated by markdown horizontal rules."""
+    block = "Block {n}\nFirst line of block {n}.\n\nSecond paragraph.\n---\n"
+    return _repeat_to_size(block, size)
+
+
+def make_ndjson_corpus(size: int) -> str:
+    """JSON Lines log records."""
+    block = ('{{"id": {n}, "role": "assistant", "content": "Answer <{n}> & more", '
+             '"tokens": [1, 2, 3]}}\n')
+    return _repeat_to_size(block, size)
+
+
+def _repeat_to_size(block: str, size: int) -> str:
+    parts = []
+    total = 0
+    n = 0
+    while total < size:
+        part = block.format(n=n)
+        parts.append(part)
+        total += len(part)
+        n += 1
+    return "".join(parts)
+
+
+def _time(func, repeat: int = 3) -> float:
+    """Best wall-clock time of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func) -> int:
+    """Peak traced memory while running ``func``, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _legacy_card(generator: DataDisplayGenerator, idx: int, section) -> str:
+    """One card's markup up to its content, formatted per card as it used to be."""
+    collapsed_class = "collapsed" if generator.collapsed_by_default else ""
+    section_id = f"section-{idx}"
+    return f"""
+            <div class="section-card {collapsed_class}">
+                <div class="section-header" onclick="toggleSection('{section_id}')">
+                    <div class="section-title">
+                        <span class="toggle-icon">▼</span>
+                        <h3>{section.title}</h3>
+                    </div>
+                    <button class="copy-btn" onclick="copyText('{section_id}', event)" title="Copy to clipboard">
+                        <svg class="icon"><use href="#icon-copy"></use></svg>
+                        Copy
+                    </button>
+                </div>
+                <div class="section-content" id="{section_id}">
+                    <pre class="content-text">"""
+
+
+def _legacy_card_html(generator: DataDisplayGenerator, sections) -> str:
+    """Reference renderer building one f-string per card."""
+    def pieces():
+        yield generator._page_head()
+        for idx, section in enumerate(sections):
+            yield _legacy_card(generator, idx, section)
+            yield generator._escape_html(section.content)
+            yield """</pre>
+                </div>
+            </div>
+            """
+        yield generator._page_tail()
+    return "".join(pieces())
+
+
+def bench_cards(size: int, count: int = 10_000) -> None:
+    """Per-card cost of rendering a 10k-section document, against per-card f-strings."""
+    print(f"Section cards ({count:,} sections)")
+    print("-" * 60)
+    generator = DataDisplayGenerator()
+    generator.auto_parse_json = False
+    sections = generator.parse_data("".join(
+        f"Section heading {n}\nSome <content> & text for section {n}.\n\n" for n in range(count)))
+    assert _legacy_card_html(generator, sections) == generator.generate_html(sections)
+
+    # Peak memory traced while rendering, per card (the finished page included)
+    print(f"{'renderer':<12}{'ms':>10}{'us/card':>10}{'peak MB':>10}{'peak B/card':>12}")
+    for label, render in (("f-string", lambda: _legacy_card_html(generator, sections)),
+                          ("fragments", lambda: generator.generate_html(sections))):
+        seconds = _time(render)
+        peak = _peak_memory(render)
+        print(f"{label:<12}{seconds * 1e3:>10.1f}{seconds / count * 1e6:>10.2f}{peak / 1e6:>10.1f}"
+              f"{peak // count:>12,}")
+    shared = sum(map(sys.getsizeof, card_fragments(False)))
+    print(f"(static card fragments are built once and shared: {shared:,} bytes)")
+    print()
+
+
+# The copy icon as it was inlined into every card before the shared sprite
+INLINE_COPY_ICON = """                        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
+                            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
+                        </svg>
+"""
+SPRITE_COPY_ICON = """                        <svg class="icon"><use href="#icon-copy"></use></svg>
+"""
+
+
+def bench_icons(size: int, count: int = 10_000) -> None:
+    """Page size and parse time with the icon sprite, against icons inlined per card."""
+    print(f"Icon markup ({count:,} sections)")
+    print("-" * 60)
+    generator = DataDisplayGenerator()
+    generator.auto_parse_json = False
+    sections = generator.parse_data("".join(
+        f"Section heading {n}\nSome <content> & text for section {n}.\n\n" for n in range(count)))
+    sprite_page = generator.generate_html(sections)
+    inline_page = sprite_page.replace(ICON_SPRITE, "").replace(SPRITE_COPY_ICON, INLINE_COPY_ICON)
+
+    # html.parser stands in for the browser's tokenizer: both scale with markup volume
+    print(f"{'icons':<10}{'MB':>10}{'gzip KB':>10}{'parse ms':>10}")
+    for label, page in (("inline", inline_page), ("sprite", sprite_page)):
+        data = page.encode("utf-8")
+        compressed = len(gzip.compress(data, 6)) / 1e3
+        seconds = _time(lambda: HTMLParser().feed(page))
+        print(f"{label:<10}{len(data) / 1e6:>10.2f}{compressed:>10.1f}{seconds * 1e3:>10.1f}")
+    print()
+
+
+def make_tool_call_payload(size: int) -> str:
+    """JSON object of deeply nested tool-call results."""
+    calls = []
+    total = 0
+    n = 0
+    while total < size:
+        call = {"id": f"call_{n}", "name": "search", "arguments": {"query": f"topic {n}", "limit": 10},
+                "result": {"hits": [{"title": f"Result <{i}>", "score": i / 10,
+                                     "meta": {"source": "web", "tags": ["a", "b"]}} for i in range(10)]}}
+        calls.append(call)
+        total += len(json.dumps(call))
+        n += 1
+    return json.dumps({f"step_{i}": calls[i::8] for i in range(8)})
+
+
+def bench_pages(size: int, count: int = 100_000, per_page: int = 1000) -> None:
+    """Size and render time of a whole page against one page of a paginated document."""
+    print(f"Document pages ({count:,} sections, {per_page:,} per page)")
+    print("-" * 60)
+    generator = DataDisplayGenerator()
+    generator.auto_parse_json = False
+    sections = generator.parse_data("".join(
+        f"Section heading {n}\nSome <content> & text for section {n}.\n\n" for n in range(count)))
+    paged = DataDisplayGenerator()
+    paged.document_id = "0" * 32
+    paged.sections_per_page = per_page
+    paged.section_count = count
+    print(f"{'page':<12}{'MB':>10}{'render ms':>12}")
+    for label, render in (
+            ("everything", lambda: generator.generate_html(sections)),
+            ("one page", lambda: paged.generate_html(sections[per_page:2 * per_page], start=per_page))):
+        seconds = _time(render)
+        print(f"{label:<12}{len(render().encode('utf-8')) / 1e6:>10.2f}{seconds * 1e3:>12.1f}")
+    print()
+
+
+def make_transcripts(count: int, turns: int = 20) -> list:
+    """JSON Lines transcripts sharing a system prompt and tool schemas, with unique turns."""
+    system = {"role": "system", "content": "You are a careful <assistant> & follow these rules.\n" * 200}
+    tools = {"role": "tools", "tools": [{"name": f"tool_{n}", "description": "Looks things up. " * 10,
+                                         "parameters": {"type": "object", "properties": {"q": {"type": "string"}}}}
+                                        for n in range(40)]}
+    return ["\n".join(json.dumps(record) for record in [system, tools] + [
+        {"role": "user" if turn % 2 else "assistant", "content": f"Turn {turn} of run {run}: <{'x' * 200}>"}
+        for turn in range(turns)]) for run in range(count)]
+
+
+def bench_fragments(size: int, count: int = 50) -> None:
+    """Render time (parsing excluded) of transcripts with repeated sections, with and without the fragment cache."""
+    print(f"Fragment cache ({count} transcripts sharing a system prompt and tool schemas)")
+    print("-" * 60)
+    transcripts = make_transcripts(count)
+    cache = FragmentCache(64 << 20, 2048)
+
+    def render_all(fragment_cache) -> float:
+        # Parsed afresh, as for a request, so no formatted JSON carries over between runs
+        parsed = [DataDisplayGenerator().parse_data(data) for data in transcripts]
+        start = time.perf_counter()
+        for sections in parsed:
+            generator = DataDisplayGenerator()
+            generator.fragment_cache = fragment_cache
+            generator.generate_html(sections)
+        return time.perf_counter() - start
+
+    render_all(cache)
+    print(f"{'cache':<10}{'ms/doc':>10}")
+    for label, fragment_cache in (("off", None), ("on", cache)):
+        seconds = min(render_all(fragment_cache) for _ in range(3))
+        print(f"{label:<10}{seconds / count * 1e3:>10.2f}")
+    stats = cache.stats()
+    print(f"hit rate {stats['hit_rate']:.0%} of {stats['lookups']:,} lookups "
+          f"({stats['cross_document_hits']:,} from other documents), "
+          f"{stats['chars_saved'] / 1e6:.1f} M characters reused, {stats['entries']} entries")
+    print()
+
+
+def bench_formatting(size: int) -> None:
+    """Time to render a JSON document and read its sections again for the search index."""
+    print("JSON formatting for the page and the search index")
+    print("-" * 60)
+    record = {"role": "tool", "content": {"rows": [{"id": n, "text": "<cell> & value"} for n in range(20)]}}
+    count = max(size // len(json.dumps(record)), 2)
+    data = json.dumps({f"call_{n}": record for n in range(count)})
+
+    def render_and_index(reformat: bool) -> float:
+        sections = DataDisplayGenerator().parse_data(data)
+        start = time.perf_counter()
+        DataDisplayGenerator().generate_html(sections)
+        if reformat:
+            # What the indexer paid before formatted values were kept
+            for section in sections:
+                section._formatted = None
+        for section in sections:
+            section.content
+        return time.perf_counter() - start
+
+    print(f"{'values':<12}{'ms':>10}")
+    for label, reformat in (("reformatted", True), ("kept", False)):
+        seconds = min(render_and_index(reformat) for _ in range(3))
+        print(f"{label:<12}{seconds * 1e3:>10.1f}")
+    print()
+
+
+def bench_parallel(size: int) -> None:
+    """Time to format a large JSON document's values in process and on pools of worker processes."""
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+    from app import app, format_json_sections, format_value
+
+    cpus = os.cpu_count() or 1
+    print(f"Parallel JSON formatting on {cpus} CPU(s)")
+    print("-" * 60)
+    record = {"name": "search", "args": {"query": "<tool> & args", "ids": list(range(40))}, "ok": True}
+    count = max(size // len(json.dumps(record)), 2)
+    sections = DataDisplayGenerator().parse_data(json.dumps({f"call_{n}": record for n in range(count)}))
+
+    in_process = _time(lambda: [format_value(section.json_container) for section in sections])
+    print(f"{'workers':<10}{'ms':>10}{'speedup':>10}")
+    print(f"{'none':<10}{in_process * 1e3:>10.1f}{1:>9.2f}x")
+    workers_setting = app.config['PARALLEL_RENDER_WORKERS']
+    try:
+        for workers in sorted({1, 2, min(max(cpus - 1, 1), 4)}):
+            app.config['PARALLEL_RENDER_WORKERS'] = workers
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                pool.submit(int).result()  # start the workers before timing them
+                seconds = _time(lambda: format_json_sections(sections, pool))
+            print(f"{workers:<10}{seconds * 1e3:>10.1f}{in_process / seconds:>9.2f}x")
+    finally:
+        app.config['PARALLEL_RENDER_WORKERS'] = workers_setting
+    print()
+
+
+def bench_bytes(size: int) -> None:
+    """Streamed render time and peak memory of UTF-8 input, encoded from str against rendered as bytes."""
+    print("UTF-8 input rendered through str and as bytes")
+    print("-" * 60)
+    generator = DataDisplayGenerator()
+    generator.auto_parse_json = False
+
+    def consume(chunks):
+        for _ in chunks:
+            pass
+
+    print(f"{'section KB':<12}{'str ms':>10}{'bytes ms':>10}{'str MB':>10}{'bytes MB':>10}")
+    for section_size in (128, 4096, 65536, 1 << 20):
+        block = ("line with <tags> & text " * (section_size // 24)).encode("utf-8")
+        data = b"\n\n".join(b"Title %d\n" % n + block for n in range(max(size // section_size, 1)))
+        sections = generator.parse_data(data)
+        pipelines = (lambda: consume(chunk.encode("utf-8") for chunk in generator.iter_html(sections)),
+                     lambda: consume(generator.iter_html_utf8(sections)))
+        seconds = [_time(render) * 1e3 for render in pipelines]
+        peaks = [_peak_memory(render) / 1e6 for render in pipelines]
+        print(f"{section_size / 1024:<12g}{seconds[0]:>10.1f}{seconds[1]:>10.1f}{peaks[0]:>10.1f}{peaks[1]:>10.1f}")
+    print()
+
+
+def bench_budget(size: int) -> None:
+    """Peak memory and time of an /api/generate reply kept in memory against spilled past the budget."""
+    from app import app
+
+    print("/api/generate reply in memory and spilled to disk")
+    print("-" * 60)
+    data = _repeat_to_size("Step <1> & more text on this line, with a few words of tool output.\n" * 20 + "\n", size)
+    body = json.dumps({"data": data})
+    budget = app.config['RENDER_MEMORY_BUDGET']
+
+    def generate():
+        response = app.view_functions['api_generate']()
+        for _ in response.response:
+            pass
+        response.close()
+
+    print(f"{'budget':<12}{'ms':>10}{'peak MB':>10}")
+    # The parsed request body is cached by the first run, so peaks are the render's own
+    with app.test_request_context('/api/generate', method='POST', data=body, content_type='application/json'):
+        try:
+            for label, limit in (("none", None), ("8 MB", 8 << 20), ("1 MB", 1 << 20)):
+                app.config['RENDER_MEMORY_BUDGET'] = limit
+                seconds = _time(generate) * 1e3
+                peak = _peak_memory(generate) / 1e6
+                print(f"{label:<12}{seconds:>10.1f}{peak:>10.1f}")
+        finally:
+            app.config['RENDER_MEMORY_BUDGET'] = budget
+    print()
+
+
+def bench_export(size: int, count: int = 1000, per_page: int = 4000) -> None:
+    """Size and write time of many small pages exported with embedded assets against shared ones."""
+    from static_export import SiteWriter, export_site
+
+    print(f"Static export ({count:,} pages of {per_page / 1000:g} KB)")
+    print("-" * 60)
+    step = "Step {}\n" + "Tool output with <tags> & text. " * 12 + "\n\n"
+    documents = [(f"Run {n}", "".join(step.format(s) for s in range(per_page // len(step) + 1)))
+                 for n in range(count)]
+
+    def export_embedded(writer):
+        generator = DataDisplayGenerator()
+        for title, data in documents:
+            generator.title = title
+            writer.write(f"{title}.html", generator.generate_html(generator.parse_data(data)).encode("utf-8"))
+
+    print(f"{'assets':<10}{'output':<10}{'MB':>10}{'write ms':>10}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for label, export in (("embedded", export_embedded), ("shared", lambda w: export_site(documents, w))):
+            for output, archive in (("directory", False), ("tar.gz", True)):
+                path = os.path.join(out_dir, f"{label}.tar.gz" if archive else label)
+                started = time.perf_counter()
+                writer = SiteWriter(path, archive=archive)
+                export(writer)
+                writer.close()
+                seconds = time.perf_counter() - started
+                print(f"{label:<10}{output:<10}{writer.bytes_written / 1e6:>10.2f}{seconds * 1e3:>10.1f}")
+    print()
+
+
+def bench_json_view(size: int) -> None:
+    """Output size and render time of the text and tree JSON views on nested payloads."""
+    print("JSON views")
+    print("-" * 60)
+    data = make_tool_call_payload(size)
+    print(f"{'view':<10}{'MB':>10}{'render ms':>12}")
+    for view in JSON_VIEWS:
+        generator = DataDisplayGenerator()
+        generator.json_view = view
+        page = generator.generate(data)
+        seconds = _time(lambda: generator.generate_html(generator.parse_data(data)))
+        print(f"{view:<10}{len(page.encode('utf-8')) / 1e6:>10.2f}{seconds * 1e3:>12.1f}")
+    print()
+
+
+# Run in a fresh interpreter per sample; prints the phase timings as JSON
+APP_STARTUP = """
+import json, time
+start = time.perf_counter()
+import flask, werkzeug.test
+deps = time.perf_counter()
+import app
+module = time.perf_counter()
+if {warm_up}:
+    app.app.config["TEMPLATE_CACHE_DIR"] = {cache_dir!r}
+    app.warm_up()
+warm = time.perf_counter()
+app.DataDisplayGenerator().generate('{{"first": ["render"]}}')
+render = time.perf_counter()
+client = app.app.test_client()
+page_start = time.perf_counter()
+client.get("/")
+page = time.perf_counter()
+print(json.dumps({{"deps": deps - start, "import": module - deps, "warm_up": warm - module,
+                  "render": render - warm, "page": page - page_start}}))
+"""
+
+COMPONENT_STARTUP = """
+import json, time
+start = time.perf_counter()
+import langflow.custom, langflow.io, langflow.schema
+deps = time.perf_counter()
+import data_display_component
+module = time.perf_counter()
+component = data_display_component.InteractiveDataDisplay()
+for name, value in (("data_input", '{{"first": ["render"]}}'), ("title", "Startup"), ("theme_color", "#4F46E5"),
+                    ("auto_parse_json", True), ("collapsed_by_default", False), ("json_tree_view", False)):
+    setattr(component, name, value)
+component.build_display()
+render = time.perf_counter()
+print(json.dumps({{"deps": deps - start, "import": module - deps, "render": render - module}}))
+"""
+
+
+def _startup_sample(code: str, repeat: int) -> dict:
+    """Median of each phase timing over ``repeat`` fresh interpreters, in seconds."""
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        if result.returncode:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def bench_startup(size: int, repeat: int = 5) -> None:
+    """Import time and time to first render of app.py and the Langflow component."""
+    print(f"Cold start (median of {repeat} fresh interpreters)")
+    print("-" * 60)
+    print(f"{'app.py':<20}{'deps ms':>8}{'import':>8}{'warm_up':>8}{'render':>8}{'page':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # The cached row is sampled after the warm_up row has filled the template cache
+        for label, warm_up, cache in (("cold", False, None), ("warm_up", True, None),
+                                      ("warm_up, cached", True, cache_dir)):
+            code = APP_STARTUP.format(warm_up=warm_up, cache_dir=cache)
+            if cache:
+                _startup_sample(code, 1)
+            timings = _startup_sample(code, repeat)
+            print(f"{label:<20}" + "".join(f"{timings[key] * 1e3:>8.1f}"
+                                          for key in ("deps", "import", "warm_up", "render", "page")))
+
+    print(f"{'component':<20}{'deps ms':>8}{'import':>8}{'render':>8}")
+    try:
+        timings = _startup_sample(COMPONENT_STARTUP.format(), repeat)
+    except RuntimeError as exc:
+        print(f"{'cold':<20}skipped ({exc})")
+    else:
+        print(f"{'cold':<20}" + "".join(f"{timings[key] * 1e3:>8.1f}" for key in ("deps", "import", "render")))
+    print()
+
+
+def bench_splitters(size: int) -> None:
+    """Throughput of every section splitting strategy, for str and bytes input."""
+    print("Section splitters")
+    print("-" * 60)
+    corpora = {
+        "blank_line": make_blank_line_corpus(size),
+        "markdown": make_markdown_corpus(size),
+        "rule": make_rule_corpus(size),
+        "regex": make_markdown_corpus(size),
+        "ndjson": make_ndjson_corpus(size),
+    }
+    print(f"{'mode':<12}{'input':<8}{'sections':>10}{'MB/s':>12}")
+    for mode in SPLITTERS:
+        generator = DataDisplayGenerator()
+        generator.auto_parse_json = False
+        generator.split_mode = mode
+        generator.split_pattern = r"^## "
+        text = corpora[mode]
+        for label, data in (("str", text), ("bytes", text.encode("utf-8"))):
+            sections = generator.parse_data(data)
+            seconds = _time(lambda: generator.parse_data(data))
+            throughput = len(data) / seconds / 1e6
+            print(f"{mode:<12}{label:<8}{len(sections):>10}{throughput:>12.1f}")
+    print()
+
+
+BENCHMARKS = {
+    "splitters": bench_splitters,
+    "cards": bench_cards,
+    "icons": bench_icons,
+    "json_view": bench_json_view,
+    "fragments": bench_fragments,
+    "formatting": bench_formatting,
+    "parallel": bench_parallel,
+    "pages": bench_pages,
+    "bytes": bench_bytes,
+    "export": bench_export,
+    "budget": bench_budget,
+    "startup": bench_startup,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--size-mb", type=float, default=10.0,
+                        help="size of the generated corpora in MB (default: 10)")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    print("=" * 60)
+    print("Interactive Data Display - Benchmarks")
+    print("=" * 60)
+    print()
+
+    size = int(args.size_mb * 1_000_000)
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](size)
@@ -0,0 +1,324 @@
+"""
+Python client for the Interactive Data Display server
+Renders data through /api/generate over pooled keep-alive connections, or in-process when co-located
+
+Usage:
+    from data_display_client import DataDisplayClient
+
+    with DataDisplayClient("http://127.0.0.1:5000") as client:
+        html = client.generate('{"summary": "..."}', title="Report")
+        pages = client.generate_many([output_a, output_b], collapsed=True)
+        future = client.submit(output_c)  # batched with other submits
+
+    local = DataDisplayClient(local=True)  # no HTTP: renders with app.py in this process
+
+Only the standard library is needed (plus Flask for local mode).
+"""
+
+import asyncio
+from concurrent.futures import Future
+import gzip
+import http.client
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+import urllib.parse
+
+# Settings /api/generate accepts besides the data itself
+SETTINGS = ("title", "theme_color", "auto_parse", "collapsed", "split_mode", "split_pattern", "json_view")
+
+# Errors talking to the server
+CONNECTION_ERRORS = (OSError, http.client.HTTPException)
+# The ones worth another attempt, as the request cannot have been rendered:
+# a pooled keep-alive connection the server had closed (reset, aborted,
+# broken pipe, RemoteDisconnected) or a server not accepting connections
+# (refused). Timeouts are not retried: the server may still be rendering.
+RETRIED_ERRORS = (ConnectionError,)
+
+
+class DataDisplayError(Exception):
+    """A render the server (or the local engine) refused, with the HTTP status if there was one."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class DataDisplayClient:
+    """
+    Client for the display server's render API.
+
+    - Requests go over up to ``pool_size`` keep-alive connections that are
+      reused between calls and threads.
+    - Bodies of at least ``compress_min_size`` bytes are sent gzipped.
+    - Reset, refused and stale keep-alive connections, ``429`` and ``503``
+      are retried up to ``retries`` times, waiting the server's
+      ``Retry-After`` or an exponential backoff.
+    - ``submit()`` queues renders and sends them to ``/api/generate/batch``
+      once ``batch_size`` are waiting or ``batch_delay`` seconds have
+      passed, so many small renders cost a few requests.
+    - With ``local=True`` nothing goes over HTTP: renders run in this
+      process with the server's own code (``app.generate_document()``).
+    """
+
+    def __init__(self, base_url: str = "http://127.0.0.1:5000", *, local: bool = False,
+                 pool_size: int = 4, timeout: float = 60.0, retries: int = 3, backoff: float = 0.5,
+                 compress_min_size: int = 1024, batch_size: int = 20, batch_delay: float = 0.01):
+        self.local = local
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.compress_min_size = compress_min_size
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+
+        parts = urllib.parse.urlsplit(base_url)
+        if not local and parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported server URL: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path.rstrip("/")
+        # Idle connections; at most pool_size are kept, more are opened if needed
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(pool_size)
+
+        self._pending: "queue.Queue[tuple]" = queue.Queue()
+        self._batcher: Optional[threading.Thread] = None
+        self._batcher_lock = threading.Lock()
+        self._closed = False
+
+    def generate(self, data: Union[str, Any], **settings: Any) -> str:
+        """Render ``data`` (text, or a value sent as JSON) and return the HTML page."""
+        return self.generate_document(data, **settings)["html"]
+
+    def generate_document(self, data: Union[str, Any], **settings: Any) -> Dict[str, Any]:
+        """Like ``generate()``, returning the whole reply (``html`` and ``document_id``)."""
+        body = self._request_body(data, settings)
+        if self.local:
+            return _generate_local(body)
+        reply = self._post("/api/generate", body)
+        if not reply.get("success"):
+            raise DataDisplayError(reply.get("error", "Render failed"), 400)
+        return reply
+
+    def generate_many(self, items: Iterable[Union[str, Any]], **settings: Any) -> List[str]:
+        """
+        Render several inputs in ``batch_size`` batches and return their pages in order.
+
+        Items are the data to render, or dicts with a ``data`` key and
+        settings of their own that override ``settings``. Raises
+        ``DataDisplayError`` for the first item that failed.
+        """
+        bodies = [self._item_body(item, settings) for item in items]
+        pages = []
+        for start in range(0, len(bodies), self.batch_size):
+            for reply in self._generate_batch(bodies[start:start + self.batch_size]):
+                if not reply.get("success"):
+                    raise DataDisplayError(reply.get("error", "Render failed"), 400)
+                pages.append(reply["html"])
+        return pages
+
+    def submit(self, data: Union[str, Any], **settings: Any) -> "Future[str]":
+        """Queue a render to be sent in a batch with others; the future resolves to the HTML page."""
+        if self._closed:
+            raise RuntimeError("The client is closed")
+        future: "Future[str]" = Future()
+        self._pending.put((self._request_body(data, settings), future))
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = threading.Thread(target=self._run_batcher, name="display-client-batcher",
+                                                 daemon=True)
+                self._batcher.start()
+        return future
+
+    def close(self) -> None:
+        """Send the renders still queued and close the pooled connections."""
+        self._closed = True
+        with self._batcher_lock:
+            batcher = self._batcher
+        if batcher is not None:
+            self._pending.put(None)
+            batcher.join()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self) -> "DataDisplayClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _generate_batch(self, bodies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.local:
+            results = []
+            for body in bodies:
+                try:
+                    results.append(_generate_local(body))
+                except DataDisplayError as e:
+                    results.append({"error": str(e), "success": False})
+            return results
+        reply = self._post("/api/generate/batch", {"requests": bodies})
+        if not reply.get("success"):
+            raise DataDisplayError(reply.get("error", "Batch failed"), 400)
+        return reply["results"]
+
+    def _run_batcher(self) -> None:
+        """Collect submitted renders into batches until ``close()``."""
+        stopping = False
+        while not stopping:
+            entry = self._pending.get()
+            if entry is None:
+                break
+            batch = [entry]
+            deadline = time.monotonic() + self.batch_delay
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: List[tuple]) -> None:
+        batch = [(body, future) for body, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            replies = self._generate_batch([body for body, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), reply in zip(batch, replies):
+            if reply.get("success"):
+                future.set_result(reply["html"])
+            else:
+                future.set_exception(DataDisplayError(reply.get("error", "Render failed"), 400))
+
+    def _request_body(self, data: Union[str, Any], settings: Mapping[str, Any]) -> Dict[str, Any]:
+        unknown = set(settings) - set(SETTINGS)
+        if unknown:
+            raise TypeError(f"Unknown setting(s): {', '.join(sorted(unknown))}")
+        return {"data": data if isinstance(data, str) else json.dumps(data), **settings}
+
+    def _item_body(self, item: Union[str, Any], settings: Mapping[str, Any]) -> Dict[str, Any]:
+        if isinstance(item, Mapping) and "data" in item:
+            item = dict(item)
+            return self._request_body(item.pop("data"), {**settings, **item})
+        return self._request_body(item, settings)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST JSON, retrying ``RETRIED_ERRORS``, ``429`` and ``503``; returns the JSON reply."""
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if len(body) >= self.compress_min_size:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+
+        attempt = 0
+        while True:
+            connection = self._connection()
+            try:
+                connection.request("POST", self.path + path, body=body, headers=headers)
+                response = connection.getresponse()
+                reply_body = response.read()
+            except CONNECTION_ERRORS as e:
+                connection.close()
+                if not isinstance(e, RETRIED_ERRORS) or attempt >= self.retries:
+                    raise DataDisplayError(f"Could not reach the display server: {e}") from e
+                # The first retry is immediate: usually the server had closed an idle connection
+                if attempt:
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+                attempt += 1
+                continue
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            if response.status in (429, 503) and attempt < self.retries:
+                retry_after = response.getheader("Retry-After")
+                time.sleep(float(retry_after) if retry_after and retry_after.isdigit() else self.backoff * 2 ** attempt)
+                attempt += 1
+                continue
+            try:
+                reply = json.loads(reply_body)
+            except ValueError:
+                raise DataDisplayError(f"Unexpected reply from the display server ({response.status})",
+                                       response.status)
+            if response.status >= 400 and "error" in reply:
+                raise DataDisplayError(reply["error"], response.status)
+            return reply
+
+
+class AsyncDataDisplayClient:
+    """
+    ``asyncio`` variant of ``DataDisplayClient`` with the same options.
+
+    ``generate()`` goes through the batching queue, so renders awaited
+    together (e.g. with ``asyncio.gather``) are sent as batches; blocking
+    I/O happens on the client's batching thread and the default executor,
+    never on the event loop.
+    """
+
+    def __init__(self, base_url: str = "http://127.0.0.1:5000", **options: Any):
+        self._client = DataDisplayClient(base_url, **options)
+
+    async def generate(self, data: Union[str, Any], **settings: Any) -> str:
+        return await asyncio.wrap_future(self._client.submit(data, **settings))
+
+    async def generate_document(self, data: Union[str, Any], **settings: Any) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self._client.generate_document(data, **settings))
+
+    async def generate_many(self, items: Iterable[Union[str, Any]], **settings: Any) -> List[str]:
+        loop = asyncio.get_running_loop()
+        items = list(items)
+        return await loop.run_in_executor(None, lambda: self._client.generate_many(items, **settings))
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._client.close)
+
+    async def __aenter__(self) -> "AsyncDataDisplayClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def _generate_local(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render a request body with the server's code in this process. Pages are
+    not indexed for search: no server serves them, so nobody could search them.
+    """
+    from app import app, generate_document  # Flask is only needed in local mode
+
+    try:
+        with app.app_context():
+            return generate_document(body, index=False)
+    except Exception as e:
+        raise DataDisplayError(str(e)) from e
@@ -3,164 +3,229 @@ Interactive Data Display Component for Langflow
 Displays LLM data in a beautiful web page with collapsible sections and copy functionality
 """
 
+from array import array
+from functools import lru_cache
 import json
-from typing import Any, Dict, List, Union
+import re
+import sys
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple, Union
 from langflow.custom import Component
 from langflow.io import MessageTextInput, StrInput, BoolInput, Output
 from langflow.schema import Message
 
+# (blank line, leading whitespace, newline) patterns
+_TEXT_SCAN = (re.compile("\n\n"), re.compile(r"\s*"), re.compile("\n"))
 
-class InteractiveDataDisplay(Component):
-    display_name = "Interactive Data Display"
-    description = "Display LLM data in a beautiful, interactive web page with collapsible sections and copy-to-clipboard functionality"
-    icon = "layout"
+# json.loads can only succeed if the first non-whitespace character can
+# start a JSON value; checking that first skips a doomed full parse.
+_TEXT_JSON_START = re.compile(r'[ \t\n\r]*[{\["\-0-9tfnNI]')
 
-    inputs = [
-        MessageTextInput(
-            name="data_input",
-            display_name="Data Input",
-            info="Input data from LLM (can be text, JSON string, or formatted data)",
-            required=True,
-        ),
-        StrInput(
-            name="title",
-            display_name="Page Title",
-            info="Main title for the display page",
-            value="LLM Data Display",
-        ),
-        StrInput(
-            name="theme_color",
-            display_name="Theme Color",
-            info="Primary color for the interface (hex code)",
-            value="#4F46E5",
-        ),
-        BoolInput(
-            name="auto_parse_json",
-            display_name="Auto Parse JSON",
-            info="Automatically parse JSON data into sections",
-            value=True,
-        ),
-        BoolInput(
-            name="collapsed_by_default",
-            display_name="Collapsed by Default",
-            info="Start with all sections collapsed",
-            value=False,
-        ),
-    ]
+CONTENT_CHUNK_SIZE = 1 << 20
 
-    outputs = [
-        Output(display_name="HTML Output", name="html_output", method="build_display"),
-    ]
 
-    def parse_data(self, data: str) -> List[Dict[str, Any]]:
-        """
-        Parse input data into structured sections.
-        Tries to parse as JSON, otherwise splits by common delimiters.
-        """
-        sections = []
+def format_value(value: Any) -> str:
+    """Format a value for display."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, indent=2)
+    return str(value)
 
-        if self.auto_parse_json:
-            try:
-                # Try parsing as JSON
-                parsed = json.loads(data)
 
-                if isinstance(parsed, dict):
-                    # Convert dict to sections
-                    for key, value in parsed.items():
-                        sections.append({
-                            "title": str(key).replace("_", " ").title(),
-                            "content": self._format_value(value)
-                        })
-                elif isinstance(parsed, list):
-                    # Handle list of items
-                    for idx, item in enumerate(parsed):
-                        sections.append({
-                            "title": f"Item {idx + 1}",
-                            "content": self._format_value(item)
-                        })
-                else:
-                    sections.append({
-                        "title": "Data",
-                        "content": self._format_value(parsed)
-                    })
+def compact_json(value: Any) -> str:
+    """Serialize a value as compact JSON that is safe inside a ``<script>`` element."""
+    return json.dumps(value, separators=(",", ":")).replace("<", "\\u003c")
 
-                return sections
-            except (json.JSONDecodeError, ValueError):
-                pass
-
-        # Fallback: Split by common section markers
-        if "\n\n" in data:
-            # Split by double newlines
-            parts = data.split("\n\n")
-            for idx, part in enumerate(parts):
-                if part.strip():
-                    # Try to identify title (first line if it's short)
-                    lines = part.strip().split("\n", 1)
-                    if len(lines) > 1 and len(lines[0]) < 100:
-                        title = lines[0].strip("#* ")
-                        content = lines[1]
-                    else:
-                        title = f"Section {idx + 1}"
-                        content = part
-
-                    sections.append({
-                        "title": title,
-                        "content": content
-                    })
-        else:
-            # Single section
-            sections.append({
-                "title": "Output",
-                "content": data
-            })
-
-        return sections
-
-    def _format_value(self, value: Any) -> str:
-        """Format a value for display."""
-        if isinstance(value, (dict, list)):
-            return json.dumps(value, indent=2)
-        return str(value)
-
-    def generate_html(self, sections: List[Dict[str, Any]]) -> str:
-        """Generate the complete HTML page."""
 
-        collapsed_class = "collapsed" if self.collapsed_by_default else ""
+def _looks_like_json(data: str) -> bool:
+    return _TEXT_JSON_START.match(data) is not None
 
-        # Generate sections HTML
-        sections_html = ""
-        for idx, section in enumerate(sections):
-            section_id = f"section-{idx}"
-            sections_html += f"""
-            <div class="section-card {collapsed_class}">
-                <div class="section-header" onclick="toggleSection('{section_id}')">
-                    <div class="section-title">
-                        <span class="toggle-icon">▼</span>
-                        <h3>{section['title']}</h3>
-                    </div>
-                    <button class="copy-btn" onclick="copyText('{section_id}', event)" title="Copy to clipboard">
-                        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
-                            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
-                        </svg>
-                        Copy
-                    </button>
-                </div>
-                <div class="section-content" id="{section_id}">
-                    <pre class="content-text">{self._escape_html(section['content'])}</pre>
-                </div>
-            </div>
-            """
 
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{self.title}</title>
-    <style>
-        * {{
+def scan_blank_lines(data: str) -> Optional["SectionSpans"]:
+    """
+    Split ``data`` on blank lines in a single pass, recording offsets only.
+
+    Applies the same rules as the original ``data.split("\\n\\n")``
+    fallback: whitespace-only parts are skipped and a short first line
+    becomes the title. Returns ``None`` when the input has no blank line at
+    all.
+    """
+    blank_line, leading_space, newline = _TEXT_SCAN
+    if blank_line.search(data) is None:
+        return None
+
+    sections = SectionSpans(data)
+    add_offsets = sections.offsets.extend
+    match_leading_space = leading_space.match
+    find_newline = newline.search
+    idx = 0
+    for part_start, part_end in _iter_parts(blank_line, data):
+        # Span of part.strip() without materializing it
+        strip_start = match_leading_space(data, part_start, part_end).end()
+        if strip_start < part_end:
+            strip_end = part_end
+            while data[strip_end - 1].isspace():
+                strip_end -= 1
+
+            # Try to identify title (first line if it's short)
+            line_break = find_newline(data, strip_start, strip_end)
+            if line_break is not None and line_break.start() - strip_start < 100:
+                title_end = line_break.start()
+                add_offsets((title_end + 1, strip_end, strip_start, title_end))
+            else:
+                add_offsets((part_start, part_end, -1, idx + 1))
+
+        idx += 1
+    return sections
+
+
+def _iter_parts(boundary: Any, data: str) -> Iterator[Tuple[int, int]]:
+    """Yield the (start, end) offsets of the parts between boundary matches."""
+    part_start = 0
+    for match in boundary.finditer(data):
+        yield part_start, match.start()
+        part_start = match.end()
+    yield part_start, len(data)
+
+
+class _ListWriter:
+    """Minimal text stream that collects writes into a list for joining."""
+
+    __slots__ = ("write",)
+
+    def __init__(self, parts: List[str]):
+        self.write = parts.append
+
+
+class Section:
+    """
+    A parsed section of the input.
+
+    Text sections are stored as offsets into the original input and only
+    slice out their title/content when accessed; JSON sections keep the
+    decoded value and format it on first access. Sections also support
+    ``section["title"]``/``section["content"]`` like the dicts they replace.
+    """
+
+    __slots__ = ("source", "start", "end", "title_start", "title_end", "_title", "_value")
+
+    _NO_VALUE = object()
+
+    def __init__(self, source: str, start: int = 0, end: Optional[int] = None,
+                 title: Optional[str] = None, title_start: int = 0, title_end: int = 0):
+        self.source = source
+        self.start = start
+        self.end = len(source) if end is None else end
+        self.title_start = title_start
+        self.title_end = title_end
+        self._title = title
+        self._value = Section._NO_VALUE
+
+    @classmethod
+    def from_value(cls, title: str, value: Any) -> "Section":
+        """Create a section whose content is a decoded JSON value."""
+        section = cls("", title=title)
+        section._value = value
+        return section
+
+    @property
+    def title(self) -> str:
+        if self._title is None:
+            return self.source[self.title_start:self.title_end].strip("#* ")
+        return self._title
+
+    @property
+    def json_container(self) -> Optional[Union[dict, list]]:
+        """The decoded JSON object or array the section holds, if any."""
+        return self._value if isinstance(self._value, (dict, list)) else None
+
+    @property
+    def content(self) -> str:
+        if self._value is not Section._NO_VALUE:
+            return format_value(self._value)
+        if self.start == 0 and self.end == len(self.source):
+            return self.source
+        return self.source[self.start:self.end]
+
+    def iter_chunks(self, size: int = CONTENT_CHUNK_SIZE) -> Iterator[str]:
+        """Yield the content in pieces of at most ``size`` characters."""
+        if self._value is not Section._NO_VALUE or self.end - self.start <= size:
+            yield self.content
+            return
+        for offset in range(self.start, self.end, size):
+            yield self.source[offset:min(offset + size, self.end)]
+
+    def __getitem__(self, key: str) -> str:
+        if key == "title":
+            return self.title
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"title": self.title, "content": self.content}
+
+    def __repr__(self) -> str:
+        return f"Section(title={self.title!r})"
+
+
+class SectionSpans:
+    """
+    Compact list of text sections backed by a single offset table.
+
+    Each section costs four int64 offsets (content start/end and title
+    start/end) into the shared source; ``Section`` views are only created
+    when an entry is accessed. Untitled sections store ``-1`` as the title
+    start and their 1-based part number as the title end.
+    """
+
+    __slots__ = ("source", "offsets")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.offsets = array("q")
+
+    def append(self, start: int, end: int, title_start: int, title_end: int) -> None:
+        self.offsets.extend((start, end, title_start, title_end))
+
+    def __len__(self) -> int:
+        return len(self.offsets) // 4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            spans = SectionSpans(self.source)
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                spans.offsets = self.offsets[start * 4:max(stop, start) * 4]
+                return spans
+            for i in range(start, stop, step):
+                spans.offsets.extend(self.offsets[i * 4:i * 4 + 4])
+            return spans
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("section index out of range")
+        start, end, title_start, title_end = self.offsets[index * 4:index * 4 + 4]
+        if title_start < 0:
+            return Section(self.source, start, end, title=f"Section {title_end}")
+        return Section(self.source, start, end, title_start=title_start, title_end=title_end)
+
+    def __iter__(self) -> Iterator[Section]:
+        source = self.source
+        offsets = self.offsets
+        for index in range(0, len(offsets), 4):
+            start, end, title_start, title_end = offsets[index:index + 4]
+            if title_start < 0:
+                yield Section(source, start, end, title=f"Section {title_end}")
+            else:
+                yield Section(source, start, end, title_start=title_start, title_end=title_end)
+
+
+DEFAULT_THEME_COLOR = "#4F46E5"
+
+_HEX_COLOR = re.compile(r"#?([0-9A-Fa-f]{6}|[0-9A-Fa-f]{3})")
+_NAMED_COLOR = re.compile(r"[A-Za-z]{1,32}")
+
+# Page stylesheet; formatted once per theme by get_theme()
+PAGE_STYLESHEET = """        * {{
             margin: 0;
             padding: 0;
             box-sizing: border-box;
@@ -220,7 +285,7 @@ class InteractiveDataDisplay(Component):
         }}
 
         .section-header {{
-            background: {self.theme_color};
+            background: {theme_color};
             color: white;
             padding: 20px;
             cursor: pointer;
@@ -231,7 +296,7 @@ class InteractiveDataDisplay(Component):
         }}
 
         .section-header:hover {{
-            background: {self._darken_color(self.theme_color, 0.1)};
+            background: {hover_color};
         }}
 
         .section-title {{
@@ -285,6 +350,14 @@ class InteractiveDataDisplay(Component):
             border-color: #10b981;
         }}
 
+        .icon {{
+            width: 16px;
+            height: 16px;
+            fill: none;
+            stroke: currentColor;
+            stroke-width: 2;
+        }}
+
         .section-content {{
             max-height: 1000px;
             overflow: hidden;
@@ -299,7 +372,7 @@ class InteractiveDataDisplay(Component):
         .content-text {{
             padding: 25px;
             background: #f9fafb;
-            border-left: 4px solid {self.theme_color};
+            border-left: 4px solid {theme_color};
             margin: 0;
             white-space: pre-wrap;
             word-wrap: break-word;
@@ -377,17 +450,383 @@ class InteractiveDataDisplay(Component):
                 font-size: 0.8rem;
             }}
         }}
-    </style>
+"""
+
+
+def darken_color(hex_color: str, amount: float) -> str:
+    """Darken a hex color by a percentage."""
+    try:
+        hex_color = hex_color.lstrip('#')
+        r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        r = int(r * (1 - amount))
+        g = int(g * (1 - amount))
+        b = int(b * (1 - amount))
+        return f"#{r:02x}{g:02x}{b:02x}"
+    except ValueError:
+        return hex_color
+
+
+class Theme(NamedTuple):
+    """A validated theme color with its derived palette and stylesheet."""
+
+    color: str
+    hover_color: str
+    stylesheet: str
+
+
+@lru_cache(maxsize=256)
+def get_theme(theme_color: str) -> Theme:
+    """
+    Return the theme for a color, building and validating it only once.
+
+    Hex colors (``#RRGGBB`` or ``#RGB``) get a darkened hover color, CSS color
+    names are used as-is and anything else falls back to the default theme.
+    """
+    hex_match = _HEX_COLOR.fullmatch(theme_color)
+    if hex_match:
+        digits = hex_match.group(1)
+        if len(digits) == 3:
+            digits = "".join(digit * 2 for digit in digits)
+        color = theme_color if theme_color.startswith("#") else f"#{digits}"
+        hover_color = darken_color(digits, 0.1)
+    elif _NAMED_COLOR.fullmatch(theme_color):
+        color = hover_color = theme_color
+    else:
+        return get_theme(DEFAULT_THEME_COLOR)
+
+    stylesheet = PAGE_STYLESHEET.format(theme_color=color, hover_color=hover_color)
+    return Theme(color, hover_color, stylesheet)
+
+
+# Icons are defined once per page and referenced from every card with <use>
+ICON_SPRITE = """    <svg xmlns="http://www.w3.org/2000/svg" style="display: none">
+        <symbol id="icon-copy" viewBox="0 0 24 24">
+            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
+            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
+        </symbol>
+        <symbol id="icon-check" viewBox="0 0 24 24">
+            <polyline points="20 6 9 17 4 12"></polyline>
+        </symbol>
+    </svg>
+"""
+
+# Section card markup. It is split once, by card_fragments(), into the static
+# fragments around its fields; write_html() interleaves them with each card's
+# values instead of formatting the whole card per section.
+SECTION_CARD_TEMPLATE = """
+            <div class="section-card {collapsed_class}">
+                <div class="section-header" onclick="toggleSection('section-{index}')">
+                    <div class="section-title">
+                        <span class="toggle-icon">▼</span>
+                        <h3>{title}</h3>
+                    </div>
+                    <button class="copy-btn" onclick="copyText('section-{index}', event)" title="Copy to clipboard">
+                        <svg class="icon"><use href="#icon-copy"></use></svg>
+                        Copy
+                    </button>
+                </div>
+                <div class="section-content" id="section-{index}">
+                    <pre class="content-text">{content}</pre>{more}
+                </div>
+            </div>
+            """
+
+_CARD_FIELD = re.compile(r"\{(?:index|title|content|more)\}")
+
+# Approximate number of characters write_html() collects before writing
+HTML_BATCH_SIZE = 64 * 1024
+
+# Cards fade in 0.1s apart; cards after this many share the last delay
+MAX_STAGGERED_CARDS = 20
+
+
+@lru_cache(maxsize=None)
+def card_fragments(collapsed: bool) -> Tuple[str, ...]:
+    """
+    Split the section card template into its static fragments.
+
+    The collapsed class is baked in, leaving seven fragments around the
+    ``index``, ``title``, ``index``, ``index``, ``content`` and ``more`` fields.
+    The component renders standalone pages, so ``more`` is always empty.
+    """
+    template = SECTION_CARD_TEMPLATE.replace("{collapsed_class}", "collapsed" if collapsed else "")
+    return tuple(_CARD_FIELD.split(template))
+
+
+# Characters of static markup in one card (its expanded form)
+CARD_STATIC_SIZE = sum(map(len, card_fragments(False)))
+
+
+# JSON views: "text" pretty-prints JSON objects and arrays into the card,
+# "tree" embeds them compactly and lets the page expand them level by level
+JSON_VIEWS = ("text", "tree")
+DEFAULT_JSON_VIEW = "text"
+
+JSON_TREE_OPEN = ('\n                    <div class="content-text json-tree"></div>'
+                  '<script type="application/json" class="json-data">')
+JSON_TREE_CLOSE = '</script>'
+
+JSON_TREE_STYLE = """
+        pre.content-text:has(+ .json-tree) {
+            display: none;
+        }
+
+        .json-level {
+            list-style: none;
+            margin: 0;
+            padding-left: 1.5em;
+        }
+
+        .json-tree > .json-level {
+            padding-left: 0;
+        }
+
+        .json-level .json-level {
+            display: none;
+        }
+
+        .open > .json-level {
+            display: block;
+        }
+
+        .json-toggle {
+            color: #6b7280;
+            cursor: pointer;
+        }
+
+        .json-toggle::before {
+            content: '▸ ';
+        }
+
+        .open > .json-toggle::before {
+            content: '▾ ';
+        }
+
+        .json-key {
+            color: #7c3aed;
+        }
+
+        .json-string {
+            color: #059669;
+        }
+
+        .json-number, .json-boolean, .json-null {
+            color: #2563eb;
+        }
+"""
+
+JSON_TREE_SCRIPT = """
+
+        // JSON tree view: each level is only built the first time it is opened
+        function renderJsonLevel(parent, value) {
+            const isArray = Array.isArray(value);
+            const list = document.createElement('ul');
+            list.className = 'json-level';
+            for (const [key, child] of Object.entries(value)) {
+                const item = document.createElement('li');
+                const name = document.createElement('span');
+                name.className = 'json-key';
+                name.textContent = isArray ? `[${key}]` : JSON.stringify(key);
+                item.append(name, ': ');
+                if (child !== null && typeof child === 'object') {
+                    const count = Object.keys(child).length;
+                    const toggle = document.createElement('span');
+                    toggle.className = 'json-toggle';
+                    toggle.textContent = Array.isArray(child) ? `[${count}]` : `{${count}}`;
+                    let rendered = false;
+                    toggle.addEventListener('click', () => {
+                        if (!rendered) {
+                            renderJsonLevel(item, child);
+                            rendered = true;
+                        }
+                        item.classList.toggle('open');
+                    });
+                    item.append(toggle);
+                } else {
+                    const leaf = document.createElement('span');
+                    leaf.className = `json-${child === null ? 'null' : typeof child}`;
+                    leaf.textContent = JSON.stringify(child);
+                    item.append(leaf);
+                }
+                list.append(item);
+            }
+            parent.append(list);
+        }
+
+        document.querySelectorAll('.json-data').forEach(data => {
+            renderJsonLevel(data.previousElementSibling, JSON.parse(data.textContent));
+        });"""
+
+
+class InteractiveDataDisplay(Component):
+    display_name = "Interactive Data Display"
+    description = "Display LLM data in a beautiful, interactive web page with collapsible sections and copy-to-clipboard functionality"
+    icon = "layout"
+
+    inputs = [
+        MessageTextInput(
+            name="data_input",
+            display_name="Data Input",
+            info="Input data from LLM (can be text, JSON string, or formatted data)",
+            required=True,
+        ),
+        StrInput(
+            name="title",
+            display_name="Page Title",
+            info="Main title for the display page",
+            value="LLM Data Display",
+        ),
+        StrInput(
+            name="theme_color",
+            display_name="Theme Color",
+            info="Primary color for the interface (hex code)",
+            value="#4F46E5",
+        ),
+        BoolInput(
+            name="auto_parse_json",
+            display_name="Auto Parse JSON",
+            info="Automatically parse JSON data into sections",
+            value=True,
+        ),
+        BoolInput(
+            name="collapsed_by_default",
+            display_name="Collapsed by Default",
+            info="Start with all sections collapsed",
+            value=False,
+        ),
+        BoolInput(
+            name="json_tree_view",
+            display_name="JSON Tree View",
+            info="Show JSON objects and arrays as a tree that expands level by level",
+            value=False,
+        ),
+    ]
+
+    outputs = [
+        Output(display_name="HTML Output", name="html_output", method="build_display"),
+    ]
+
+    def parse_data(self, data: str) -> Sequence[Section]:
+        """
+        Parse input data into structured sections.
+        Tries to parse as JSON, otherwise splits by common delimiters.
+
+        Text sections reference ``data`` instead of copying it.
+        """
+        sections = []
+
+        if self.auto_parse_json and _looks_like_json(data):
+            try:
+                # Try parsing as JSON
+                parsed = json.loads(data)
+
+                if isinstance(parsed, dict):
+                    # Convert dict to sections
+                    for key, value in parsed.items():
+                        sections.append(Section.from_value(
+                            str(key).replace("_", " ").title(), value
+                        ))
+                elif isinstance(parsed, list):
+                    # Handle list of items
+                    for idx, item in enumerate(parsed):
+                        sections.append(Section.from_value(f"Item {idx + 1}", item))
+                else:
+                    sections.append(Section.from_value("Data", parsed))
+
+                return sections
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        # Fallback: Split by common section markers
+        sections = scan_blank_lines(data)
+        if sections is None:
+            # Single section
+            sections = [Section(data, title="Output")]
+
+        return sections
+
+    def _format_value(self, value: Any) -> str:
+        """Format a value for display."""
+        return format_value(value)
+
+    def generate_html(self, sections: Sequence[Section]) -> str:
+        """Generate the complete HTML page."""
+        parts: List[str] = []
+        self.write_html(sections, _ListWriter(parts), batch_size=None)
+        return "".join(parts)
+
+    def write_html(self, sections: Sequence[Section], out: TextIO,
+                   batch_size: Optional[int] = HTML_BATCH_SIZE) -> None:
+        """
+        Write the complete HTML page to a text stream.
+        Large section content is escaped in bounded chunks read straight
+        from the parsed input. Cards are assembled from the static fragments
+        of ``SECTION_CARD_TEMPLATE`` and written once roughly ``batch_size``
+        characters have been collected (``None`` writes the page at once).
+        """
+        (card_open, after_index, after_title, after_copy_index,
+         before_content, after_content, card_end) = card_fragments(self.collapsed_by_default)
+        card_close = after_content + card_end
+        escape = self._escape_html
+        limit = batch_size or sys.maxsize
+        tree_view = getattr(self, "json_tree_view", False)
+
+        pieces = [self._page_head()]
+        pending = 0
+        for idx, section in enumerate(sections):
+            index = str(idx)
+            title = escape(section.title)
+            pieces += (card_open, index, after_index, title, after_title,
+                       index, after_copy_index, index, before_content)
+            close = card_close
+            tree = section.json_container if tree_view else None
+            if tree is not None:
+                data = compact_json(tree)
+                pieces += (after_content, JSON_TREE_OPEN, data, JSON_TREE_CLOSE)
+                pending += len(data)
+                close = card_end
+            elif section.end - section.start > CONTENT_CHUNK_SIZE:
+                for chunk in section.iter_chunks():
+                    pieces.append(escape(chunk))
+                    pending += len(chunk)
+            else:
+                content = section.content
+                pieces.append(escape(content))
+                pending += len(content)
+            pieces.append(close)
+            pending += CARD_STATIC_SIZE + len(title)
+            if pending >= limit:
+                out.write("".join(pieces))
+                pieces.clear()
+                pending = 0
+        pieces.append(self._page_tail())
+        out.write("".join(pieces))
+
+    def _page_head(self) -> str:
+        """Markup from the doctype up to the sections container."""
+        return f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{self._escape_html(self.title)}</title>
+    <style>
+{get_theme(self.theme_color).stylesheet}{JSON_TREE_STYLE if getattr(self, "json_tree_view", False) else ""}    </style>
 </head>
 <body>
-    <div class="container">
+{ICON_SPRITE}    <div class="container">
         <div class="header">
-            <h1>{self.title}</h1>
+            <h1>{self._escape_html(self.title)}</h1>
             <p>Click on sections to expand/collapse • Click copy to copy text</p>
         </div>
 
         <div class="sections-container">
-            {sections_html}
+            """
+
+    def _page_tail(self) -> str:
+        """Markup from the end of the sections container to the end of the page."""
+        return f"""
         </div>
     </div>
 
@@ -402,19 +841,27 @@ class InteractiveDataDisplay(Component):
         function copyText(sectionId, event) {{
             event.stopPropagation();
 
-            const contentElement = document.getElementById(sectionId).querySelector('.content-text');
-            const text = contentElement.textContent;
+            const section = document.getElementById(sectionId);
+            const jsonData = section.querySelector('.json-data');
+            const text = jsonData
+                ? JSON.stringify(JSON.parse(jsonData.textContent), null, 2)
+                : section.querySelector('.content-text').textContent;
+
+            const btn = event.currentTarget;
+            const icon = btn.querySelector('use');
+            const label = btn.lastChild;
+            const originalLabel = label.textContent;
 
             navigator.clipboard.writeText(text).then(() => {{
                 showToast('Copied to clipboard!');
 
-                const btn = event.currentTarget;
-                const originalText = btn.innerHTML;
-                btn.innerHTML = '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"></polyline></svg> Copied!';
+                icon.setAttribute('href', '#icon-check');
+                label.textContent = ' Copied! ';
                 btn.classList.add('copied');
 
                 setTimeout(() => {{
-                    btn.innerHTML = originalText;
+                    icon.setAttribute('href', '#icon-copy');
+                    label.textContent = originalLabel;
                     btn.classList.remove('copied');
                 }}, 2000);
             }}).catch(err => {{
@@ -433,17 +880,16 @@ class InteractiveDataDisplay(Component):
             }}, 3000);
         }}
 
-        // Add staggered animation to sections
+        // Add staggered animation to sections (capped, so long pages
+        // do not keep animating in for minutes)
         document.querySelectorAll('.section-card').forEach((card, index) => {{
-            card.style.animationDelay = `${{index * 0.1}}s`;
-        }});
+            card.style.animationDelay = `${{Math.min(index, {MAX_STAGGERED_CARDS}) * 0.1}}s`;
+        }});{JSON_TREE_SCRIPT if getattr(self, "json_tree_view", False) else ""}
     </script>
 </body>
 </html>
         """
 
-        return html
-
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters."""
         return (text
@@ -455,15 +901,7 @@ class InteractiveDataDisplay(Component):
 
     def _darken_color(self, hex_color: str, amount: float) -> str:
         """Darken a hex color by a percentage."""
-        try:
-            hex_color = hex_color.lstrip('#')
-            r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            r = int(r * (1 - amount))
-            g = int(g * (1 - amount))
-            b = int(b * (1 - amount))
-            return f"#{r:02x}{g:02x}{b:02x}"
-        except:
-            return hex_color
+        return darken_color(hex_color, amount)
 
     def build_display(self) -> Message:
         """
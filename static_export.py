@@ -0,0 +1,216 @@
+"""
+Static-site export for bulk archives of rendered pages
+Renders many inputs into a directory (or one compressed archive) whose pages share one copy of their CSS, JavaScript and icons
+
+Usage:
+    python static_export.py -o site/ runs/*.txt             # one page per file, plus index.html
+    python static_export.py -o site/ runs/ --precompress gz br
+    python static_export.py --archive site.tar.gz runs/     # everything in one archive
+"""
+
+import argparse
+import gzip
+import io
+import os
+import re
+import tarfile
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from markupsafe import escape
+
+from app import DEFAULT_JSON_VIEW, DEFAULT_SPLIT_MODE, DEFAULT_THEME_COLOR, DataDisplayGenerator, SharedAssets
+
+# Precompressed copies that can be written next to every file, for servers
+# that send them as is (nginx gzip_static/brotli_static, Caddy precompressed)
+PRECOMPRESSORS = ("gz", "br")
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>{title}</h1>
+            <p>{count} pages</p>
+        </div>
+
+        <div class="sections-container">
+{links}
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+INDEX_LINK = """            <div class="section-card">
+                <div class="section-header">
+                    <a class="section-title" href="{href}">{title}</a>
+                    <span>{sections} sections</span>
+                </div>
+            </div>"""
+
+
+class SiteWriter:
+    """Writes files to a directory, or to a ``.tar.gz``/``.tar.xz``/``.tar.bz2`` archive."""
+
+    def __init__(self, path: str, archive: bool = False, precompress: Sequence[str] = ()):
+        unknown = set(precompress) - set(PRECOMPRESSORS)
+        if unknown:
+            raise ValueError(f"Unknown precompression: {', '.join(sorted(unknown))}")
+        self.compress_br = None
+        if "br" in precompress:
+            try:
+                import brotli  # optional dependency
+            except ImportError:
+                raise ValueError("Brotli copies need the brotli package (pip install brotli)") from None
+            self.compress_br = brotli.compress
+        self.precompress = tuple(precompress)
+        self.path = path
+        self.tar = None
+        self.bytes_written = 0
+        self.mtime = int(time.time())
+        if archive:
+            mode = {".gz": "w:gz", ".tgz": "w:gz", ".xz": "w:xz", ".bz2": "w:bz2"}.get(
+                os.path.splitext(path)[1], "w")
+            self.tar = tarfile.open(path, mode)
+
+    def write(self, name: str, data: bytes) -> None:
+        """Write ``name`` and its precompressed copies."""
+        self._write(name, data)
+        if "gz" in self.precompress:
+            self._write(name + ".gz", gzip.compress(data, 9, mtime=0))
+        if self.compress_br is not None:
+            self._write(name + ".br", self.compress_br(data))
+
+    def _write(self, name: str, data: bytes) -> None:
+        self.bytes_written += len(data)
+        if self.tar is not None:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = self.mtime
+            self.tar.addfile(info, io.BytesIO(data))
+            return
+        path = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def close(self) -> None:
+        if self.tar is not None:
+            self.tar.close()
+            self.bytes_written = os.path.getsize(self.path)
+
+
+def page_name(title: str, taken: Dict[str, int]) -> str:
+    """
+    A unique ``.html`` file name for a page, derived from its title.
+
+    ``taken`` maps the file names in use to the last number appended to
+    them, so titles like ``a``, ``a``, ``a-2`` cannot collide and a title
+    repeated many times does not retry every number.
+    """
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", title).strip("-.").lower() or "page"
+    name = f"{slug}.html"
+    if name in taken:
+        count = taken[name] + 1
+        while f"{slug}-{count}.html" in taken:
+            count += 1
+        taken[name] = count
+        name = f"{slug}-{count}.html"
+    taken[name] = 1
+    return name
+
+
+def export_site(documents: Iterable[Tuple[str, Union[str, bytes]]], writer: SiteWriter,
+                title: str = "LLM Data Display Archive", theme_color: str = DEFAULT_THEME_COLOR,
+                auto_parse: bool = True, collapsed: bool = False, split_mode: str = DEFAULT_SPLIT_MODE,
+                split_pattern: Optional[str] = None, json_view: str = DEFAULT_JSON_VIEW) -> List[Dict]:
+    """
+    Render ``(title, data)`` documents as pages sharing their assets, then
+    write the assets and an ``index.html`` linking every page.
+
+    Pages are written as they are rendered, so only one is held at a time.
+    Returns the index entries (``title``, ``file``, ``sections``).
+    """
+    assets = SharedAssets("assets/")
+    taken: Dict[str, int] = {"index.html": 1}
+    pages = []
+    generator = DataDisplayGenerator()
+    generator.configure(theme_color=theme_color, auto_parse=auto_parse, collapsed=collapsed,
+                        split_mode=split_mode, split_pattern=split_pattern, json_view=json_view)
+    generator.shared_assets = assets
+    generator.home_url = "index.html"
+    for page_title, data in documents:
+        generator.title = page_title
+        sections = generator.parse_data(data)
+        if isinstance(data, str):
+            html = "".join(generator.iter_html(sections, batch_size=None)).encode("utf-8")
+        else:
+            html = b"".join(generator.iter_html_utf8(sections, batch_size=None))
+        name = page_name(page_title, taken)
+        writer.write(name, html)
+        pages.append({"title": page_title, "file": name, "sections": len(sections)})
+
+    # The index uses the pages' stylesheet
+    stylesheet = assets.url("style", "css", generator._stylesheet())
+    for name, content in assets.files.items():
+        writer.write(f"assets/{name}", content.encode("utf-8"))
+    links = "\n".join(INDEX_LINK.format(href=escape(page["file"]), title=escape(page["title"]),
+                                        sections=page["sections"]) for page in pages)
+    writer.write("index.html", INDEX_TEMPLATE.format(title=escape(title), stylesheet=stylesheet,
+                                                     count=len(pages), links=links).encode("utf-8"))
+    return pages
+
+
+def iter_input_files(paths: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+    """``(title, content)`` of each file, titled by its path without extension; directories are walked in order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    full_path = os.path.join(root, file_name)
+                    with open(full_path, "rb") as f:
+                        yield os.path.splitext(os.path.relpath(full_path, path))[0], f.read()
+        else:
+            with open(path, "rb") as f:
+                yield os.path.splitext(os.path.basename(path))[0], f.read()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="files to render (directories are walked)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("-o", "--output", help="directory to write the site to")
+    output.add_argument("--archive", help="write one .tar.gz/.tar.xz archive instead of a directory")
+    parser.add_argument("--precompress", nargs="+", choices=PRECOMPRESSORS, default=[],
+                        help="also write .gz and/or .br copies of every file")
+    parser.add_argument("--title", default="LLM Data Display Archive", help="title of the index page")
+    parser.add_argument("--theme-color", default=DEFAULT_THEME_COLOR)
+    parser.add_argument("--collapsed", action="store_true", help="collapse sections by default")
+    parser.add_argument("--no-auto-parse", action="store_true", help="do not detect JSON input")
+    parser.add_argument("--split-mode", default=DEFAULT_SPLIT_MODE)
+    parser.add_argument("--split-pattern")
+    parser.add_argument("--json-view", default=DEFAULT_JSON_VIEW)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        site = SiteWriter(args.archive or args.output, bool(args.archive), args.precompress)
+        try:
+            exported = export_site(iter_input_files(args.inputs), site, title=args.title,
+                                   theme_color=args.theme_color, auto_parse=not args.no_auto_parse,
+                                   collapsed=args.collapsed, split_mode=args.split_mode,
+                                   split_pattern=args.split_pattern, json_view=args.json_view)
+        finally:
+            site.close()
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"Export failed: {e}\n")
+    print(f"Exported {len(exported)} pages to {args.archive or args.output}: "
+          f"{site.bytes_written / 1e6:.1f} MB in {time.perf_counter() - started:.2f} s")
@@ -30,6 +30,10 @@ try:
     html = generator.generate(test_data, title="Test")
     assert "test" in html.lower()
     assert "data" in html.lower()
+    untrusted = '<img src=x onerror=alert(1)>\nbody\n\nnext\nx'
+    for page in (generator.generate_html(generator.parse_data(untrusted)),
+                 b"".join(generator.iter_html_utf8(generator.parse_data(untrusted.encode()))).decode()):
+        assert '<h3>&lt;img src=x onerror=alert(1)&gt;</h3>' in page and '<img src=x' not in page
     print("✓ DataDisplayGenerator works correctly")
 except Exception as e:
     print(f"✗ DataDisplayGenerator test failed: {e}")
@@ -53,6 +57,8 @@ try:
         })
         assert response.status_code == 200
         assert b'Test Title' in response.data or b'test' in response.data
+        response = client.post('/display', data={'data': 'x', 'title': '<img src=x onerror=alert(1)>'})
+        assert b'<img src=x' not in response.data and b'&lt;img src=x onerror=alert(1)&gt;' in response.data
         print("✓ Display route (/display) works")
 
         # Test API route
@@ -70,6 +76,1066 @@ except Exception as e:
     traceback.print_exc()
     sys.exit(1)
 
+# Test compact sections
+print("\nTesting compact sections...")
+try:
+    from app import Section, SectionSpans
+
+    text = "## Intro\nHello\n\n" + "y" * 120 + "\n\n  \n\nLast\nline one\nline two  \n"
+    sections = generator.parse_data(text)
+    assert isinstance(sections, SectionSpans)
+    assert [s['title'] for s in sections] == ['Intro', 'Section 2', 'Last']
+    assert sections[0].content == 'Hello'
+    assert sections[-1]['content'] == 'line one\nline two'
+    assert sections[1].content == 'y' * 120
+    assert [s.title for s in sections[1:]] == ['Section 2', 'Last']
+
+    generator.auto_parse_json = True
+    json_sections = generator.parse_data('{"key_name": {"nested": [1, 2]}}')
+    assert json_sections[0].title == 'Key Name'
+    assert json_sections[0].to_dict()['content'] == '{\n  "nested": [\n    1,\n    2\n  ]\n}'
+    # Formatted once, then reused (e.g. by the search indexer after the render)
+    assert json_sections[0].content is json_sections[0].content
+    print("✓ Sections expose lazy title/content spans")
+
+    import io
+    text = "Résumé\n<b>café</b> & more\u00a0\n\n\u3000\n\nPlain"
+    expected = generator.generate_html(generator.parse_data(text))
+    for buffer in (text.encode(), memoryview(text.encode())):
+        assert generator.generate_html(generator.parse_data(buffer)) == expected
+    stream = io.StringIO()
+    generator.write_html(generator.parse_data(text), stream)
+    assert stream.getvalue() == expected
+    many = generator.parse_data("".join(f"Title {n}\n<body> {n}\n\n" for n in range(500)))
+    chunks = list(generator.iter_html(many, batch_size=4096))
+    assert len(chunks) > 1 and "".join(chunks) == generator.generate_html(many)
+    page = "".join(chunks)
+    assert page.count('<symbol id="icon-copy"') == 1 and page.count('href="#icon-copy"') == 500
+    big = generator.parse_data(("Big\n" + "<é>" * 500000 + "\n\nEnd").encode())
+    assert "".join(big[0].iter_chunks(4096)) == "<é>" * 500000
+    print("✓ Byte buffers and streamed output match text rendering")
+
+except Exception as e:
+    print(f"✗ Compact sections test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test theme registry
+print("\nTesting theme registry...")
+try:
+    from app import get_theme, THEME_PRESETS
+
+    theme = get_theme('#4F46E5')
+    assert theme is get_theme('#4F46E5')
+    assert theme.hover_color == '#473fce'
+    assert get_theme('#abc').hover_color == '#99a8b7'
+    assert get_theme('teal').color == 'teal'
+    assert get_theme('red; } body { display: none') is get_theme('#4F46E5')
+    themed = DataDisplayGenerator()
+    themed.theme_color = '#059669'
+    assert theme.stylesheet not in themed.generate_html([])
+    assert get_theme('#059669').stylesheet in themed.generate_html([])
+
+    with app.test_client() as client:
+        page = client.get('/').get_data(as_text=True)
+        assert all(f'data-color="{color}"' in page for color in THEME_PRESETS.values())
+    print("✓ Themes are validated once and their stylesheets cached")
+
+except Exception as e:
+    print(f"✗ Theme registry test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test section splitters
+print("\nTesting section splitters...")
+try:
+    splitter = DataDisplayGenerator()
+    splitter.auto_parse_json = False
+    cases = {
+        'markdown': ("Intro\n# One\nbody 1\n```\n# not a heading\n```\n## Two\nbody 2\n",
+                     [('Section 1', 'Intro'), ('One', 'body 1\n```\n# not a heading\n```'),
+                      ('Two', 'body 2')]),
+        'rule': ("A\nx\n---\nB\ny\n", [('A', 'x'), ('B', 'y')]),
+        'ndjson': ('{"a": 1}\nraw line\n', [('Item 1', '{\n  "a": 1\n}'), ('Item 2', 'raw line')]),
+    }
+    for mode, (text, expected) in cases.items():
+        splitter.split_mode = mode
+        for data in (text, text.encode()):
+            assert [(s.title, s.content) for s in splitter.parse_data(data)] == expected, mode
+
+    splitter.split_mode = 'regex'
+    splitter.split_pattern = r'(?=^=== )'
+    sections = splitter.parse_data("=== A ===\nfoo\n=== B ===\nbar")
+    assert [s.title for s in sections] == ['=== A ===', '=== B ===']
+    print("✓ Markdown, rule, regex and NDJSON splitters work")
+
+    with app.test_client() as client:
+        response = client.post('/display', data={'data': '# A\nx\n# B\ny', 'split_mode': 'markdown'})
+        assert response.status_code == 200 and b'<h3>B</h3>' in response.data
+        response = client.post('/display', data={'data': 'x', 'split_mode': 'regex', 'split_pattern': '('})
+        assert response.status_code == 400
+        response = client.post('/api/generate', json={'data': 'x', 'split_mode': 'nope'})
+        assert response.status_code == 400
+    print("✓ Split mode is selectable via the form and API")
+
+    from app import iter_ndjson_sections
+    detector = DataDisplayGenerator()
+    assert [s.title for s in detector.parse_data('{"a": 1}\n{"b": 2}\n')] == ['Item 1', 'Item 2']
+    assert [s.title for s in detector.parse_data('{"a": 1}')] == ['A']
+    assert [s.title for s in detector.parse_data('{\n  "a": 1\n}')] == ['A']
+    lines = iter(['{"x": [1]}\n', '\n', 'oops\n'])
+    records = iter_ndjson_sections(lines)
+    assert next(records).content == '{\n  "x": [\n    1\n  ]\n}'
+    assert next(records).content == 'oops'
+    with app.test_client() as client:
+        response = client.post('/api/render?title=Logs', data=b'{"a": 1}\nplain\n',
+                               content_type='application/x-ndjson')
+        page = response.get_data(as_text=True)
+        assert response.status_code == 200 and '<h3>Item 2</h3>' in page and 'plain' in page
+        for content_type in ('application/x-ndjson', 'text/plain'):
+            page = client.post('/api/render?title=<script>alert(1)</script>', data=b'a\n\nb',
+                               content_type=content_type).get_data(as_text=True)
+            assert '<script>alert(1)' not in page and '<title>&lt;script&gt;alert(1)&lt;/script&gt;</title>' in page
+    print("✓ NDJSON input is auto-detected and streamed record by record")
+
+except Exception as e:
+    print(f"✗ Section splitters test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test section paging
+print("\nTesting section paging...")
+try:
+    import html
+    import json
+    import re
+
+    def read_all_pages(client, page):
+        document_id = re.search(r'data-document="(\w+)"', page).group(1)
+        text = html.unescape(re.search(r'<pre class="content-text">(.*?)</pre>', page, re.S).group(1))
+        offset = int(re.search(r'data-offset="(\d+)"', page).group(1))
+        while offset is not None:
+            result = client.get(f'/api/documents/{document_id}/sections/0?offset={offset}').get_json()
+            text += result['text']
+            offset = result['next_offset']
+        return text
+
+    big_json = json.dumps({"payload": {"rows": [f"<row {n}> é" for n in range(20000)]}})
+    big_text = "ü€ <x> " * 40000
+    with app.test_client() as client:
+        page = client.post('/display', data={'data': big_json, 'section_page_kb': '64'}).get_data(as_text=True)
+        assert 'class="load-more"' in page and 'function loadMore' in page
+        assert len(page) < len(big_json) // 2
+        assert read_all_pages(client, page) == DataDisplayGenerator().parse_data(big_json)[0].content
+
+        # Byte bodies are paged by bytes without splitting characters
+        page = client.post('/api/render?section_page_kb=1', data=big_text.encode()).get_data(as_text=True)
+        assert read_all_pages(client, page) == big_text
+
+        page = client.post('/display', data={'data': big_json, 'section_page_kb': '0'}).get_data(as_text=True)
+        assert 'load-more' not in page
+        assert client.get('/api/documents/unknown/sections/0').status_code == 404
+
+    # Kept documents count a shared source once and release it when evicted
+    from app import paged_documents, store_document
+    lines = "\n".join(f"line {n} <x>" for n in range(1000))
+    line_generator = DataDisplayGenerator()
+    line_generator.split_mode = 'ndjson'
+    closed = []
+    store_document(line_generator, line_generator.parse_data(lines), lambda: closed.append(True))
+    assert paged_documents[line_generator.document_id][2] == len(lines)
+    max_size = app.config['PAGED_DOCUMENTS_MAX_SIZE']
+    app.config['PAGED_DOCUMENTS_MAX_SIZE'] = len(lines)
+    store_document(DataDisplayGenerator(), DataDisplayGenerator().parse_data(lines))
+    app.config['PAGED_DOCUMENTS_MAX_SIZE'] = max_size
+    assert closed == [True] and line_generator.document_id not in paged_documents
+    print("✓ Oversized sections load further pages on demand")
+
+except Exception as e:
+    print(f"✗ Section paging test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test JSON tree view
+print("\nTesting JSON tree view...")
+try:
+    import json
+    payload = {"tool_call": {"name": "search", "args": {"q": "</script><b>"}}, "note": "plain"}
+    tree_generator = DataDisplayGenerator()
+    tree_generator.json_view = 'tree'
+    page = tree_generator.generate(json.dumps(payload))
+    assert '{"name":"search","args":{"q":"\\u003c/script>\\u003cb>"}}' in page
+    assert '</script><b>' not in page and 'renderJsonLevel' in page
+    assert '<pre class="content-text">plain</pre>' in page
+
+    with app.test_client() as client:
+        response = client.post('/display', data={'data': json.dumps(payload), 'json_view': 'tree'})
+        assert response.status_code == 200 and b'class="json-data"' in response.data
+        response = client.post('/display', data={'data': '{}', 'json_view': 'nope'})
+        assert response.status_code == 400
+    print("✓ JSON objects are embedded compactly for the tree view")
+
+except Exception as e:
+    print(f"✗ JSON tree view test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test admission control
+print("\nTesting admission control...")
+try:
+    import threading
+    from app import RenderLane, get_render_lane, render_lanes
+
+    import time
+    lane = RenderLane(slots=1, queue_size=1)
+    assert lane.acquire(timeout=0) is None
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(lane.acquire(timeout=5)))
+    waiter.start()
+    while lane.waiting == 0:
+        time.sleep(0.001)
+    assert lane.acquire(timeout=0) == 429
+    lane.release()
+    waiter.join()
+    assert results == [None] and lane.acquire(timeout=0.01) == 503
+    print("✓ Render lanes queue, reject and time out")
+
+    saved = dict(app.config)
+    try:
+        app.config.update(MAX_CONTENT_LENGTH=1024, MAX_SECTIONS=2, RENDER_SLOTS=1,
+                          RENDER_QUEUE_SIZE=0, RENDER_RETRY_AFTER=7)
+        render_lanes.clear()
+        with app.test_client() as client:
+            response = client.post('/api/generate', json={'data': 'x' * 2048})
+            assert response.status_code == 413 and response.get_json()['success'] == False
+            response = client.post('/display', data={'data': 'a\n\nb\n\nc'})
+            assert response.status_code == 400 and b'limit' in response.data
+
+            busy = get_render_lane(large=False)
+            assert busy.acquire(timeout=0) is None
+            response = client.post('/display', data={'data': 'a'})
+            assert response.status_code == 429 and response.headers['Retry-After'] == '7'
+            busy.release()
+            assert client.post('/display', data={'data': 'a'}).status_code == 200
+            response = client.post('/api/render', data=b'a\n\nb')
+            assert response.status_code == 200 and b'<h3>' in response.data
+            assert busy.acquire(timeout=0) is None
+            busy.release()
+    finally:
+        app.config.clear()
+        app.config.update(saved)
+        render_lanes.clear()
+    print("✓ Body size, section count and concurrency limits are enforced")
+
+except Exception as e:
+    print(f"✗ Admission control test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test background render jobs
+print("\nTesting background render jobs...")
+try:
+    import json
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    callbacks = []
+
+    class CallbackHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            callbacks.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), CallbackHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    callback_url = f'http://127.0.0.1:{server.server_port}/done'
+
+    job_input = {'data': '{"job_key": "<value>"}', 'title': 'Job', 'callback_url': callback_url}
+    with app.test_client() as client:
+        response = client.post('/api/jobs', json=job_input)
+        assert response.status_code == 202
+        job_id = response.get_json()['job_id']
+
+        for _ in range(500):
+            status = client.get(f'/api/jobs/{job_id}').get_json()
+            if status['status'] in ('done', 'failed') and callbacks:
+                break
+            time.sleep(0.01)
+        assert status['status'] == 'done', status
+        page = client.get(status['result_url']).get_data(as_text=True)
+        assert page == DataDisplayGenerator().generate('{"job_key": "<value>"}', title='Job')
+        assert callbacks[0]['job_id'] == job_id and callbacks[0]['status'] == 'done'
+
+        response = client.post('/api/jobs', json={'data': 'x', 'callback_url': 'http://example.com/hook'})
+        assert response.status_code == 400
+        assert client.get('/api/jobs/' + '0' * 32).status_code == 404
+
+        app.config['JOB_RESULT_TTL'] = 0
+        try:
+            assert client.get(f'/api/jobs/{job_id}').status_code == 404
+        finally:
+            app.config['JOB_RESULT_TTL'] = 3600
+    server.shutdown()
+    print("✓ Jobs render in the background, call back and expire")
+
+except Exception as e:
+    print(f"✗ Background render jobs test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test search index
+print("\nTesting search index...")
+try:
+    import os
+    import re
+    import tempfile
+    import time
+    from app import fts_query
+
+    assert fts_query('say "hi" there') == '"say" """hi""" "there"*'
+    assert fts_query('   ') == ''
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        app.config['SEARCH_INDEX_PATH'] = os.path.join(index_dir, 'search.sqlite3')
+        try:
+            with app.test_client() as client:
+                response = client.post('/display', data={
+                    'data': 'Alpha\nthe quick brown fox\n\nBeta\nlazy <dog> jumps\n\nGamma\nnothing here'})
+                html = response.get_data(as_text=True)
+                assert 'class="search-box"' in html and 'function searchSections' in html
+                assert 'function loadMore' not in html
+                document_id = re.search(r'data-document="([0-9a-f]{32})"', html).group(1)
+
+                other = client.post('/api/generate', json={'data': 'Delta\na lazy cat'}).get_json()
+                assert other['document_id'] and other['document_id'] != document_id
+
+                # Indexing happens in the background
+                deadline = time.time() + 5
+                while True:
+                    found = client.get('/api/search?q=lazy').get_json()['results']
+                    if len(found) == 2 or time.time() > deadline:
+                        break
+                    time.sleep(0.02)
+                assert {result['document_id'] for result in found} == {document_id, other['document_id']}
+
+                found = client.get(f'/api/search?q=do&document={document_id}').get_json()['results']
+                assert found == [{'document_id': document_id, 'section': 1, 'title': 'Beta',
+                                  'snippet': 'lazy &lt;<mark>dog</mark>&gt; jumps'}], found
+                assert client.get('/api/search?q=fox+quick').get_json()['results'][0]['section'] == 0
+                assert client.get('/api/search?q=%22%28').get_json()['results'] == []
+                assert client.get('/api/search?q=lazy&document=' + '0' * 32).get_json()['results'] == []
+                assert client.get('/api/search?q=').status_code == 400
+
+                app.config['SEARCH_INDEX_PATH'] = None
+                assert client.get('/api/search?q=lazy').status_code == 404
+                html = client.post('/display', data={'data': 'No index'}).get_data(as_text=True)
+                assert 'search-box' not in html
+        finally:
+            app.config['SEARCH_INDEX_PATH'] = os.path.join(app.config['UPLOAD_FOLDER'], 'search_index.sqlite3')
+    print("✓ Rendered documents are indexed and searchable with snippets")
+
+except Exception as e:
+    print(f"✗ Search index test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test fragment cache
+print("\nTesting fragment cache...")
+try:
+    from app import FragmentCache
+
+    prompt = "System\n" + "You are a helpful <assistant> & follow the rules.\n" * 100
+    schema = json.dumps({"tools": [{"name": f"tool_{n}", "description": "x" * 100} for n in range(30)]})
+    plain = DataDisplayGenerator()
+    cache = FragmentCache(1 << 20, 1024)
+    for data in (prompt + "\n\nQuestion\nfirst", prompt + "\n\nQuestion\nsecond", schema, schema.encode()):
+        generator = DataDisplayGenerator()
+        generator.fragment_cache = cache
+        assert generator.generate(data) == plain.generate(data)
+    stats = cache.stats()
+    # The prompt and the tools array are escaped once each; short sections bypass the cache
+    assert (stats['entries'], stats['lookups'], stats['hits'], stats['cross_document_hits']) == (2, 4, 2, 2), stats
+    assert stats['chars_saved'] > len(prompt)
+
+    small = FragmentCache(100, 0)
+    generator = DataDisplayGenerator()
+    generator.fragment_cache = small
+    generator.generate("a\nshort\n\nb\n" + "too long to keep " * 10)
+    assert small.stats()['entries'] == 1 and small.stats()['size'] <= 100
+
+    with app.test_client() as client:
+        before = client.get('/api/stats').get_json()['fragment_cache']
+        for _ in range(2):
+            client.post('/api/generate', json={'data': prompt})
+        after = client.get('/api/stats').get_json()['fragment_cache']
+        assert after['cross_document_hits'] == before['cross_document_hits'] + 1, (before, after)
+    print("✓ Repeated sections are escaped once and reused across documents")
+
+except Exception as e:
+    print(f"✗ Fragment cache test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test document pages
+print("\nTesting document pages...")
+try:
+    import re
+    from app import rendered_pages
+
+    data = "\n\n".join(f"Part {n}\nbody {n}" + (" <long>" * 300 if n == 14 else "") for n in range(25))
+    with app.test_client() as client:
+        first = client.post('/display', data={'data': data, 'sections_per_page': '10',
+                                              'section_page_kb': '1'}).get_data(as_text=True)
+        document_id = re.search(r'class="pager" data-document="([0-9a-f]{32})"', first).group(1)
+        assert 'id="section-9"' in first and 'id="section-10"' not in first
+        assert 'max="3" value="1"' in first and '(sections 1–10 of 25)' in first
+        assert first.count('<nav class="pager"') == 2 and '<span>← Previous</span>' in first
+        assert f'href="/documents/{document_id}?page=2"' in first
+        assert 'Math.min(index, 20) * 0.1' in first
+
+        second = client.get(f'/documents/{document_id}?page=2')
+        assert second.headers['Cache-Control'] == 'private, max-age=3600'
+        second = second.get_data(as_text=True)
+        assert 'id="section-10"' in second and 'id="section-19"' in second and 'id="section-9"' not in second
+        assert f'href="/documents/{document_id}?page=1"' in second and "<h3>Part 12</h3>" in second
+        # The oversized section keeps its document-wide index for "load more"
+        assert 'data-section="14"' in second
+        more = client.get(f'/api/documents/{document_id}/sections/14?offset=1024').get_json()
+        assert more['success'] and more['next_offset'] == 2048
+
+        assert (document_id, 2) in rendered_pages
+        assert client.get(f'/documents/{document_id}?page=2').get_data(as_text=True) == second
+        last = client.get(f'/documents/{document_id}?page=3').get_data(as_text=True)
+        assert 'id="section-24"' in last and '<span>Next →</span>' in last
+        assert client.get(f'/documents/{document_id}?page=4').status_code == 404
+        assert client.get(f'/documents/{document_id}?page=0').status_code == 404
+        assert client.get('/documents/' + '0' * 32).status_code == 404
+
+        whole = client.post('/display', data={'data': data, 'sections_per_page': '0'}).get_data(as_text=True)
+        assert 'class="pager"' not in whole and 'id="section-24"' in whole
+    print("✓ Documents with many sections are served page by page")
+
+except Exception as e:
+    print(f"✗ Document pages test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test adaptive render strategies
+print("\nTesting render strategies...")
+try:
+    import re
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest import mock
+    import app as app_module
+    from app import select_render_strategy
+
+    generator = DataDisplayGenerator()
+    text = generator.parse_data("a\nlonger body\n\nc\nd")
+    tools = generator.parse_data(json.dumps({"first": {"a": [1, 2]}, "second": [{"b": "<c>"}], "third": 3}))
+    assert select_render_strategy(text, 100, 1 << 18, 1000) == "inline"
+    assert select_render_strategy(text, 2 << 20, 1 << 18, 1000) == "streamed"
+    assert select_render_strategy(text, 100, 1 << 18, 1) == "paged"
+    assert select_render_strategy(text, 100, 2, 1000) == "paged"
+    with mock.patch('os.cpu_count', return_value=4), mock.patch.dict(app.config, PARALLEL_RENDER_WORKERS=2):
+        assert select_render_strategy(tools, 16 << 20, 1 << 18, 1000) == "parallel"
+        assert select_render_strategy(tools, 16 << 20, 1 << 18, 1000, json_view="tree") == "streamed"
+    # Worker processes would only compete with the server for a single CPU
+    with mock.patch('os.cpu_count', return_value=1), mock.patch.dict(app.config, PARALLEL_RENDER_WORKERS=2):
+        assert select_render_strategy(tools, 16 << 20, 1 << 18, 1000) == "streamed"
+
+    data = json.dumps({"first": {"a": [1, 2]}, "second": [{"b": "<c>"}], "third": 3})
+    defaults = {key: app.config[key] for key in ('STREAMED_RENDER_MIN_SIZE', 'PARALLEL_RENDER_MIN_SIZE',
+                                                 'PARALLEL_RENDER_WORKERS', 'SEARCH_INDEX_PATH')}
+    app.config['SEARCH_INDEX_PATH'] = None
+    try:
+        with app.test_client() as client:
+            before = client.get('/api/stats').get_json()['render_strategies']
+            inline = client.post('/display', data={'data': data})
+            assert inline.headers['X-Render-Strategy'] == 'inline'
+            expected = inline.get_data(as_text=True)
+
+            app.config['STREAMED_RENDER_MIN_SIZE'] = 10
+            streamed = client.post('/api/render', data=data)
+            assert streamed.headers['X-Render-Strategy'] == 'streamed' and streamed.is_streamed
+            assert streamed.get_data(as_text=True) == expected
+
+            generated = client.post('/api/generate', json={'data': data, 'title': 'API'})
+            assert generated.headers['X-Render-Strategy'] == 'streamed'
+            expected_api = generated.get_json()['html']
+
+            # Thread workers stand in for the process pool
+            app.config.update(PARALLEL_RENDER_MIN_SIZE=10, PARALLEL_RENDER_WORKERS=2)
+            app_module._render_pool = ThreadPoolExecutor(2)
+            with mock.patch('os.cpu_count', return_value=4):
+                parallel = client.post('/display', data={'data': data})
+                assert parallel.headers['X-Render-Strategy'] == 'parallel'
+                assert parallel.get_data(as_text=True) == expected
+                generated = client.post('/api/generate', json={'data': data, 'title': 'API'})
+            assert generated.headers['X-Render-Strategy'] == 'parallel'
+            assert generated.get_json()['html'] == expected_api
+
+            paged = client.post('/display', data={'data': data, 'sections_per_page': '2'})
+            assert paged.headers['X-Render-Strategy'] == 'paged' and 'class="pager"' in paged.get_data(as_text=True)
+
+            after = client.get('/api/stats').get_json()['render_strategies']
+            counts = {'inline': 1, 'streamed': 2, 'parallel': 2, 'paged': 1}
+            for strategy, count in counts.items():
+                assert after[strategy]['count'] == before[strategy]['count'] + count, strategy
+            assert after['inline']['input_bytes'] == before['inline']['input_bytes'] + len(data)
+    finally:
+        app_module._render_pool.shutdown()
+        app_module._render_pool = None
+        app.config.update(defaults)
+    print("✓ Renders pick inline, streamed, paged or parallel by input size and shape")
+
+except Exception as e:
+    print(f"✗ Render strategies test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test the bytes-native render path
+print("\nTesting UTF-8 rendering...")
+try:
+    from app import iter_escaped_utf8
+
+    text = "# Café <b>\n" + "x & y 'é' 日本 😀\n" * 10000 + "\n\nshort \"<tail>\""
+    inputs = {
+        'utf8': text.encode("utf-8"),
+        'invalid': text.encode("utf-8")[:-7] + b"\xff\xe6\x97 end",
+        'json': json.dumps([{"a": "<b>", "c": [1, "é"]}, "plain"]).encode("utf-8"),
+    }
+    for name, data in inputs.items():
+        for json_view in ("text", "tree"):
+            for page_size in (None, 4096):
+                generator = DataDisplayGenerator()
+                generator.json_view = json_view
+                generator.section_page_size = page_size
+                sections = generator.parse_data(data)
+                expected = generator.generate_html(sections).encode("utf-8")
+                assert b"".join(generator.iter_html_utf8(sections, batch_size=1000)) == expected, name
+    data = inputs['invalid']
+    assert b"".join(iter_escaped_utf8(data, 0, len(data), 5)) == \
+        generator._escape_html(data.decode("utf-8", "replace")).encode("utf-8")
+
+    rendered = []
+    iter_html_utf8 = DataDisplayGenerator.iter_html_utf8
+    DataDisplayGenerator.iter_html_utf8 = lambda self, *args, **kwargs: rendered.append(1) or iter_html_utf8(
+        self, *args, **kwargs)
+    try:
+        with app.test_client() as client:
+            response = client.post('/api/render', data=inputs['utf8'])
+            assert response.status_code == 200 and rendered
+            assert "x &amp; y &#39;é&#39; 日本 😀".encode("utf-8") in response.get_data()
+    finally:
+        DataDisplayGenerator.iter_html_utf8 = iter_html_utf8
+    print("✓ Byte input renders to the same bytes without decoding to text")
+
+except Exception as e:
+    print(f"✗ UTF-8 rendering test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test render profiling
+print("\nTesting render profiles...")
+try:
+    import os
+    import tempfile
+    import tracemalloc
+
+    defaults = {key: app.config[key] for key in ('UPLOAD_FOLDER', 'PROFILE_TOKEN', 'PROFILE_SLOW_RENDER_SECONDS')}
+    app.config.update(UPLOAD_FOLDER=tempfile.mkdtemp(), PROFILE_TOKEN=None)
+    try:
+        with app.test_client() as client:
+            # Without a token the profiles cannot be read, not even locally
+            assert client.get('/api/profiles').status_code == 403
+            app.config['PROFILE_TOKEN'] = 's3cret'
+            assert client.post('/display', data={'data': 'a\nb\n\nc\nd'}).status_code == 200
+            assert client.get('/api/profiles?profile=s3cret').get_json()['profiles'] == []
+            assert client.get('/api/profiles').status_code == 403
+
+            response = client.post('/display?profile=s3cret', data={'data': 'a\nb\n\nc\nd'})
+            assert response.status_code == 200
+            profiles = client.get('/api/profiles', headers={'X-Profile': 's3cret'}).get_json()['profiles']
+            assert len(profiles) == 1
+            profile = profiles[0]
+            assert profile['trigger'] == 'requested' and profile['mode'] == 'cprofile'
+            assert profile['path'] == '/display' and profile['query'] == {} and profile['status'] == 200
+            assert profile['peak_memory'] > 0 and profile['files'] == ['prof', 'tracemalloc']
+            assert any('iter_html' in entry['function'] for entry in profile['top'])
+            stats = client.get(f"/api/profiles/{profile['id']}/prof?profile=s3cret")
+            assert stats.status_code == 200 and stats.data
+            snapshot = client.get(f"/api/profiles/{profile['id']}/tracemalloc?profile=s3cret").data
+            with tempfile.NamedTemporaryFile() as f:
+                f.write(snapshot)
+                f.flush()
+                assert tracemalloc.Snapshot.load(f.name).statistics('lineno')
+            assert client.get(f"/api/profiles/{profile['id']}/folded?profile=s3cret").status_code == 404
+
+            # Slow renders are sampled without being asked for, streamed ones until sent
+            app.config['PROFILE_SLOW_RENDER_SECONDS'] = 0
+            response = client.post('/api/render?split_mode=ndjson', data='{"a": 1}\n' * 20000)
+            assert response.is_streamed and response.get_data()
+            profile = client.get('/api/profiles?profile=s3cret').get_json()['profiles'][0]
+            assert profile['trigger'] == 'slow' and profile['mode'] == 'sampled'
+            assert profile['render_strategy'] == 'streamed' and profile['files'] == ['folded']
+            folded = client.get(f"/api/profiles/{profile['id']}/folded?profile=s3cret").get_data(as_text=True)
+            assert sum(int(line.rsplit(' ', 1)[1]) for line in folded.splitlines()) == profile['samples']
+    finally:
+        app.config.update(defaults)
+    print("✓ Requested and slow renders are profiled and can be downloaded")
+
+except Exception as e:
+    print(f"✗ Render profiles test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test the Python client
+print("\nTesting Python client...")
+try:
+    import asyncio
+    import gzip
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import threading
+    import time
+    from unittest import mock
+    from data_display_client import AsyncDataDisplayClient, DataDisplayClient, DataDisplayError
+
+    # The development server closes every connection, so a minimal HTTP/1.1
+    # server in front of the app stands in for a keep-alive production one
+    served = {'connections': 0, 'requests': [], 'unavailable': 1, 'delay': 0}
+
+    class KeepAliveHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            served['connections'] += 1
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            served['requests'].append((self.path, self.headers.get('Content-Encoding')))
+            time.sleep(served['delay'])
+            if served['unavailable']:
+                served['unavailable'] -= 1
+                status, headers, reply = 503, {'Retry-After': '0'}, b'{"error": "busy", "success": false}'
+            else:
+                with app.test_client() as client:
+                    response = client.post(self.path, data=body, headers=dict(self.headers))
+                status, headers, reply = response.status_code, {}, response.get_data()
+            self.send_response(status)
+            for name, value in {**headers, 'Content-Type': 'application/json',
+                                'Content-Length': str(len(reply))}.items():
+                self.send_header(name, value)
+            try:
+                self.end_headers()
+                self.wfile.write(reply)
+            except ConnectionError:
+                self.close_connection = True  # the client timed out and hung up
+
+        def log_message(self, *args):
+            pass
+
+    search_path = app.config['SEARCH_INDEX_PATH']
+    app.config['SEARCH_INDEX_PATH'] = None
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}'
+    try:
+        with app.test_client() as client:
+            compressed = gzip.compress(json.dumps({'data': 'a\nb\n\nc', 'title': 'Gz'}).encode())
+            response = client.post('/api/generate', data=compressed,
+                                   headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+            expected = client.post('/api/generate', json={'data': 'a\nb\n\nc', 'title': 'Gz'})
+            assert response.get_json()['html'] == expected.get_json()['html']
+            response = client.post('/api/generate/batch', json={'requests': [
+                {'data': 'x'}, {'data': 'y', 'split_mode': 'nope'}]}).get_json()
+            assert [result['success'] for result in response['results']] == [True, False]
+
+        with DataDisplayClient(url, compress_min_size=100, batch_size=8) as client:
+            # The first request gets a 503 and is retried on the same connection
+            html = client.generate({'summary': '<b>done</b>'}, title='Client')
+            assert '&lt;b&gt;done&lt;/b&gt;' in html and served['requests'][:2] == [('/api/generate', None)] * 2
+            pages = client.generate_many(['first\n\nsecond'] * 20, collapsed=True)
+            assert len(pages) == 20 and served['requests'][-1] == ('/api/generate/batch', 'gzip')
+            futures = [client.submit(f'doc {n}') for n in range(30)]
+            assert all(f'doc {n}' in future.result() for n, future in enumerate(futures))
+            try:
+                client.generate('x', split_mode='nope')
+                assert False, "invalid settings were accepted"
+            except DataDisplayError as e:
+                assert e.status == 400
+        assert served['connections'] == 1, served['connections']
+        batches = sum(1 for path, _ in served['requests'] if path == '/api/generate/batch')
+        assert batches < 3 + 15, batches
+
+        async def render_concurrently():
+            async with AsyncDataDisplayClient(url) as client:
+                return await asyncio.gather(*(client.generate(f'async {n}') for n in range(10)))
+
+        assert all(f'async {n}' in page for n, page in enumerate(asyncio.run(render_concurrently())))
+
+        remote = DataDisplayClient(url).generate('local\n\nmode')
+        assert DataDisplayClient(local=True).generate('local\n\nmode') == remote
+
+        # A timed out request may still be rendering, so it is not sent again
+        served['delay'] = 0.5
+        sent = len(served['requests'])
+        try:
+            DataDisplayClient(url, timeout=0.1, retries=3).generate('slow')
+            assert False, "the timeout was not reported"
+        except DataDisplayError:
+            assert len(served['requests']) == sent + 1
+        served['delay'] = 0
+    finally:
+        server.shutdown()
+        app.config['SEARCH_INDEX_PATH'] = search_path
+
+    # Local renders are not queued for a search index nobody can query
+    with mock.patch('app.index_document') as index_document:
+        reply = DataDisplayClient(local=True).generate_document('not\n\nindexed')
+    assert reply['success'] and not index_document.called
+    print("✓ Client pools connections, compresses, batches, retries and renders locally")
+
+except Exception as e:
+    print(f"✗ Python client test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test static-site export
+print("\nTesting static export...")
+try:
+    import gzip
+    import os
+    import tarfile
+    import tempfile
+    from static_export import SiteWriter, export_site, page_name
+
+    # Generated names never collide with each other or with the index
+    taken = {'index.html': 1}
+    names = [page_name(title, taken) for title in ['a', 'a', 'a-2', 'A', 'index', 'a-3']]
+    assert names == ['a.html', 'a-2.html', 'a-2-2.html', 'a-3.html', 'index-2.html', 'a-3-2.html']
+
+    documents = [('Run <1>', '{"summary": "<ok>", "steps": [1, 2]}'), ('Run <1>', b'first\ntext\n\nsecond'),
+                 ('notes', 'plain & simple')]
+    with tempfile.TemporaryDirectory() as site:
+        writer = SiteWriter(site, precompress=['gz'])
+        pages = export_site(documents, writer, title='Archive', collapsed=True)
+        writer.close()
+        assert [page['file'] for page in pages] == ['run-1.html', 'run-1-2.html', 'notes.html']
+        assets = sorted(os.listdir(os.path.join(site, 'assets')))
+        assert [name.rsplit('-', 1)[0] for name in assets] == ['script', 'script', 'style', 'style'], assets
+        for page in pages:
+            with open(os.path.join(site, page['file']), encoding='utf-8') as f:
+                html = f.read()
+            with gzip.open(os.path.join(site, page['file'] + '.gz'), 'rt', encoding='utf-8') as f:
+                assert f.read() == html
+            assert '<style>' not in html and 'function toggleSection' not in html and 'id="icon-copy"' not in html
+            assert f'href="assets/{assets[2]}"' in html and f'src="assets/{assets[0]}"' in html
+            assert 'href="index.html"' in html
+        with open(os.path.join(site, 'run-1.html'), encoding='utf-8') as f:
+            assert '&lt;ok&gt;' in f.read()
+        with open(os.path.join(site, 'assets', assets[0]), encoding='utf-8') as f:
+            script = f.read()
+        assert 'function toggleSection' in script and 'icon-copy' in script
+        with open(os.path.join(site, 'index.html'), encoding='utf-8') as f:
+            index = f.read()
+        assert index.count('class="section-card"') == 3 and 'Run &lt;1&gt;' in index and 'href="notes.html"' in index
+
+        archive_path = os.path.join(site, 'site.tar.gz')
+        writer = SiteWriter(archive_path, archive=True)
+        export_site(documents, writer)
+        writer.close()
+        with tarfile.open(archive_path) as archive:
+            names = archive.getnames()
+        assert sorted(names) == sorted(['run-1.html', 'run-1-2.html', 'notes.html', 'index.html'] +
+                                       [f'assets/{name}' for name in assets if not name.endswith('.gz')])
+    print("✓ Exported pages share one copy of their assets, with an index and .gz copies")
+
+except Exception as e:
+    print(f"✗ Static export test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test the per-request memory budget
+print("\nTesting memory budget...")
+try:
+    import os
+    import tempfile
+
+    budget = app.config['RENDER_MEMORY_BUDGET']
+    data = 'Step <1> & more\n\n' * 200
+    with tempfile.TemporaryDirectory() as spool_dir, app.test_client() as client:
+        app.config['RENDER_SPOOL_DIR'] = spool_dir
+        try:
+            app.config['RENDER_MEMORY_BUDGET'] = None
+            in_memory = client.post('/api/generate', json={'data': data}).get_json()
+            page = client.post('/display', data={'data': data}).data
+            spilled_before = client.get('/api/stats').get_json()['spilled_responses']
+
+            app.config['RENDER_MEMORY_BUDGET'] = 4096
+            response = client.post('/api/generate', json={'data': data})
+            reply = response.get_json()
+            assert reply['success'] and int(response.headers['Content-Length']) == len(response.data)
+            assert reply['html'].replace(reply['document_id'], in_memory['document_id']) == in_memory['html']
+            response = client.post('/display', data={'data': data})
+            assert response.headers['X-Render-Strategy'] == 'inline' and len(response.data) == len(page)
+            batch = client.post('/api/generate/batch', json={'requests': [
+                {'data': data}, {'data': 'x', 'split_mode': 'bogus'}]}).get_json()
+            assert [result['success'] for result in batch['results']] == [True, False]
+            assert batch['results'][0]['html'].count('class="section-card') == 200
+
+            spilled = client.get('/api/stats').get_json()['spilled_responses']
+            assert spilled['count'] == spilled_before['count'] + 3
+
+            app.config['RENDER_MEMORY_BUDGET'] = 1 << 20
+            small = client.post('/api/generate', json={'data': data})
+            assert small.get_json()['success']
+            assert client.get('/api/stats').get_json()['spilled_responses']['count'] == spilled['count']
+        finally:
+            app.config['RENDER_MEMORY_BUDGET'] = budget
+            app.config['RENDER_SPOOL_DIR'] = None
+    print("✓ Replies over the memory budget are spilled to disk and sent unchanged")
+
+except Exception as e:
+    print(f"✗ Memory budget test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test cold start
+print("\nTesting cold start...")
+try:
+    import os
+    import subprocess
+    import tempfile
+    from app import warm_up
+
+    # Modules only the background jobs need are imported on first use
+    probe = "import app, sys; print('urllib.request' in sys.modules, 'concurrent.futures' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.stdout.split() == ['False', 'False'], result.stdout + result.stderr
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        app.config['TEMPLATE_CACHE_DIR'] = cache_dir
+        try:
+            warm_up()
+            assert os.listdir(cache_dir), "compiled template was not cached"
+            with app.test_client() as client:
+                assert client.get('/').status_code == 200
+        finally:
+            app.config['TEMPLATE_CACHE_DIR'] = None
+            app.jinja_env.bytecode_cache = None
+    print("✓ Startup imports stay lean and warm_up caches the page template")
+
+except Exception as e:
+    print(f"✗ Cold start test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test client-side rendering
+print("\nTesting client-side rendering...")
+try:
+    with app.test_client() as client:
+        response = client.post('/api/parse', json={'data': '{"first_key": "<b>x</b>", "n": [1]}'})
+        result = response.get_json()
+        assert result['success'] == True
+        assert result['sections'] == [
+            {'title': 'First Key', 'content': '<b>x</b>'},
+            {'title': 'N', 'content': '[\n  1\n]'},
+        ]
+
+        response = client.get('/view?title=Client&theme_color=%23059669')
+        assert response.status_code == 200
+        assert b'<title>Client</title>' in response.data and b'addSectionCard' in response.data
+        assert b'indexedDB.open("dataDisplay", 1)' in response.data
+        assert 'max-age' in response.headers['Cache-Control']
+        assert 'public' not in response.headers['Cache-Control']
+        response = client.get('/view?title=<script>alert(1)</script>')
+        assert b'<script>alert(1)' not in response.data and b'&lt;script&gt;alert(1)' in response.data
+    print("✓ /api/parse and the /view shell work")
+
+except Exception as e:
+    print(f"✗ Client-side rendering test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test chunked uploads
+print("\nTesting chunked uploads...")
+try:
+    import hashlib
+    import tempfile
+    app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
+
+    payload = ("## Log entry\n<line> & é\n\n" * 2000).encode()
+    chunks = [payload[i:i + 8192] for i in range(0, len(payload), 8192)]
+    hashes = [hashlib.sha256(chunk).hexdigest() for chunk in chunks]
+
+    with app.test_client() as client:
+        upload = client.post('/api/uploads', json={'chunks': hashes}).get_json()
+        upload_id = upload['upload_id']
+        assert upload['missing'] == list(dict.fromkeys(hashes))
+
+        # Send only half, as if the connection dropped
+        for chunk_hash, chunk in list(zip(hashes, chunks))[:3]:
+            client.put(f'/api/uploads/{upload_id}/chunks/{chunk_hash}', data=chunk)
+        assert client.post(f'/api/uploads/{upload_id}/complete').status_code == 409
+
+        # Resuming only reports (and needs) the missing chunks
+        resumed = client.post('/api/uploads', json={'chunks': hashes}).get_json()
+        assert resumed['upload_id'] == upload_id
+        assert resumed['missing'] == [h for h in dict.fromkeys(hashes) if h not in hashes[:3]]
+        for chunk_hash, chunk in zip(hashes, chunks):
+            if chunk_hash in resumed['missing']:
+                client.put(f'/api/uploads/{upload_id}/chunks/{chunk_hash}', data=chunk)
+
+        bad = client.put(f'/api/uploads/{upload_id}/chunks/{hashes[-1]}', data=b'tampered')
+        assert bad.get_json()['stored'] == False
+
+        done = client.post(f'/api/uploads/{upload_id}/complete').get_json()
+        page = client.get(done['url'] + '?title=Upload&sections_per_page=0').get_data(as_text=True)
+        expected_generator = DataDisplayGenerator()
+        expected_generator.title = 'Upload'
+        assert page == expected_generator.generate_html(expected_generator.parse_data(payload.decode()))
+        page = client.get(done['url'] + '?title=<script>alert(1)</script>').get_data(as_text=True)
+        assert '<script>alert(1)' not in page and '<h1>&lt;script&gt;alert(1)&lt;/script&gt;</h1>' in page
+
+        # Assembled uploads drop their chunks but can still be resumed and completed
+        assert os.listdir(os.path.join(app.config['UPLOAD_FOLDER'], 'chunks')) == []
+        assert client.post('/api/uploads', json={'chunks': hashes}).get_json()['missing'] == []
+        assert client.post(f'/api/uploads/{upload_id}/complete').get_json()['url'] == done['url']
+
+        # Chunk count and total size are capped, repeated chunks included
+        too_many = client.post('/api/uploads', json={'chunks': hashes * 2000})
+        assert too_many.status_code == 413
+        app.config['UPLOAD_MAX_SIZE'] = 16384
+        repeated = client.post('/api/uploads', json={'chunks': hashes[:1] * 3}).get_json()
+        too_big = client.put(f"/api/uploads/{repeated['upload_id']}/chunks/{hashes[0]}", data=chunks[0])
+        assert too_big.status_code == 413
+        app.config['UPLOAD_MAX_SIZE'] = 1 << 30
+
+        # Uploads not used for UPLOAD_TTL seconds are deleted
+        app.config['UPLOAD_TTL'] = -1
+        client.post('/api/uploads', json={'chunks': hashes[:1]})
+        app.config['UPLOAD_TTL'] = 24 * 3600
+        assert client.get(done['url']).status_code == 404
+        assert client.get(f'/api/uploads/{upload_id}').status_code == 404
+    print("✓ Chunked uploads resume, render from disk, are capped and expire")
+
+except Exception as e:
+    print(f"✗ Chunked uploads test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+# Test live tail streaming
+print("\nTesting live tail...")
+try:
+    from app import IncrementalSectionParser
+
+    texts = [("# Summary\nRevenue grew 23%.\nUsers grew 15%.\n\n"
+              "Risks\nCompetition is increasing.\n\n"
+              "single line without a title\n\n"
+              + "x" * 150 + "\nlong first line\n\n\n\nTail\nend"),
+             "Title\nbody   \n\nNext\nx",
+             "Title\n   \n\nB\nc",
+             "  # Heading\n  indented body \t\n\n\n\n   \n\nlast\n",
+             "Title\nno blank line anywhere\n",
+             "just one line",
+             "y" * 120 + " and no title"]
+
+    for text in texts:
+        expected = [(s['title'], s['content']) for s in generator.parse_data(text)]
+        for chunk_size in (1, 3, 7, 64, len(text)):
+            parser = IncrementalSectionParser()
+            events = []
+            for i in range(0, len(text), chunk_size):
+                events.extend(parser.feed(text[i:i + chunk_size]))
+            events.extend(parser.close())
+
+            streamed = []
+            for event in events:
+                if event['type'] == 'section':
+                    streamed.append([event['title'], ''])
+                elif event['type'] == 'replace':
+                    streamed[event['id']] = [event['title'], event['text']]
+                else:
+                    streamed[event['id']][1] += event['text']
+            assert [tuple(s) for s in streamed] == expected, (text, chunk_size, streamed)
+    print("✓ Incremental parser matches parse_data for any chunking")
+
+    with app.test_client() as client:
+        response = client.post('/api/live/test-stream', data='Title\nHello')
+        assert response.get_json()['success'] == True
+        response = client.post('/api/live/test-stream?close=1', data=' world')
+        assert response.get_json()['closed'] == True
+
+        response = client.get('/live/test-stream?title=<script>alert(1)</script>')
+        assert response.status_code == 200
+        assert b'EventSource' in response.data
+        assert b'<script>alert(1)' not in response.data
+        assert b'<h1>&lt;script&gt;alert(1)&lt;/script&gt;</h1>' in response.data
+
+        response = client.get('/live/test-stream/events')
+        body = response.get_data(as_text=True)
+        assert 'event: section' in body and '"Title"' in body
+        assert 'world' in body and 'event: done' in body
+
+        assert client.get('/live/bad%20id').status_code in (400, 404)
+    print("✓ Live ingest and SSE routes work")
+
+    from app import live_streams
+    limits = {key: app.config[key] for key in ('LIVE_STREAMS_MAX', 'LIVE_STREAM_TTL', 'LIVE_STREAM_MAX_SIZE')}
+    try:
+        with app.test_client() as client:
+            assert client.get('/live/never-pushed/events').status_code == 404
+            assert 'never-pushed' not in live_streams
+
+            app.config['LIVE_STREAM_MAX_SIZE'] = 10
+            assert client.post('/api/live/capped', data='12345678').status_code == 200
+            assert client.post('/api/live/capped', data='901').status_code == 413
+
+            app.config['LIVE_STREAMS_MAX'] = 3
+            for n in range(5):
+                client.post(f'/api/live/many-{n}', data='x')
+            assert list(live_streams) == ['many-2', 'many-3', 'many-4']
+
+            app.config['LIVE_STREAM_TTL'] = 60
+            live_streams['many-2'].updated -= 120
+            client.post('/api/live/many-4?close=1', data='')
+            assert list(live_streams) == ['many-3', 'many-4']
+    finally:
+        app.config.update(limits)
+    print("✓ Live streams are bounded in number, age and size")
+
+except Exception as e:
+    print(f"✗ Live tail test failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
 print("\n" + "=" * 60)
 print("✅ All tests passed! The Flask app is ready to run.")
 print("=" * 60)
@@ -27,8 +27,11 @@ def test_with_json():
     component.theme_color = "#059669"
     component.auto_parse_json = True
     component.collapsed_by_default = False
+    component.json_tree_view = True
 
     result = component.build_display()
+    assert "Error Processing Data" not in result.text, result.text
+    assert "json-tree" in result.text
     with open('test_output_json.html', 'w', encoding='utf-8') as f:
         f.write(result.text)
 
@@ -62,8 +65,10 @@ We need to stay ahead with innovation.
     component.theme_color = "#4F46E5"
     component.auto_parse_json = True
     component.collapsed_by_default = False
+    component.json_tree_view = False
 
     result = component.build_display()
+    assert "Error Processing Data" not in result.text, result.text
     with open('test_output_text.html', 'w', encoding='utf-8') as f:
         f.write(result.text)
 
@@ -126,8 +131,10 @@ Here's a basic structure for the authentication service:
     component.theme_color = "#7C3AED"
     component.auto_parse_json = True
     component.collapsed_by_default = False
+    component.json_tree_view = False
 
     result = component.build_display()
+    assert "Error Processing Data" not in result.text, result.text
     with open('test_output_llm.html', 'w', encoding='utf-8') as f:
         f.write(result.text)
 
@@ -150,8 +157,10 @@ def test_collapsed_mode():
     component.theme_color = "#DC2626"
     component.auto_parse_json = True
     component.collapsed_by_default = True
+    component.json_tree_view = False
 
     result = component.build_display()
+    assert "Error Processing Data" not in result.text, result.text
     with open('test_output_collapsed.html', 'w', encoding='utf-8') as f:
         f.write(result.text)
 
@@ -169,8 +178,10 @@ def test_error_handling():
     component.theme_color = "#EA580C"
     component.auto_parse_json = True
     component.collapsed_by_default = False
+    # json_tree_view left unset, as in flows saved before the input existed
 
     result = component.build_display()
+    assert "Error Processing Data" not in result.text, result.text
     with open('test_output_error.html', 'w', encoding='utf-8') as f:
         f.write(result.text)
 
@@ -202,3 +213,4 @@ if __name__ == "__main__":
         print(f"❌ Error during testing: {e}")
         import traceback
         traceback.print_exc()
+        raise SystemExit(1)
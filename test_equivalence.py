@@ -0,0 +1,848 @@
+"""
+Output-equivalence harness for the render engines
+Checks that every optimized render path produces exactly the same page as the reference path and times them side by side
+
+The reference engine is a frozen copy of the original generator (the
+baseline ``parse_data()``, ``_format_value()``, ``_escape_html()`` and
+``generate_html()``), with only the intentional markup changes applied to
+its pages: the shared icon sprite, the capped card animation delay and
+escaped page and card titles. Every engine (``generate_html()``, bytes
+input, streamed batches, UTF-8 output, fragment cache, parallel JSON
+formatting) renders the same generated corpus and has to produce
+byte-identical pages. Settings the original generator did not have
+(split modes, the tree view, paging) are checked engine against engine.
+
+Usage:
+    python test_equivalence.py                # check and time every engine
+    python test_equivalence.py --size-mb 20   # use a larger generated corpus
+    python test_equivalence.py --seed 7       # use a different random corpus
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import io
+import json
+import multiprocessing
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from markupsafe import escape
+
+from app import (CONTENT_CHUNK_SIZE, DataDisplayGenerator, FragmentCache, Section, _looks_like_ndjson,
+                 enable_section_paging, escape_html_utf8, format_json_sections, format_json_text,
+                 iter_escaped_utf8)
+
+# Characters that have tripped up renderers: HTML metacharacters, every
+# kind of whitespace str.isspace() accepts, multi-byte and astral
+# characters, combining marks, right-to-left text and markdown markers
+ALPHABET = (list("abcxyz 0123456789<>&\"'`=/\\#*-_|{}[]:,.\t\r") +
+            list("é漢字😀🇺🇳́אا​ 　 \x1c\x85\x00") +
+            ["\n", "\n\n", "\n\n\n", "## Heading\n", "---\n", "```\n", "   \n", "\r\n\r\n"])
+
+# Settings every engine is run with
+SETTINGS = [
+    {},
+    {"auto_parse": False, "collapsed": True},
+    {"collapsed": True, "json_view": "tree"},
+    {"auto_parse": False, "split_mode": "markdown"},
+    {"split_mode": "rule", "section_page_size": 512},
+]
+
+EDGE_CASES = ["", "\n\n", " \n\n ", "42", " 42 ", "NaN", "null", "true", '"<s>"', "[]", "{}",
+              "<script>alert('x')</script>", "&amp; &lt; &#39;", "a\n\n\nb", "\n\n\n\nTail\nend",
+              "x" * 150 + "\nb\n\nc", "é" * 40 + "\n" + "😀" * 40]
+
+
+class BaselineGenerator:
+    """
+    The generator as it was before any of the render optimizations, kept
+    verbatim apart from escaping the page and card titles.
+    """
+
+    def __init__(self, title: str, auto_parse_json: bool, collapsed_by_default: bool):
+        self.title = title
+        self.theme_color = "#4F46E5"
+        self.auto_parse_json = auto_parse_json
+        self.collapsed_by_default = collapsed_by_default
+
+    def parse_data(self, data: str) -> List[Dict[str, Any]]:
+        """Parse input data into structured sections."""
+        sections = []
+
+        if self.auto_parse_json:
+            try:
+                # Try parsing as JSON
+                parsed = json.loads(data)
+
+                if isinstance(parsed, dict):
+                    # Convert dict to sections
+                    for key, value in parsed.items():
+                        sections.append({
+                            "title": str(key).replace("_", " ").title(),
+                            "content": self._format_value(value)
+                        })
+                elif isinstance(parsed, list):
+                    # Handle list of items
+                    for idx, item in enumerate(parsed):
+                        sections.append({
+                            "title": f"Item {idx + 1}",
+                            "content": self._format_value(item)
+                        })
+                else:
+                    sections.append({
+                        "title": "Data",
+                        "content": self._format_value(parsed)
+                    })
+
+                return sections
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        # Fallback: Split by common section markers
+        if "\n\n" in data:
+            # Split by double newlines
+            parts = data.split("\n\n")
+            for idx, part in enumerate(parts):
+                if part.strip():
+                    # Try to identify title (first line if it's short)
+                    lines = part.strip().split("\n", 1)
+                    if len(lines) > 1 and len(lines[0]) < 100:
+                        title = lines[0].strip("#* ")
+                        content = lines[1]
+                    else:
+                        title = f"Section {idx + 1}"
+                        content = part
+
+                    sections.append({
+                        "title": title,
+                        "content": content
+                    })
+        else:
+            # Single section
+            sections.append({
+                "title": "Output",
+                "content": data
+            })
+
+        return sections
+
+    def _format_value(self, value: Any) -> str:
+        """Format a value for display."""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, indent=2)
+        return str(value)
+
+    def _escape_html(self, text: str) -> str:
+        """Escape HTML special characters."""
+        return (text
+                .replace("&", "&amp;")
+                .replace("<", "&lt;")
+                .replace(">", "&gt;")
+                .replace('"', "&quot;")
+                .replace("'", "&#39;"))
+
+    def _darken_color(self, hex_color: str, amount: float) -> str:
+        """Darken a hex color by a percentage."""
+        try:
+            hex_color = hex_color.lstrip('#')
+            r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+            r = int(r * (1 - amount))
+            g = int(g * (1 - amount))
+            b = int(b * (1 - amount))
+            return f"#{r:02x}{g:02x}{b:02x}"
+        except:
+            return hex_color
+
+    def generate_html(self, sections: List[Dict[str, Any]]) -> str:
+        """Generate the complete HTML page."""
+
+        collapsed_class = "collapsed" if self.collapsed_by_default else ""
+
+        # Generate sections HTML
+        sections_html = ""
+        for idx, section in enumerate(sections):
+            section_id = f"section-{idx}"
+            sections_html += f"""
+            <div class="section-card {collapsed_class}">
+                <div class="section-header" onclick="toggleSection('{section_id}')">
+                    <div class="section-title">
+                        <span class="toggle-icon">▼</span>
+                        <h3>{self._escape_html(section['title'])}</h3>
+                    </div>
+                    <button class="copy-btn" onclick="copyText('{section_id}', event)" title="Copy to clipboard">
+                        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
+                            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
+                        </svg>
+                        Copy
+                    </button>
+                </div>
+                <div class="section-content" id="{section_id}">
+                    <pre class="content-text">{self._escape_html(section['content'])}</pre>
+                </div>
+            </div>
+            """
+
+        html = f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{escape(self.title)}</title>
+    <style>
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+            padding: 20px;
+            color: #1f2937;
+        }}
+
+        .container {{
+            max-width: 1200px;
+            margin: 0 auto;
+        }}
+
+        .header {{
+            text-align: center;
+            margin-bottom: 40px;
+            animation: fadeInDown 0.6s ease-out;
+        }}
+
+        .header h1 {{
+            color: white;
+            font-size: 2.5rem;
+            font-weight: 700;
+            text-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            margin-bottom: 10px;
+        }}
+
+        .header p {{
+            color: rgba(255,255,255,0.9);
+            font-size: 1.1rem;
+        }}
+
+        .back-link {{
+            display: inline-block;
+            background: rgba(255,255,255,0.2);
+            color: white;
+            padding: 10px 20px;
+            border-radius: 8px;
+            text-decoration: none;
+            margin-bottom: 20px;
+            transition: all 0.3s ease;
+        }}
+
+        .back-link:hover {{
+            background: rgba(255,255,255,0.3);
+            transform: translateY(-2px);
+        }}
+
+        .sections-container {{
+            display: flex;
+            flex-direction: column;
+            gap: 20px;
+        }}
+
+        .section-card {{
+            background: white;
+            border-radius: 12px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            overflow: hidden;
+            transition: all 0.3s ease;
+            animation: fadeInUp 0.6s ease-out;
+            animation-fill-mode: both;
+        }}
+
+        .section-card:hover {{
+            box-shadow: 0 10px 20px rgba(0,0,0,0.15);
+            transform: translateY(-2px);
+        }}
+
+        .section-header {{
+            background: {self.theme_color};
+            color: white;
+            padding: 20px;
+            cursor: pointer;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            transition: background 0.3s ease;
+        }}
+
+        .section-header:hover {{
+            background: {self._darken_color(self.theme_color, 0.1)};
+        }}
+
+        .section-title {{
+            display: flex;
+            align-items: center;
+            gap: 15px;
+            flex: 1;
+        }}
+
+        .section-title h3 {{
+            font-size: 1.3rem;
+            font-weight: 600;
+        }}
+
+        .toggle-icon {{
+            font-size: 1.2rem;
+            transition: transform 0.3s ease;
+            display: inline-block;
+        }}
+
+        .section-card.collapsed .toggle-icon {{
+            transform: rotate(-90deg);
+        }}
+
+        .copy-btn {{
+            background: rgba(255,255,255,0.2);
+            border: 1px solid rgba(255,255,255,0.3);
+            color: white;
+            padding: 8px 16px;
+            border-radius: 6px;
+            cursor: pointer;
+            font-size: 0.9rem;
+            display: flex;
+            align-items: center;
+            gap: 6px;
+            transition: all 0.3s ease;
+            font-weight: 500;
+        }}
+
+        .copy-btn:hover {{
+            background: rgba(255,255,255,0.3);
+            transform: scale(1.05);
+        }}
+
+        .copy-btn:active {{
+            transform: scale(0.95);
+        }}
+
+        .copy-btn.copied {{
+            background: #10b981;
+            border-color: #10b981;
+        }}
+
+        .section-content {{
+            max-height: 1000px;
+            overflow: hidden;
+            transition: max-height 0.4s ease, padding 0.4s ease;
+        }}
+
+        .section-card.collapsed .section-content {{
+            max-height: 0;
+            padding: 0;
+        }}
+
+        .content-text {{
+            padding: 25px;
+            background: #f9fafb;
+            border-left: 4px solid {self.theme_color};
+            margin: 0;
+            white-space: pre-wrap;
+            word-wrap: break-word;
+            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
+            font-size: 0.95rem;
+            line-height: 1.6;
+            color: #374151;
+            overflow-x: auto;
+        }}
+
+        .toast {{
+            position: fixed;
+            bottom: 30px;
+            right: 30px;
+            background: #10b981;
+            color: white;
+            padding: 15px 25px;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+            opacity: 0;
+            transform: translateY(20px);
+            transition: all 0.3s ease;
+            pointer-events: none;
+            font-weight: 500;
+            z-index: 1000;
+        }}
+
+        .toast.show {{
+            opacity: 1;
+            transform: translateY(0);
+        }}
+
+        @keyframes fadeInDown {{
+            from {{
+                opacity: 0;
+                transform: translateY(-30px);
+            }}
+            to {{
+                opacity: 1;
+                transform: translateY(0);
+            }}
+        }}
+
+        @keyframes fadeInUp {{
+            from {{
+                opacity: 0;
+                transform: translateY(30px);
+            }}
+            to {{
+                opacity: 1;
+                transform: translateY(0);
+            }}
+        }}
+
+        @media (max-width: 768px) {{
+            .header h1 {{
+                font-size: 2rem;
+            }}
+
+            .section-header {{
+                padding: 15px;
+            }}
+
+            .section-title h3 {{
+                font-size: 1.1rem;
+            }}
+
+            .content-text {{
+                padding: 15px;
+                font-size: 0.85rem;
+            }}
+
+            .copy-btn {{
+                padding: 6px 12px;
+                font-size: 0.8rem;
+            }}
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>{escape(self.title)}</h1>
+            <p>Click on sections to expand/collapse • Click copy to copy text</p>
+            <br>
+            <a href="/" class="back-link">← Enter New Data</a>
+        </div>
+
+        <div class="sections-container">
+            {sections_html}
+        </div>
+    </div>
+
+    <div class="toast" id="toast">Copied to clipboard!</div>
+
+    <script>
+        function toggleSection(sectionId) {{
+            const section = document.getElementById(sectionId).closest('.section-card');
+            section.classList.toggle('collapsed');
+        }}
+
+        function copyText(sectionId, event) {{
+            event.stopPropagation();
+
+            const contentElement = document.getElementById(sectionId).querySelector('.content-text');
+            const text = contentElement.textContent;
+
+            navigator.clipboard.writeText(text).then(() => {{
+                showToast('Copied to clipboard!');
+
+                const btn = event.currentTarget;
+                const originalText = btn.innerHTML;
+                btn.innerHTML = '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"></polyline></svg> Copied!';
+                btn.classList.add('copied');
+
+                setTimeout(() => {{
+                    btn.innerHTML = originalText;
+                    btn.classList.remove('copied');
+                }}, 2000);
+            }}).catch(err => {{
+                console.error('Failed to copy:', err);
+                showToast('Failed to copy!');
+            }});
+        }}
+
+        function showToast(message) {{
+            const toast = document.getElementById('toast');
+            toast.textContent = message;
+            toast.classList.add('show');
+
+            setTimeout(() => {{
+                toast.classList.remove('show');
+            }}, 3000);
+        }}
+
+        // Add staggered animation to sections
+        document.querySelectorAll('.section-card').forEach((card, index) => {{
+            card.style.animationDelay = `${{index * 0.1}}s`;
+        }});
+    </script>
+</body>
+</html>
+        """
+
+        return html
+
+
+# Intentional changes to the page since the baseline, as (baseline markup,
+# current markup, how often it occurs: 1, or None for once per card)
+MARKUP_CHANGES = [
+    # Shared icon sprite instead of an inline SVG per card
+    ("""        .copy-btn.copied {
+            background: #10b981;
+            border-color: #10b981;
+        }
+""", """        .copy-btn.copied {
+            background: #10b981;
+            border-color: #10b981;
+        }
+
+        .icon {
+            width: 16px;
+            height: 16px;
+            fill: none;
+            stroke: currentColor;
+            stroke-width: 2;
+        }
+""", 1),
+    ("""<body>
+    <div class="container">""", """<body>
+    <svg xmlns="http://www.w3.org/2000/svg" style="display: none">
+        <symbol id="icon-copy" viewBox="0 0 24 24">
+            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
+            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
+        </symbol>
+        <symbol id="icon-check" viewBox="0 0 24 24">
+            <polyline points="20 6 9 17 4 12"></polyline>
+        </symbol>
+    </svg>
+    <div class="container">""", 1),
+    ("""                        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                            <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
+                            <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
+                        </svg>
+""", """                        <svg class="icon"><use href="#icon-copy"></use></svg>
+""", None),
+    ("""            const contentElement = document.getElementById(sectionId).querySelector('.content-text');
+            const text = contentElement.textContent;
+
+            navigator.clipboard.writeText(text).then(() => {
+                showToast('Copied to clipboard!');
+
+                const btn = event.currentTarget;
+                const originalText = btn.innerHTML;
+                btn.innerHTML = '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"></polyline></svg> Copied!';
+                btn.classList.add('copied');
+
+                setTimeout(() => {
+                    btn.innerHTML = originalText;
+""", """            const section = document.getElementById(sectionId);
+            const jsonData = section.querySelector('.json-data');
+            const text = jsonData
+                ? JSON.stringify(JSON.parse(jsonData.textContent), null, 2)
+                : section.querySelector('.content-text').textContent;
+
+            const btn = event.currentTarget;
+            const icon = btn.querySelector('use');
+            const label = btn.lastChild;
+            const originalLabel = label.textContent;
+
+            navigator.clipboard.writeText(text).then(() => {
+                showToast('Copied to clipboard!');
+
+                icon.setAttribute('href', '#icon-check');
+                label.textContent = ' Copied! ';
+                btn.classList.add('copied');
+
+                setTimeout(() => {
+                    icon.setAttribute('href', '#icon-copy');
+                    label.textContent = originalLabel;
+""", 1),
+    # Card animation delay capped at 20 cards
+    ("""        // Add staggered animation to sections
+        document.querySelectorAll('.section-card').forEach((card, index) => {
+            card.style.animationDelay = `${index * 0.1}s`;
+""", """        // Add staggered animation to sections (capped, so long pages
+        // do not keep animating in for minutes)
+        document.querySelectorAll('.section-card').forEach((card, index) => {
+            card.style.animationDelay = `${Math.min(index, 20) * 0.1}s`;
+""", 1),
+]
+
+# Settings the baseline generator has
+BASELINE_SETTINGS = {"auto_parse", "collapsed"}
+
+
+def random_text(rnd: random.Random, length: int) -> str:
+    return "".join(rnd.choices(ALPHABET, k=length))
+
+
+def random_value(rnd: random.Random, depth: int = 0):
+    kind = rnd.randrange(6 if depth < 4 else 3)
+    if kind == 0:
+        return random_text(rnd, rnd.randint(0, 40))
+    if kind == 1:
+        return rnd.choice([0, -1, 2 ** 63, 3.5, 1e-7, True, False, None])
+    if kind == 2:
+        return rnd.choice(["", "<b>&amp;</b>", "line\nbreak", "é😀"])
+    if kind in (3, 4):
+        return {random_text(rnd, rnd.randint(1, 12)): random_value(rnd, depth + 1)
+                for _ in range(rnd.randint(0, 5))}
+    return [random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 5))]
+
+
+def make_corpus(size: int, seed: int) -> List[Tuple[str, str]]:
+    """Named documents of about ``size`` characters in total: text, markdown, JSON, JSON Lines and edge cases."""
+    rnd = random.Random(seed)
+    documents = [(f"edge {n}", text) for n, text in enumerate(EDGE_CASES)]
+    # Sections longer than CONTENT_CHUNK_SIZE are escaped in chunks; put
+    # multi-byte characters right where the chunks are cut
+    long_body = "<&>é" * (CONTENT_CHUNK_SIZE // 4) + "😀" * 3 + "tail"
+    documents.append(("long section", "Long\n" + long_body + "\n\nshort"))
+    total = sum(len(text) for _, text in documents)
+    while total < size:
+        kind = rnd.randrange(4)
+        if kind == 0:
+            name, text = "text", random_text(rnd, rnd.randint(1, 4000))
+        elif kind == 1:
+            name, text = "markdown", "".join(f"# {random_text(rnd, 10)}\n{random_text(rnd, rnd.randint(0, 600))}\n\n"
+                                             for _ in range(rnd.randint(1, 20)))
+        elif kind == 2:
+            name, text = "json", json.dumps(random_value(rnd), ensure_ascii=rnd.random() < 0.5,
+                                            indent=rnd.choice([None, 2]))
+        else:
+            name, text = "ndjson", "\n".join(json.dumps({"id": n, "content": random_text(rnd, rnd.randint(0, 200)),
+                                                         "tokens": [n, n + 1]}) for n in range(rnd.randint(2, 50)))
+        documents.append((f"{name} {len(documents)}", text))
+        total += len(text)
+    # Documents rendered more than once, as the fragment cache sees them
+    documents += rnd.sample(documents, len(documents) // 4)
+    return documents
+
+
+# Page title, with characters that have to be escaped
+TITLE = "Equivalence <&> \"test\""
+
+
+def make_generator(settings: Dict) -> DataDisplayGenerator:
+    generator = DataDisplayGenerator()
+    generator.configure(title=TITLE, auto_parse=settings.get("auto_parse", True),
+                        collapsed=settings.get("collapsed", False), split_mode=settings.get("split_mode"),
+                        json_view=settings.get("json_view"))
+    # Kept documents are stored under this id, and it is part of the page
+    generator.document_id = "0" * 32
+    return generator
+
+
+def parse(generator: DataDisplayGenerator, data, settings: Dict) -> Sequence[Section]:
+    """Parse ``data`` like the render routes do, with section paging if the settings turn it on."""
+    return enable_section_paging(generator, generator.parse_data(data), settings.get("section_page_size"))
+
+
+def render_reference(text: str, settings: Dict) -> bytes:
+    generator = BaselineGenerator(TITLE, settings.get("auto_parse", True), settings.get("collapsed", False))
+    sections = generator.parse_data(text)
+    html = generator.generate_html(sections)
+    for baseline, current, count in MARKUP_CHANGES:
+        assert html.count(baseline) == (len(sections) if count is None else count), baseline
+        html = html.replace(baseline, current)
+    return html.encode("utf-8")
+
+
+def render_generate_html(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    return generator.generate_html(parse(generator, text, settings)).encode("utf-8")
+
+
+def render_bytes(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    return generator.generate_html(parse(generator, text.encode("utf-8"), settings)).encode("utf-8")
+
+
+def render_memoryview(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    return generator.generate_html(parse(generator, memoryview(text.encode("utf-8")), settings)).encode("utf-8")
+
+
+def render_write_html(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    out = io.StringIO()
+    generator.write_html(parse(generator, text, settings), out)
+    return out.getvalue().encode("utf-8")
+
+
+def render_small_batches(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    sections = parse(generator, text, settings)
+    return b"".join(chunk.encode("utf-8") for chunk in generator.iter_html(sections, batch_size=1))
+
+
+def render_utf8(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    return b"".join(generator.iter_html_utf8(parse(generator, text.encode("utf-8"), settings)))
+
+
+fragment_cache = FragmentCache(1 << 30, 0)
+
+
+def render_fragment_cache(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    generator.fragment_cache = fragment_cache
+    return generator.generate_html(parse(generator, text, settings)).encode("utf-8")
+
+
+# Started in main(); spawned workers import this module again
+parallel_pool = None
+
+
+def render_parallel(text: str, settings: Dict) -> bytes:
+    generator = make_generator(settings)
+    sections = format_json_sections(generator.parse_data(text), parallel_pool)
+    sections = enable_section_paging(generator, sections, settings.get("section_page_size"))
+    return generator.generate_html(sections).encode("utf-8")
+
+
+ENGINES: Dict[str, Callable[[str, Dict], bytes]] = {
+    "reference": render_reference,
+    "generate_html": render_generate_html,
+    "bytes": render_bytes,
+    "memoryview": render_memoryview,
+    "write_html": render_write_html,
+    "batches": render_small_batches,
+    "utf8": render_utf8,
+    "fragments": render_fragment_cache,
+    "parallel": render_parallel,
+}
+
+# Engines reading UTF-8 bytes. Section pages are measured in bytes for
+# byte input and in characters for text, so with section paging these are
+# compared with the "bytes" engine instead of the text engines
+BYTE_ENGINES = ("bytes", "memoryview", "utf8")
+
+# Settings and documents an engine cannot or is never used with: the
+# baseline only has some of the settings and no JSON Lines detection (it
+# shows JSON Lines as one text card), and the tree view embeds JSON values
+# as they are, so they are not formatted in parallel
+SKIPPED: Dict[str, Callable[[Dict, str], bool]] = {
+    "reference": lambda settings, text: (not set(settings) <= BASELINE_SETTINGS
+                                         or settings.get("auto_parse", True) and _looks_like_ndjson(text)),
+    "parallel": lambda settings, text: settings.get("json_view") == "tree",
+}
+
+
+def first_difference(expected: bytes, actual: bytes) -> str:
+    offset = next((n for n, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+    return (f"first difference at byte {offset}: expected {expected[offset - 40:offset + 40]!r}, "
+            f"got {actual[offset - 40:offset + 40]!r}")
+
+
+def check_escaping(corpus: List[Tuple[str, str]]) -> None:
+    """``escape_html_utf8()`` and ``iter_escaped_utf8()`` against the baseline ``_escape_html()``."""
+    escape = BaselineGenerator(TITLE, True, False)._escape_html
+    for name, text in corpus:
+        expected = escape(text).encode("utf-8")
+        data = text.encode("utf-8")
+        assert escape_html_utf8(data) == expected, name
+        assert b"".join(iter_escaped_utf8(data, 0, len(data), 7)) == expected, name
+    # Invalid UTF-8 is shown with replacement characters, as when decoded
+    data = b"ok \xff\xfe \xe6\x97 \xf0\x9f\x98 <\x80\x80\x80\x80> \xed\xa0\x80 \xc3"
+    assert b"".join(iter_escaped_utf8(data, 0, len(data), 3)) == \
+        escape(data.decode("utf-8", "replace")).encode("utf-8")
+
+
+def check_formatting(corpus: List[Tuple[str, str]]) -> None:
+    """``format_json_text()`` (the parallel workers' formatter) against the baseline ``_format_value()``."""
+    generator = BaselineGenerator(TITLE, True, False)
+    for name, text in corpus:
+        try:
+            value = json.loads(text)
+        except ValueError:
+            continue
+        assert format_json_text(json.dumps(value)) == generator._format_value(value), name
+
+
+def main() -> None:
+    global parallel_pool
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=2.0,
+                        help="size of the generated corpus in MB (default: 2)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the corpus (default: 1)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Interactive Data Display - Render Engine Equivalence")
+    print("=" * 60)
+
+    corpus = make_corpus(int(args.size_mb * 1_000_000), args.seed)
+    size = sum(len(text.encode("utf-8")) for _, text in corpus)
+    print(f"\n{len(corpus):,} documents, {size / 1e6:.1f} MB, {len(SETTINGS)} settings, seed {args.seed}")
+
+    print("\nTesting escaping and JSON formatting...")
+    try:
+        check_escaping(corpus)
+        check_formatting(corpus)
+        print("✓ Bytes escaping and worker formatting match the generator")
+    except AssertionError as e:
+        print(f"✗ Escaping or formatting differs for: {e}")
+        sys.exit(1)
+
+    print("\nTesting render engines...")
+    parallel_pool = ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn"))
+    parallel_pool.submit(int).result()  # start the workers before timing them
+    # Time spent per engine, and by generate_html() on the same pages
+    seconds = dict.fromkeys(ENGINES, 0.0)
+    reference_seconds = dict.fromkeys(ENGINES, 0.0)
+    rendered = dict.fromkeys(ENGINES, 0)
+    failures = []
+    try:
+        for settings in SETTINGS:
+            for name, text in corpus:
+                engines = [engine for engine in ENGINES
+                           if not (engine in SKIPPED and SKIPPED[engine](settings, text))]
+                timings = {}
+                expected = {}
+                for engine in engines:
+                    started = time.perf_counter()
+                    page = ENGINES[engine](text, settings)
+                    timings[engine] = time.perf_counter() - started
+                    units = "bytes" if engine in BYTE_ENGINES and settings.get("section_page_size") else "text"
+                    if expected.setdefault(units, page) != page:
+                        difference = first_difference(expected[units], page)
+                        failures.append(f"{engine} on {name} with {settings}: {difference}")
+                for engine, elapsed in timings.items():
+                    seconds[engine] += elapsed
+                    reference_seconds[engine] += timings["generate_html"]
+                    rendered[engine] += len(text.encode("utf-8"))
+    finally:
+        parallel_pool.shutdown()
+
+    print(f"{'engine':<14}{'seconds':>10}{'MB/s':>10}{'vs generate_html':>18}")
+    for engine, elapsed in seconds.items():
+        print(f"{engine:<14}{elapsed:>10.2f}{rendered[engine] / elapsed / 1e6:>10.1f}"
+              f"{reference_seconds[engine] / elapsed:>17.2f}x")
+    stats = fragment_cache.stats()
+    print(f"fragment cache: {stats['hits']:,} hits of {stats['lookups']:,} lookups")
+
+    if failures:
+        for failure in failures[:10]:
+            print(f"✗ {failure}")
+        print(f"✗ {len(failures)} page(s) differ from the reference")
+        sys.exit(1)
+    print(f"✓ {len(ENGINES) - 1} engines render {len(corpus)} documents under {len(SETTINGS)} settings "
+          f"identically to each other and to the frozen baseline")
+
+
+if __name__ == "__main__":
+    main()